@@ -1,9 +1,24 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Form, Button, Card } from 'react-bootstrap';
 import api from '../services/api';
+import { subscribe } from '../services/events';
+
+// 댓글 트리에서 comment_id가 있는지
+const containsComment = (nodes, commentId) =>
+  nodes.some((node) => node.comment_id === commentId || containsComment(node.replies || [], commentId));
+
+// 부모 댓글 아래에 대댓글을 붙인 새 트리 (부모가 아직 안 받은 페이지에 있으면 그대로)
+const insertReply = (nodes, reply) =>
+  nodes.map((node) => {
+    if (node.comment_id === reply.parent_comment_id) {
+      return { ...node, replies: [...(node.replies || []), reply] };
+    }
+    return node.replies && node.replies.length ? { ...node, replies: insertReply(node.replies, reply) } : node;
+  });
 
 function CommentsComponent({ postId, category, user, postAuthorId }) {
   const [comments, setComments] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [newComment, setNewComment] = useState("");
   const [replyTo, setReplyTo] = useState(null);
 
@@ -12,14 +27,35 @@ function CommentsComponent({ postId, category, user, postAuthorId }) {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [postId, category]);
 
-  const fetchComments = async () => {
+  // 실시간 알림 (services/events.js): 다른 사람이 단 댓글도 다시 불러오지 않고 바로 끼워 넣는다
+  // 최상위 댓글은 오래된 순이라 마지막 페이지까지 받아 둔 경우에만 맨 뒤에 붙인다
+  const nextCursorRef = useRef(null);
+  nextCursorRef.current = nextCursor;
+  useEffect(() => subscribe([`comments:${category}:${postId}`], (event) => {
+    if (event.type === 'reset') {
+      fetchComments();
+      return;
+    }
+    if (event.type !== 'comment.created') return;
+    const comment = { ...event.data, replies: [] };
+    setComments((prev) => {
+      if (containsComment(prev, comment.comment_id)) return prev;
+      if (comment.parent_comment_id == null) {
+        return nextCursorRef.current ? prev : [...prev, comment];
+      }
+      return insertReply(prev, comment);
+    });
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }), [postId, category]);
+
+  // 서버에서 해당 게시글의 댓글만, 대댓글 트리가 구성된 상태로 받아옴
+  const fetchComments = async (cursor = null) => {
     try {
-      const res = await api.get('/comments/');
-      // 해당 postId와 category의 댓글만 필터링
-      const filtered = res.data.filter(
-        (c) => parseInt(c.post_id) === parseInt(postId) && c.category === category
-      );
-      setComments(filtered);
+      const res = await api.get('/comments/', {
+        params: { category, post_id: postId, cursor: cursor || undefined },
+      });
+      setComments((prev) => (cursor ? [...prev, ...res.data.comments] : res.data.comments));
+      setNextCursor(res.data.next_cursor);
     } catch (err) {
       console.error(err);
     }
@@ -30,7 +66,6 @@ function CommentsComponent({ postId, category, user, postAuthorId }) {
     if (!user) return;
     const payload = {
       category,
-      author_id: user.user_id,
       post_id: postId,
       content: newComment,
       parent_comment_id: replyTo,
@@ -56,10 +91,8 @@ function CommentsComponent({ postId, category, user, postAuthorId }) {
   };
 
   // 재귀적으로 대댓글(자식 댓글) 렌더링
-  const renderComments = (parentId = null, level = 0) => {
-    return comments
-      .filter((c) => c.parent_comment_id === parentId)
-      .map((comment) => (
+  const renderComments = (nodes = comments, level = 0) => {
+    return nodes.map((comment) => (
         <Card
           key={comment.comment_id}
           style={{
@@ -122,7 +155,7 @@ function CommentsComponent({ postId, category, user, postAuthorId }) {
           </div>
 
           {/* 대댓글(자식) 재귀 */}
-          {renderComments(comment.comment_id, level + 1)}
+          {renderComments(comment.replies, level + 1)}
         </Card>
       ));
   };
@@ -131,6 +164,16 @@ function CommentsComponent({ postId, category, user, postAuthorId }) {
     <div className="mt-4">
       <h5>댓글</h5>
       <div>{renderComments()}</div>
+      {nextCursor && (
+        <Button
+          variant="link"
+          size="sm"
+          onClick={() => fetchComments(nextCursor)}
+          style={{ padding: 0, marginTop: '8px' }}
+        >
+          댓글 더보기
+        </Button>
+      )}
 
       {/* 새 댓글/대댓글 작성 폼 */}
       <Form onSubmit={handleSubmit} className="mt-3">
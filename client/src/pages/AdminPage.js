@@ -1,64 +1,225 @@
-import React, { useState, useEffect } from 'react';
-import { Container, Table, Button } from 'react-bootstrap';
+import React, { useState, useEffect, useCallback } from 'react';
+import { Container, Table, Button, Form, Row, Col } from 'react-bootstrap';
 import api from '../services/api';
 
+// 목록에 필요한 컬럼만 요청 (전화번호 등은 받지 않음)
+const USER_FIELDS = 'user_id,user_name,admission_year,grade,class_num,student_num,is_admin,is_confirmed';
+const PAGE_LIMIT = 50;
+
 function AdminPage() {
-  const [pendingUsers, setPendingUsers] = useState([]);
+  const [users, setUsers] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [hasMore, setHasMore] = useState(false);
+  const [selected, setSelected] = useState([]);
+  const [importFile, setImportFile] = useState(null);
+  const [importResult, setImportResult] = useState(null);
+  const [filters, setFilters] = useState({
+    is_confirmed: 'false',
+    admission_year: '',
+    grade: '',
+    class_num: '',
+    sort: 'created_at',
+  });
 
-  const fetchPendingUsers = async () => {
+  const fetchUsers = useCallback(async (cursor = null) => {
     try {
-      const res = await api.get('/users/pending');
-      setPendingUsers(res.data);
+      const params = { fields: USER_FIELDS, limit: PAGE_LIMIT, sort: filters.sort };
+      Object.entries(filters).forEach(([key, value]) => {
+        if (key !== 'sort' && value !== '') params[key] = value;
+      });
+      if (cursor) params.cursor = cursor;
+
+      const res = await api.get('/users/', { params });
+      setUsers(prev => (cursor ? [...prev, ...res.data.users] : res.data.users));
+      if (!cursor) setSelected([]);
+      setNextCursor(res.data.next_cursor);
+      setHasMore(res.data.has_more);
     } catch (err) {
-      console.error('미승인 사용자 목록 불러오기 실패:', err);
+      console.error('사용자 목록 불러오기 실패:', err);
     }
-  };
+  }, [filters]);
 
   useEffect(() => {
-    fetchPendingUsers();
-  }, []);
+    fetchUsers();
+  }, [fetchUsers]);
+
+  const handleFilterChange = (e) => {
+    const { name, value } = e.target;
+    setFilters(prev => ({ ...prev, [name]: value }));
+  };
 
   const handleApprove = async (userId, makeAdmin = false) => {
     try {
       await api.put(`/users/${userId}/approve`, { is_admin: makeAdmin });
       alert('승인 완료!');
-      fetchPendingUsers();
+      fetchUsers();
     } catch (err) {
       console.error('승인 실패:', err);
     }
   };
 
+  const toggleSelected = (userId) => {
+    setSelected(prev => (prev.includes(userId) ? prev.filter(id => id !== userId) : [...prev, userId]));
+  };
+
+  // 선택한 사용자 일괄 승인/거절 (요청 한 번)
+  const handleBulk = async (action) => {
+    if (selected.length === 0) return;
+    try {
+      const res = await api.post(`/users/bulk-${action}`, { user_ids: selected });
+      const done = action === 'approve' ? res.data.approved : res.data.rejected;
+      alert(`${done.length}명 ${action === 'approve' ? '승인' : '거절'} 완료!`);
+      fetchUsers();
+    } catch (err) {
+      console.error('일괄 처리 실패:', err);
+    }
+  };
+
+  // 현재 필터 조건의 사용자 전체를 JSON 파일로 내려받기 (서버에서 스트리밍)
+  const handleExport = async () => {
+    try {
+      const params = {};
+      Object.entries(filters).forEach(([key, value]) => {
+        if (key !== 'sort' && value !== '') params[key] = value;
+      });
+      const res = await api.get('/users/export', { params, responseType: 'blob' });
+      const url = window.URL.createObjectURL(res.data);
+      const link = document.createElement('a');
+      link.href = url;
+      link.download = 'users.json';
+      link.click();
+      window.URL.revokeObjectURL(url);
+    } catch (err) {
+      console.error('내보내기 실패:', err);
+    }
+  };
+
+  // CSV / XLSX 일괄 등록
+  const handleImport = async () => {
+    if (!importFile) return;
+    const formData = new FormData();
+    formData.append('file', importFile);
+    try {
+      const res = await api.post('/users/import', formData, {
+        headers: { 'Content-Type': 'multipart/form-data' },
+      });
+      setImportResult(res.data);
+      fetchUsers();
+    } catch (err) {
+      console.error('일괄 등록 실패:', err);
+      alert(err.response?.data?.error || '일괄 등록 실패');
+    }
+  };
+
   return (
     <Container className="mt-4">
       <h2>관리자 페이지</h2>
-      <p>아직 승인되지 않은 사용자 목록입니다.</p>
+      <Form className="mb-3">
+        <Row>
+          <Col md={3}>
+            <Form.Select name="is_confirmed" value={filters.is_confirmed} onChange={handleFilterChange}>
+              <option value="false">승인 대기</option>
+              <option value="true">승인 완료</option>
+              <option value="">전체</option>
+            </Form.Select>
+          </Col>
+          <Col md={2}>
+            <Form.Control type="number" name="admission_year" placeholder="입학년도"
+              value={filters.admission_year} onChange={handleFilterChange} />
+          </Col>
+          <Col md={2}>
+            <Form.Control type="number" name="grade" placeholder="학년"
+              value={filters.grade} onChange={handleFilterChange} />
+          </Col>
+          <Col md={2}>
+            <Form.Control type="number" name="class_num" placeholder="반"
+              value={filters.class_num} onChange={handleFilterChange} />
+          </Col>
+          <Col md={3}>
+            <Form.Select name="sort" value={filters.sort} onChange={handleFilterChange}>
+              <option value="created_at">가입일순</option>
+              <option value="student">학번순</option>
+              <option value="user_name">이름순</option>
+              <option value="user_id">아이디순</option>
+            </Form.Select>
+          </Col>
+        </Row>
+      </Form>
+      <Row className="mb-3">
+        <Col md={6}>
+          <Button variant="primary" size="sm" disabled={selected.length === 0} onClick={() => handleBulk('approve')}>
+            선택 승인 ({selected.length})
+          </Button>{' '}
+          <Button variant="danger" size="sm" disabled={selected.length === 0} onClick={() => handleBulk('reject')}>
+            선택 거절
+          </Button>{' '}
+          <Button variant="outline-secondary" size="sm" onClick={handleExport}>
+            내보내기
+          </Button>
+        </Col>
+        <Col md={6} className="d-flex">
+          <Form.Control type="file" size="sm" accept=".csv,.xlsx"
+            onChange={(e) => setImportFile(e.target.files[0] || null)} />
+          <Button variant="secondary" size="sm" className="ms-2" disabled={!importFile} onClick={handleImport}>
+            일괄 등록
+          </Button>
+        </Col>
+      </Row>
+      {importResult && (
+        <div className="mb-3">
+          <p>등록 {importResult.imported}명, 실패 {importResult.failed}건</p>
+          <ul>
+            {importResult.errors.map(error => (
+              <li key={error.row}>{error.row}행 ({error.user_id}): {error.errors.join(', ')}</li>
+            ))}
+          </ul>
+        </div>
+      )}
       <Table bordered hover>
         <thead>
           <tr>
+            <th></th>
             <th>아이디</th>
             <th>이름</th>
+            <th>학번</th>
             <th>현재 관리자 여부</th>
             <th>승인</th>
           </tr>
         </thead>
         <tbody>
-          {pendingUsers.map(user => (
+          {users.map(user => (
             <tr key={user.user_id}>
+              <td>
+                <Form.Check type="checkbox" checked={selected.includes(user.user_id)}
+                  onChange={() => toggleSelected(user.user_id)} />
+              </td>
               <td>{user.user_id}</td>
               <td>{user.user_name}</td>
+              <td>{user.admission_year} / {user.grade}학년 {user.class_num}반 {user.student_num}번</td>
               <td>{user.is_admin ? '관리자' : '일반'}</td>
               <td>
-                <Button variant="primary" size="sm" onClick={() => handleApprove(user.user_id, false)}>
-                  일반 승인
-                </Button>{' '}
-                <Button variant="warning" size="sm" onClick={() => handleApprove(user.user_id, true)}>
-                  관리자 승인
-                </Button>
+                {user.is_confirmed ? (
+                  '승인됨'
+                ) : (
+                  <>
+                    <Button variant="primary" size="sm" onClick={() => handleApprove(user.user_id, false)}>
+                      일반 승인
+                    </Button>{' '}
+                    <Button variant="warning" size="sm" onClick={() => handleApprove(user.user_id, true)}>
+                      관리자 승인
+                    </Button>
+                  </>
+                )}
               </td>
             </tr>
           ))}
         </tbody>
       </Table>
+      {hasMore && (
+        <Button variant="outline-secondary" onClick={() => fetchUsers(nextCursor)}>
+          더 보기
+        </Button>
+      )}
     </Container>
   );
 }
@@ -1,10 +1,14 @@
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import {
   Container, Button, Modal, Form, Image, Row, Col, Card, InputGroup, FormControl
 } from "react-bootstrap";
 import api from "../services/api";
+import { subscribe } from "../services/events";
 import CommentsComponent from "../components/CommentsComponent";
 
+// 목록 카드에 필요한 필드만 요청 (본문은 상세 조회에서 받음)
+const LIST_FIELDS = "lost_item_post_id,lost_item_post_name,author_id,created_at,views,status,image_urls,thumbnail_urls";
+
 function LostItemsPage() {
   const [lostItems, setLostItems] = useState([]);
   const [commentCounts, setCommentCounts] = useState({});
@@ -69,7 +73,8 @@ function LostItemsPage() {
         params: {
           page: currentPage,
           limit: itemsPerPage,
-          keyword: searchTerm
+          keyword: searchTerm,
+          fields: LIST_FIELDS
         }
       });
       setLostItems(res.data.lost_items);
@@ -79,18 +84,40 @@ function LostItemsPage() {
     }
   };
 
-  // 전체 댓글 목록에서 lost_item 카테고리별 댓글 수 계산
+  // 실시간 알림 (services/events.js): 다시 불러오지 않고 목록을 바로 고친다
+  // 새 글은 검색 없이 첫 페이지를 보고 있을 때만 맨 위에 넣는다
+  const liveRef = useRef(null);
+  liveRef.current = { firstPage: currentPage === 1 && !searchTerm, refetch: fetchLostItems };
+  useEffect(() => subscribe(["lost_item"], (event) => {
+    const { firstPage, refetch } = liveRef.current;
+    if (event.type === "reset") {
+      refetch();
+      return;
+    }
+    const post = event.data;
+    const id = post.lost_item_post_id;
+    if (event.type === "post.created" && firstPage) {
+      setLostItems((prev) => (prev.some((item) => item.lost_item_post_id === id)
+        ? prev
+        : [post, ...prev].slice(0, itemsPerPage)));
+    } else if (event.type === "post.updated") {
+      setLostItems((prev) => prev.map((item) => (item.lost_item_post_id === id ? { ...item, ...post } : item)));
+    } else if (event.type === "post.deleted") {
+      setLostItems((prev) => prev.filter((item) => item.lost_item_post_id !== id));
+    }
+  }), []);
+
+  // 현재 페이지 게시글들의 댓글 수만 서버에서 집계해 조회
   const fetchCommentCounts = async () => {
+    if (lostItems.length === 0) return;
     try {
-      const res = await api.get("/comments/");
-      const counts = {};
-      res.data.forEach(comment => {
-        if (comment.category === "lost_item") {
-          const postId = comment.post_id;
-          counts[postId] = (counts[postId] || 0) + 1;
-        }
+      const res = await api.get("/comments/counts", {
+        params: {
+          category: "lost_item",
+          post_ids: lostItems.map((item) => item.lost_item_post_id).join(","),
+        },
       });
-      setCommentCounts(counts);
+      setCommentCounts(res.data.counts);
     } catch (err) {
       console.error("❌ 댓글 목록 불러오기 실패:", err);
     }
@@ -140,6 +167,8 @@ function LostItemsPage() {
       fetchLostItems();
     } catch (err) {
       console.error("❌ 분실물 등록 실패:", err);
+      // 이미지 형식/개수/용량 제한에 걸리면 서버가 이유를 알려준다
+      if (err.response?.data?.error) alert(err.response.data.error);
     }
   };
 
@@ -244,7 +273,7 @@ function LostItemsPage() {
               {item.image_urls && item.image_urls.length > 0 && (
                 <Card.Img
                   variant="top"
-                  src={`${process.env.REACT_APP_IMAGE_URL}${item.image_urls[0]}`}
+                  src={`${process.env.REACT_APP_IMAGE_URL}${(item.thumbnail_urls && item.thumbnail_urls[0]) || item.image_urls[0]}`}
                   style={{ height: "150px", objectFit: "cover", cursor: "pointer" }}
                   onClick={() => handleItemClick(item)}
                 />
@@ -395,6 +424,19 @@ function LostItemsPage() {
                   ))}
                 </div>
               )}
+              {/* 서버가 미리 계산해 둔 매칭 후보 (점수순) */}
+              {selectedItem.possible_matches && selectedItem.possible_matches.length > 0 && (
+                <div style={{ marginBottom: "15px" }}>
+                  <strong>📦 비슷한 습득물</strong>
+                  <ul style={{ marginTop: "5px" }}>
+                    {selectedItem.possible_matches.map((match) => (
+                      <li key={match.found_item_post_id}>
+                        {match.found_item_post_name} ({match.found_item_name} / {match.found_location}) · 유사도 {Math.round(match.score * 100)}%
+                      </li>
+                    ))}
+                  </ul>
+                </div>
+              )}
               {user && (user.is_admin === true || user.user_id === selectedItem.author_id) && (
                 <>
                   {!selectedItem.status && (
@@ -13,6 +13,9 @@ import api from "../services/api";
 import CommentsComponent from "../components/CommentsComponent";
 
 
+// 목록 카드에 필요한 필드만 요청 (본문은 상세 조회에서 받음)
+const LIST_FIELDS = "notice_post_id,notice_post_name,author_id,created_at";
+
 // 목록에서만 상대시간 표기 (예: "3일 전", "2시간 전")
 function formatRelativeTime(dateString) {
   if (!dateString) return "";
@@ -85,6 +88,7 @@ function NoticeBoardPage() {
           page: currentPage,
           limit: itemsPerPage,
           keyword: searchTerm,
+          fields: LIST_FIELDS,
         },
       });
       setNotices(res.data.notices);
@@ -133,6 +137,8 @@ function NoticeBoardPage() {
       fetchNotices();
     } catch (err) {
       console.error("공지사항 등록 실패:", err);
+      // 이미지 형식/개수/용량 제한에 걸리면 서버가 이유를 알려준다
+      if (err.response?.data?.error) alert(err.response.data.error);
     }
   };
 
@@ -6,6 +6,9 @@ import {
 import api from "../services/api";
 import CommentsComponent from "../components/CommentsComponent";
 
+// 목록 카드에 필요한 필드만 요청 (본문은 상세 조회에서 받음)
+const LIST_FIELDS = "share_item_post_id,share_item_post_name,author_id,created_at,views,status,image_urls,thumbnail_urls";
+
 function SharePage() {
   const [shareItems, setShareItems] = useState([]);
   const [commentCounts, setCommentCounts] = useState({});
@@ -70,6 +73,7 @@ function SharePage() {
           page: currentPage,
           limit: itemsPerPage,
           keyword: searchTerm,
+          fields: LIST_FIELDS,
         },
       });
       setShareItems(res.data.share_items);
@@ -79,18 +83,17 @@ function SharePage() {
     }
   };
 
-  // 전체 댓글에서 share_item 카테고리의 댓글 수 계산
+  // 현재 페이지 게시글들의 댓글 수만 서버에서 집계해 조회
   const fetchCommentCounts = async () => {
+    if (shareItems.length === 0) return;
     try {
-      const res = await api.get("/comments/");
-      const counts = {};
-      res.data.forEach((comment) => {
-        if (comment.category === "share_item") {
-          const postId = comment.post_id;
-          counts[postId] = (counts[postId] || 0) + 1;
-        }
+      const res = await api.get("/comments/counts", {
+        params: {
+          category: "share_item",
+          post_ids: shareItems.map((item) => item.share_item_post_id).join(","),
+        },
       });
-      setCommentCounts(counts);
+      setCommentCounts(res.data.counts);
     } catch (err) {
       console.error("❌ 댓글 목록 불러오기 실패:", err);
     }
@@ -130,6 +133,8 @@ function SharePage() {
       fetchShareItems();
     } catch (err) {
       console.error("❌ 나눔 게시글 등록 실패:", err);
+      // 이미지 형식/개수/용량 제한에 걸리면 서버가 이유를 알려준다
+      if (err.response?.data?.error) alert(err.response.data.error);
     }
   };
 
@@ -237,7 +242,7 @@ function SharePage() {
               {item.image_urls && item.image_urls.length > 0 && (
                 <Card.Img
                   variant="top"
-                  src={`${process.env.REACT_APP_IMAGE_URL}${item.image_urls[0]}`}
+                  src={`${process.env.REACT_APP_IMAGE_URL}${(item.thumbnail_urls && item.thumbnail_urls[0]) || item.image_urls[0]}`}
                   style={{ height: "150px", objectFit: "cover", cursor: "pointer" }}
                   onClick={() => handleItemClick(item)}
                 />
@@ -0,0 +1,48 @@
+// src/services/events.js
+// 서버 실시간 알림(SSE, /api/events) 구독
+// - topics: 게시판 이름("lost_item" 등) 또는 "comments:<게시판>:<글 번호>"
+// - onEvent({ type, topic, data }) : post.created / post.updated / post.deleted / comment.created / reset
+//   reset은 놓친 알림이 있다는 뜻이므로 목록을 다시 불러온다
+// - 연결이 끊기면 EventSource가 Last-Event-ID로 이어서 받는다.
+//   서버가 연결을 거절하면(연결 수 초과 503 등) EventSource는 재연결을 멈추므로 직접 다시 연결하되,
+//   실패할 때마다 기다리는 시간을 두 배로(무작위 지터 포함) 늘리고 MAX_FAILURES번 연속 실패하면 구독을 그만둔다
+//   (화면은 그대로 동작하고, 목록은 페이지 이동/검색 때 다시 불러온다)
+const BASE_RETRY_MS = 5000;
+const MAX_RETRY_MS = 5 * 60 * 1000;
+const MAX_FAILURES = 6;
+
+export function subscribe(topics, onEvent) {
+  let source = null;
+  let timer = null;
+  let lastEventId = null;
+  let failures = 0;
+  let closed = false;
+
+  const connect = () => {
+    const params = new URLSearchParams({ topics: topics.join(",") });
+    if (lastEventId) params.set("last_event_id", lastEventId);
+    source = new EventSource(`${process.env.REACT_APP_API_URL}/events/?${params}`, { withCredentials: true });
+    source.onopen = () => {
+      failures = 0;
+    };
+    source.onmessage = (e) => {
+      if (e.lastEventId) lastEventId = e.lastEventId;
+      onEvent(JSON.parse(e.data));
+    };
+    source.onerror = () => {
+      // CONNECTING 상태면 브라우저가 알아서 다시 연결한다
+      if (closed || source.readyState !== EventSource.CLOSED) return;
+      failures += 1;
+      if (failures >= MAX_FAILURES) return;
+      const delay = Math.min(BASE_RETRY_MS * 2 ** (failures - 1), MAX_RETRY_MS);
+      timer = setTimeout(connect, delay / 2 + Math.random() * delay / 2);
+    };
+  };
+
+  connect();
+  return () => {
+    closed = true;
+    clearTimeout(timer);
+    if (source) source.close();
+  };
+}
@@ -1,36 +1,75 @@
 # server.py (혹은 __init__.py)
-from flask import Flask, send_from_directory
+from flask import Flask
 from flask_cors import CORS
+from flask_migrate import Migrate
 from .database import db
-from config import Config
-from flask_session import Session
 import os
 
-def create_app():
+def create_app(config_object=None):
+    # config_object: 벤치마크 등에서 config.py 대신 쓸 설정 (기본은 config.Config)
+    if config_object is None:
+        from config import Config
+        config_object = Config
     app = Flask(__name__)
-    app.config.from_object(Config)
+    app.config.from_object(config_object)
+
+    # ✅ 워커 프로세스 수 (gunicorn.conf.py가 GUNICORN_WORKERS로 알려 준다, python server.py 개발 서버는 1)
+    #    2개 이상이면 응답 캐시 / 실시간 알림의 기본 백엔드가 프로세스 메모리 대신 redis (app/cache.py, app/events.py)
+    app.config.setdefault('WORKER_PROCESSES', int(os.environ.get('GUNICORN_WORKERS') or 1))
+
+    # ✅ 리버스 프록시(nginx 등) 뒤에서 실제 클라이언트 IP / 스킴 / 호스트 사용
+    #    PROXY_FIX_X_FOR / _X_PROTO / _X_HOST: 믿을 프록시 단계 수 (0이면 X-Forwarded-* 무시)
+    #    UPLOAD_SEND_MODE=x-accel(nginx 앞단 전제)이면 기본 1, 아니면 0 (직접 노출된 서버에서 헤더를 믿으면 IP 위조 가능)
+    #    로그인 시도 제한(app/login_limiter.py)이 request.remote_addr을 IP 키로 쓰므로 프록시 뒤에서는 꼭 설정할 것
+    behind_proxy = 1 if app.config.get('UPLOAD_SEND_MODE') == 'x-accel' else 0
+    proxy_hops = {name: app.config.get(f'PROXY_FIX_X_{name.upper()}', behind_proxy) for name in ('for', 'proto', 'host')}
+    if any(proxy_hops.values()):
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy_hops['for'], x_proto=proxy_hops['proto'],
+                                x_host=proxy_hops['host'])
+
+    # ✅ JSON 직렬화: orjson (datetime은 ISO 8601, 큰 응답은 스트리밍, app/json_provider.py)
+    from app import json_provider
+    json_provider.init_app(app)
+
+    # ✅ 응답 압축 (Accept-Encoding: br / zstd / gzip, app/compression.py)
+    #    after_request 훅은 등록 역순으로 실행되므로 다른 훅보다 먼저 등록 -> 마지막에 압축
+    from app import compression
+    compression.init_app(app)
 
     # ✅ CORS 설정
     CORS(app, resources={r"/*": {"origins": ["http://cisabee.com","http://52.79.158.184:3000","http://localhost:3001", "http://localhost:3000"], "supports_credentials": True}})
 
-    # ✅ 세션 설정
-    app.config['SESSION_TYPE'] = 'filesystem'
-    app.config['SESSION_PERMANENT'] = False
-    Session(app)
+    # ✅ 세션 설정 (SESSION_BACKEND: cookie / redis / filesystem, app/sessions.py)
+    from app import sessions
+    sessions.init_app(app)
 
     # ✅ 업로드 폴더 경로 설정
-    UPLOAD_FOLDER = os.path.join(os.getcwd(), "app", "static", "uploads")
+    UPLOAD_FOLDER = app.config.get('UPLOAD_FOLDER') or os.path.join(os.getcwd(), "app", "static", "uploads")
     if not os.path.exists(UPLOAD_FOLDER):
         os.makedirs(UPLOAD_FOLDER)
     app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 
+    # ✅ 업로드 수신: 요청/파일 크기 상한, 디스크 스풀, 매직 바이트 검사 (UPLOAD_MAX_*, app/upload_ingest.py)
+    from app import upload_ingest
+    upload_ingest.init_app(app)
+
     # 🔹 여기서 모델 임포트 (핵심)
     #    이렇게 해야 db.create_all()이 User, LostItemPost 등 인식
-    from app.models import User, LostItemPost, FoundItemPost, ShareItemPost, Comment
+    from app.models import User, LostItemPost, FoundItemPost, ShareItemPost, Comment, SearchToken, PostImage, UploadBlob
 
+    # ✅ DB 연결 풀 설정 + 읽기 복제본 라우팅 (DB_POOL_* / DB_REPLICA_URIS, app/database.py)
+    from app import database
+    database.configure(app)
     db.init_app(app)
-    with app.app_context():
-        db.create_all()  # 모델을 인식한 상태에서 테이블 생성
+
+    # ✅ 스키마는 마이그레이션으로 관리 (flask db upgrade, server/migrations/)
+    #    create_all()은 이미 있는 테이블에 인덱스를 추가하지 못하므로 기본으로는 쓰지 않는다
+    #    (DB_CREATE_ALL=True: 마이그레이션 없이 빈 DB를 바로 만들어 쓰는 로컬 실험용)
+    Migrate(app, db)
+    if app.config.get('DB_CREATE_ALL', False):
+        with app.app_context():
+            db.create_all()
 
     # ✅ Blueprint 등록
     from app.routes.user_routes import user_bp
@@ -40,6 +79,7 @@ def create_app():
     from app.routes.share_item_routes import share_item_bp
     from app.routes.comment_routes import comment_bp
     from app.routes.notice_routes import notice_bp  # 새로 추가
+    from app.events import events_bp
 
     app.register_blueprint(user_bp, url_prefix="/api/users")
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
@@ -48,9 +88,48 @@ def create_app():
     app.register_blueprint(share_item_bp, url_prefix="/api/share_items")
     app.register_blueprint(comment_bp, url_prefix="/api/comments")
     app.register_blueprint(notice_bp, url_prefix="/api/notices")
+    app.register_blueprint(events_bp, url_prefix="/api/events")
+
+    # ✅ 요청별 SQL 계측 (Server-Timing 헤더 / /metrics / 라우트별 쿼리 수 상한, app/instrumentation.py)
+    from app import instrumentation
+    instrumentation.init_app(app)
+
+    # ✅ 게시판 응답 캐시 (RESPONSE_CACHE_TYPE: memory / redis / null)
+    from app import cache
+    cache.init_app(app)
+
+    # ✅ 조회수 write-behind 카운터 (주기적 일괄 반영)
+    from app import view_counter
+    view_counter.init_app(app)
+
+    # ✅ 업로드 이미지 후처리 워커 풀 (썸네일/WebP 변환)
+    from app import image_pipeline
+    image_pipeline.init_app(app)
+
+    # ✅ 실시간 알림 (SSE, EVENTS_BROKER_TYPE: memory / redis, app/events.py)
+    from app import events
+    events.init_app(app)
+
+    # ✅ 분실물/습득물 매칭 후보 계산 워커 (app/matching.py)
+    from app import matching
+    matching.init_app(app)
+
+    # ✅ CLI 명령 등록 (flask search rebuild / flask images backfill / flask self-check / flask query-plans)
+    from app.search import search_cli
+    from app.post_images import images_cli
+    from app.self_check import self_check_command
+    from app.query_plans import query_plans_command
+    app.cli.add_command(search_cli)
+    app.cli.add_command(images_cli)
+    app.cli.add_command(self_check_command)
+    app.cli.add_command(query_plans_command)
+
+    # ✅ 업로드 파일 서빙 (캐시 헤더 / Range / X-Accel-Redirect·X-Sendfile, app/upload_store.py)
+    from app.upload_store import send_upload
+    app.config['USE_X_SENDFILE'] = app.config.get('UPLOAD_SEND_MODE') == 'x-sendfile'
 
     @app.route('/static/uploads/<path:filename>')
     def serve_uploaded_file(filename):
-        return send_from_directory(UPLOAD_FOLDER, filename)
+        return send_upload(filename)
 
     return app
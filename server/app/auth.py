@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import namedtuple
+from functools import wraps
+
+from flask import current_app, g, jsonify, session
+
+from app.database import db
+from app.models import User
+
+# 로그인 사용자 확인 (세션 기준)
+# - current_user(): 요청당 한 번만 세션의 user_id로 사용자 정보를 찾아 g에 보관
+# - 사용자 정보(아이디/이름/관리자/승인 여부)는 프로세스 안에 AUTH_USER_CACHE_TTL초(기본 30초) 동안 캐시,
+#   update_user / approve_user / delete_user 에서 invalidate_user()로 바로 지운다
+#   (다른 워커 프로세스의 캐시는 TTL이 지나면 갱신됨)
+# - 라우트에서는 @login_required / @admin_required(...) 데코레이터를 쓴다
+#   글/댓글 수정·삭제는 @login_required + can_modify(작성자 아이디)로 작성자 본인 또는 관리자만 허용
+
+AuthUser = namedtuple("AuthUser", ["user_id", "user_name", "is_admin", "is_confirmed"])
+
+CACHE_MAX_ENTRIES = 10000
+_cache = {}
+_lock = threading.Lock()
+
+
+def _load_user(user_id):
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get(user_id)
+        if entry and entry[0] > now:
+            return entry[1]
+
+    row = (db.session.query(User.user_id, User.user_name, User.is_admin, User.is_confirmed)
+           .filter_by(user_id=user_id)
+           .first())
+    user = AuthUser(row.user_id, row.user_name, bool(row.is_admin), bool(row.is_confirmed)) if row else None
+
+    with _lock:
+        if len(_cache) >= CACHE_MAX_ENTRIES:
+            _cache.clear()
+        _cache[user_id] = (now + current_app.config.get("AUTH_USER_CACHE_TTL", 30), user)
+    return user
+
+
+def current_user():
+    """로그인한 사용자(AuthUser) 또는 None."""
+    if "auth_user" not in g:
+        user_id = session.get("user_id")
+        g.auth_user = _load_user(user_id) if user_id else None
+    return g.auth_user
+
+
+def can_modify(author_id):
+    """로그인한 사용자가 작성자 본인이거나 관리자인지."""
+    user = current_user()
+    return user is not None and (user.is_admin or user.user_id == author_id)
+
+
+def invalidate_user(user_id):
+    with _lock:
+        _cache.pop(user_id, None)
+
+
+def login_required(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        user = current_user()
+        if not user or not user.is_confirmed:
+            return jsonify({"error": "로그인이 필요합니다."}), 401
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def admin_required(message="관리자만 사용할 수 있습니다."):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            user = current_user()
+            if not user or not user.is_confirmed:
+                return jsonify({"error": "로그인이 필요합니다."}), 401
+            if not user.is_admin:
+                return jsonify({"error": message}), 403
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
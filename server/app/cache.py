@@ -0,0 +1,257 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, request
+
+from app import compression, database
+
+# 게시판 목록/상세 응답 캐시
+# - 백엔드: memory(프로세스 내 LRU + TTL), redis(여러 워커/서버 공유), null(캐시 끔)
+#   RESPONSE_CACHE_TYPE / RESPONSE_CACHE_TTL / RESPONSE_CACHE_MAX_ENTRIES / RESPONSE_CACHE_REDIS_URL
+#   기본값은 워커가 하나면 memory, 여러 개(WORKER_PROCESSES > 1)면 redis
+#   (redis 클라이언트는 requirements.txt에 고정, Redis 서버에 닿지 않으면 시작 전 점검이 URL과 함께 알려 준다)
+#   (memory는 쓰기를 처리한 워커의 캐시만 지우므로 다른 워커가 TTL 동안 예전 목록/상세/ETag를 내보낸다
+#    -> 워커가 여러 개인데 memory를 지정하면 시작 전 점검(app/self_check.py)이 실패한다)
+#   테스트에서는 RESPONSE_CACHE_REDIS_CLIENT에 redis 호환 객체(fakeredis 등)를 넣어 대신 쓸 수 있다
+# - 목록 키는 게시판별 세대(generation) 번호를 포함하므로, 등록/수정/삭제 시 세대만 올리면
+#   해당 게시판의 모든 페이지·검색 결과가 한 번에 무효화된다
+# - 상세 키는 게시글 단위로 지운다
+# - 응답에는 ETag를 붙이고, If-None-Match가 같으면 본문 없이 304를 돌려준다
+# - 목록 응답은 압축된 본문도 인코딩별로 같은 키 옆에 저장한다 (app/compression.py)
+# - 목록 total_items(COUNT) 캐시도 같은 백엔드에 둔다 (app/pagination.py)
+# - 읽기 복제본을 쓰면 무효화 직후 DB_REPLICA_STICKY_SECONDS초 동안 그 게시판의 캐시 채우기는 primary에서 읽는다
+#   (복제본이 아직 쓰기를 못 받았으면 예전 데이터가 다시 캐시돼 TTL 동안 남으므로, app/database.py)
+
+
+class MemoryCache:
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    get_bytes = get
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            _, value = self._data.get(key, (None, 0))
+            value = int(value) + 1
+            self._data[key] = (None, value)
+            return value
+
+
+class RedisCache:
+    def __init__(self, client, prefix="csibee:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        return value
+
+    def get_bytes(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, value, ex=ttl or None)
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*[self.prefix + key for key in keys])
+
+    def incr(self, key):
+        return self.client.incr(self.prefix + key)
+
+
+class NullCache:
+    def get(self, key):
+        return None
+
+    get_bytes = get
+
+    def set(self, key, value, ttl=None):
+        pass
+
+    def delete(self, *keys):
+        pass
+
+    def incr(self, key):
+        return 0
+
+
+_backend = NullCache()
+
+
+def init_app(app):
+    global _backend
+    cache_type = app.config.get("RESPONSE_CACHE_TYPE") or (
+        "redis" if app.config.get("WORKER_PROCESSES", 1) > 1 else "memory")
+    app.config["RESPONSE_CACHE_TYPE"] = cache_type  # 시작 전 점검에서 실제로 쓰는 값을 본다
+    if cache_type == "memory":
+        _backend = MemoryCache(app.config.get("RESPONSE_CACHE_MAX_ENTRIES", 2048))
+    elif cache_type == "redis":
+        client = app.config.get("RESPONSE_CACHE_REDIS_CLIENT")
+        if client is None:
+            # requirements.txt에 고정되어 있음 (워커가 여러 개인 기본 운영 설정에서 쓰므로)
+            import redis
+            client = redis.Redis.from_url(app.config.get("RESPONSE_CACHE_REDIS_URL", "redis://localhost:6379/0"))
+        _backend = RedisCache(client)
+    elif cache_type == "null":
+        _backend = NullCache()
+    else:
+        raise ValueError(f"알 수 없는 RESPONSE_CACHE_TYPE: {cache_type}")
+
+
+def _mark_written(board):
+    # 모든 워커가 보도록 캐시 백엔드에 "이 시각까지는 primary에서 채울 것"을 남긴다
+    if current_app.extensions.get("db_replicas"):
+        window = current_app.config.get("DB_REPLICA_STICKY_SECONDS", 5)
+        _backend.set(f"primary:{board}", str(time.time() + window), window)
+
+
+def _fill_from_primary_if_fresh(board):
+    if current_app.extensions.get("db_replicas"):
+        until = _backend.get(f"primary:{board}")
+        if until is not None and float(until) > time.time():
+            database.read_from_primary()
+
+
+def _ttl():
+    return current_app.config.get("RESPONSE_CACHE_TTL", 60)
+
+
+def _generation(board):
+    return _backend.get(f"gen:{board}") or "0"
+
+
+def _list_key(board, parts):
+    digest = hashlib.sha1(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+    return f"list:{board}:{_generation(board)}:{digest}"
+
+
+def _detail_key(board, post_id):
+    return f"detail:{board}:{post_id}"
+
+
+def _etag(body):
+    return hashlib.sha1(body.encode("utf-8")).hexdigest()
+
+
+def _json_response(body, etag, key=None):
+    response = current_app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    response = response.make_conditional(request)
+    if key is not None:
+        encoding = compression.negotiate(response)
+        if encoding is not None:
+            # 압축 본문도 캐시: 같은 페이지를 다시 요청하면 압축을 건너뛴다
+            compressed_key = f"{key}:{encoding}"
+            data = _backend.get_bytes(compressed_key)
+            if data is None:
+                data = compression.compress(response.get_data(), encoding, cached=True)
+                _backend.set(compressed_key, data, _ttl())
+            compression.apply(response, encoding, data)
+    return response
+
+
+def cached_list(board, parts, build):
+    """목록 응답 캐시. build()는 응답 payload(dict)를 만든다.
+    캐시에는 직렬화된 본문과 ETag를 함께 저장하므로 적중 시 다시 직렬화하지 않는다."""
+    key = _list_key(board, parts)
+    cached = _backend.get(key)
+    if cached is not None:
+        etag, body = cached.split("\n", 1)
+        return _json_response(body, etag, key)
+
+    _fill_from_primary_if_fresh(board)
+    body = current_app.json.dumps(build())
+    etag = _etag(body)
+    _backend.set(key, f"{etag}\n{body}", _ttl())
+    return _json_response(body, etag, key)
+
+
+def cached_detail(board, post_id, build):
+    """상세 payload 캐시. build()는 payload(dict) 또는 게시글이 없으면 None을 돌려준다.
+    조회수처럼 요청마다 바뀌는 값은 호출한 쪽에서 덧붙인 뒤 json_response()로 내보낸다."""
+    key = _detail_key(board, post_id)
+    cached = _backend.get(key)
+    if cached is not None:
+        return current_app.json.loads(cached)
+
+    _fill_from_primary_if_fresh(board)
+    payload = build()
+    if payload is not None:
+        _backend.set(key, current_app.json.dumps(payload), _ttl())
+    return payload
+
+
+def json_response(payload):
+    body = current_app.json.dumps(payload)
+    return _json_response(body, _etag(body))
+
+
+def invalidate_list(board):
+    _backend.incr(f"gen:{board}")
+    _mark_written(board)
+
+
+def invalidate_post(board, post_id):
+    _backend.delete(_detail_key(board, post_id))
+    invalidate_list(board)
+
+
+def invalidate_detail(board, post_id):
+    _backend.delete(_detail_key(board, post_id))
+    _mark_written(board)
+
+
+def cached_count(board, parts, compute):
+    """목록 total_items 캐시. compute()는 COUNT 결과를 돌려준다."""
+    digest = hashlib.sha1(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+    key = f"count:{board}:{_backend.get(f'count-gen:{board}') or '0'}:{digest}"
+    cached = _backend.get(key)
+    if cached is not None:
+        return int(cached)
+    _fill_from_primary_if_fresh(board)
+    total = compute()
+    _backend.set(key, str(total), current_app.config.get("COUNT_CACHE_TTL", 60))
+    return total
+
+
+def invalidate_counts(board):
+    _backend.incr(f"count-gen:{board}")
+    _mark_written(board)
+
+
+def check():
+    """백엔드에 닿는지 확인한다 (시작 전 점검용). 실패하면 예외."""
+    _backend.get("gen:notice")
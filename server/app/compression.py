@@ -0,0 +1,152 @@
+import zlib
+
+from flask import current_app, request
+
+# 응답 압축 (Content-Encoding: br / zstd / gzip)
+# - Accept-Encoding을 보고 클라이언트가 받을 수 있는 것 중 COMPRESSION_ENCODINGS 순서(기본 br > zstd > gzip)로 고른다
+#   gzip은 표준 라이브러리, br / zstd는 선택 의존성(brotli / zstandard 패키지)이 설치된 경우에만 쓴다
+# - JSON / 텍스트만 압축하고 COMPRESSION_MIN_SIZE(기본 500바이트)보다 작은 본문은 그대로 보낸다
+#   업로드 이미지(jpeg/webp 등)는 이미 압축된 형식이라 건너뛴다
+# - 스트리밍 응답(app/json_provider.stream_json)은 청크마다 flush 하며 압축해서 그대로 흘려보낸다
+# - 응답 캐시(app/cache.py)는 압축된 본문을 인코딩별로 함께 저장한다 -> 자주 보는 페이지는 한 번만 압축
+#   (한 번만 하므로 COMPRESSION_CACHED_LEVELS의 더 높은 압축 수준을 쓴다)
+# - 압축한 응답의 ETag는 약한 ETag(W/"...")로 바꾼다. If-None-Match는 약한 비교라 304는 그대로 동작
+# - COMPRESSION_ENABLED=False 이면 끈다 (nginx 등 앞단에서 압축하는 경우)
+
+try:
+    import brotli  # 선택 의존성
+except ImportError:
+    brotli = None
+try:
+    import zstandard  # 선택 의존성
+except ImportError:
+    zstandard = None
+
+COMPRESSIBLE_TYPES = {"application/json", "application/javascript", "image/svg+xml"}
+DEFAULT_ENCODINGS = ("br", "zstd", "gzip")
+DEFAULT_LEVELS = {"br": 4, "zstd": 3, "gzip": 6}
+DEFAULT_CACHED_LEVELS = {"br": 9, "zstd": 12, "gzip": 9}
+
+
+class _Gzip:
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31 = gzip 헤더
+
+    def compress(self, chunk, flush=True):
+        data = self._compressor.compress(chunk)
+        return data + self._compressor.flush(zlib.Z_SYNC_FLUSH) if flush else data
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class _Brotli:
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, chunk, flush=True):
+        data = self._compressor.process(chunk)
+        return data + self._compressor.flush() if flush else data
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class _Zstd:
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, chunk, flush=True):
+        data = self._compressor.compress(chunk)
+        return data + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK) if flush else data
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+_COMPRESSORS = {"gzip": _Gzip}
+if brotli is not None:
+    _COMPRESSORS["br"] = _Brotli
+if zstandard is not None:
+    _COMPRESSORS["zstd"] = _Zstd
+
+
+def init_app(app):
+    # after_request는 등록 역순으로 실행되므로 create_app 앞쪽에서 등록해야 다른 훅 다음(마지막)에 압축한다
+    app.after_request(_compress_response)
+
+
+def _is_compressible(response):
+    mimetype = response.mimetype or ""
+    return mimetype.startswith("text/") or mimetype in COMPRESSIBLE_TYPES
+
+
+def negotiate(response):
+    """이 응답에 쓸 인코딩. 압축하지 않을 응답이면 None."""
+    config = current_app.config
+    if not config.get("COMPRESSION_ENABLED", True) or request.method == "HEAD":
+        return None
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return None
+    if response.direct_passthrough or "Content-Encoding" in response.headers:
+        return None
+    if "no-transform" in (response.headers.get("Cache-Control") or ""):
+        return None
+    if not _is_compressible(response):
+        return None
+    response.vary.add("Accept-Encoding")
+    if not response.is_streamed:
+        length = response.calculate_content_length()
+        if length is not None and length < config.get("COMPRESSION_MIN_SIZE", 500):
+            return None
+    available = [e for e in config.get("COMPRESSION_ENCODINGS", DEFAULT_ENCODINGS) if e in _COMPRESSORS]
+    return request.accept_encodings.best_match(available)
+
+
+def compress(data, encoding, cached=False):
+    """본문 전체를 한 번에 압축한다. cached=True면 캐시 저장용으로 더 높은 수준을 쓴다."""
+    levels = current_app.config.get("COMPRESSION_CACHED_LEVELS" if cached else "COMPRESSION_LEVELS")
+    levels = levels or (DEFAULT_CACHED_LEVELS if cached else DEFAULT_LEVELS)
+    compressor = _COMPRESSORS[encoding](levels[encoding])
+    return compressor.compress(data, flush=False) + compressor.finish()
+
+
+def apply(response, encoding, data):
+    """이미 압축한 본문(data)을 응답에 넣고 헤더를 맞춘다."""
+    response.set_data(data)
+    _mark(response, encoding)
+
+
+def _mark(response, encoding):
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+def _stream(chunks, compressor):
+    # 본문은 요청이 끝난 뒤 WSGI 서버가 읽으므로 여기서는 앱 컨텍스트를 쓰지 않는다
+    try:
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+
+
+def _compress_response(response):
+    encoding = negotiate(response)
+    if encoding is None:
+        return response
+    if response.is_streamed:
+        # 청크마다 flush 하므로 클라이언트는 압축된 데이터를 바로바로 받는다
+        level = (current_app.config.get("COMPRESSION_LEVELS") or DEFAULT_LEVELS)[encoding]
+        response.response = _stream(response.iter_encoded(), _COMPRESSORS[encoding](level))
+        response.headers.pop("Content-Length", None)
+        _mark(response, encoding)
+    else:
+        apply(response, encoding, compress(response.get_data(), encoding))
+    return response
@@ -1,3 +1,101 @@
+import random
+import time
+
+from flask import current_app, g, has_app_context, has_request_context, request, session
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+
+# DB 연결 풀 / 읽기 전용 복제본(replica) 라우팅
+# - 풀 설정: DB_POOL_SIZE(10) / DB_MAX_OVERFLOW(20) / DB_POOL_TIMEOUT(30) / DB_POOL_RECYCLE(1800초)
+#   / DB_POOL_PRE_PING(True). SQLALCHEMY_ENGINE_OPTIONS에 직접 적은 값이 있으면 그 값이 우선
+# - DB_REPLICA_URIS: 복제본 DB URI 목록. 설정하면 GET/HEAD 요청의 SELECT는 요청마다 고른 복제본 하나로,
+#   그 외(쓰기 요청, INSERT/UPDATE/DELETE, flush, 백그라운드 스레드)는 모두 primary로 보낸다
+# - 쓴 직후 읽기(read-your-writes): 요청에서 쓰기가 일어나면 같은 요청의 이후 쿼리와
+#   이 세션(브라우저)의 다음 DB_REPLICA_STICKY_SECONDS초(기본 5초) 동안의 요청은 primary에서 읽는다
+# - 다른 사용자의 요청이라도 게시판 캐시가 무효화된 직후 DB_REPLICA_STICKY_SECONDS초 동안은 캐시를 다시 채우는 조회를
+#   primary에서 한다 (app/cache.py) -> 뒤처진 복제본의 쓰기 전 데이터가 캐시에 TTL 동안 다시 들어가지 않는다
+# - 로컬 확인: 같은 DB를 가리키는 두 번째 URI(예: 별도 계정)나 primary를 복사한 SQLite 파일을
+#   DB_REPLICA_URIS에 넣고 GET/POST를 번갈아 보내면 어느 엔진으로 가는지 확인할 수 있다
+
+REPLICA_BIND_PREFIX = "replica_"
+STICKY_SESSION_KEY = "db_primary_until"
+
+
+def _is_read(clause):
+    if getattr(clause, "is_select", False):
+        return True
+    # text("SELECT ...") 같은 원본 SQL
+    return clause is not None and hasattr(clause, "text") and clause.text.lstrip().upper().startswith("SELECT")
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_app_context():
+            if self._flushing or (clause is not None and not _is_read(clause)):
+                # 쓰기가 시작되면 이 요청의 나머지 쿼리도 primary에서 (방금 쓴 내용이 보이도록)
+                g.db_wrote = True
+                g.db_replica = None
+            elif clause is not None and g.get("db_replica"):
+                return self._db.engines[g.db_replica]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+
+def configure(app):
+    """db.init_app() 전에 호출: 풀 설정과 복제본 bind를 config에 채운다."""
+    uri = app.config.get("SQLALCHEMY_DATABASE_URI", "")
+    options = app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", {})
+    options.setdefault("pool_pre_ping", app.config.get("DB_POOL_PRE_PING", True))
+    options.setdefault("pool_recycle", app.config.get("DB_POOL_RECYCLE", 1800))
+    if not uri.startswith("sqlite"):
+        # SQLite는 파일/메모리 DB에 맞는 풀을 SQLAlchemy가 고르므로 크기 설정을 넘기지 않는다
+        options.setdefault("pool_size", app.config.get("DB_POOL_SIZE", 10))
+        options.setdefault("max_overflow", app.config.get("DB_MAX_OVERFLOW", 20))
+        options.setdefault("pool_timeout", app.config.get("DB_POOL_TIMEOUT", 30))
+
+    replicas = app.config.get("DB_REPLICA_URIS") or []
+    binds = app.config.setdefault("SQLALCHEMY_BINDS", {})
+    for i, replica_uri in enumerate(replicas):
+        binds.setdefault(f"{REPLICA_BIND_PREFIX}{i}", replica_uri)
+    app.extensions["db_replicas"] = [f"{REPLICA_BIND_PREFIX}{i}" for i in range(len(replicas))]
+
+    app.before_request(_choose_replica)
+    app.after_request(_remember_write)
+
+
+def _choose_replica():
+    g.db_replica = None
+    replicas = current_replicas()
+    if not replicas or request.method not in ("GET", "HEAD"):
+        return
+    if session.get(STICKY_SESSION_KEY, 0) > time.time():
+        return  # 방금 쓴 사용자는 primary에서 읽는다
+    g.db_replica = random.choice(replicas)
+
+
+def _remember_write(response):
+    if g.get("db_wrote") and current_replicas():
+        sticky = current_app.config.get("DB_REPLICA_STICKY_SECONDS", 5)
+        session[STICKY_SESSION_KEY] = time.time() + sticky
+    return response
+
+
+def read_from_primary():
+    """이 요청의 남은 읽기를 primary로 보낸다 (쓰기 직후 응답 캐시를 다시 채울 때, app/cache.py)."""
+    if has_request_context():
+        g.db_replica = None
+
+
+def dispose_engines(close=False):
+    """primary와 모든 복제본 bind의 커넥션 풀을 비운다 (gunicorn fork 직후, gunicorn.conf.py).
+    close=False면 부모 프로세스의 커넥션은 닫지 않고 이 프로세스에서만 버린다."""
+    for engine in db.engines.values():
+        engine.dispose(close=close)
+
 
-db = SQLAlchemy()
+def current_replicas():
+    if not has_request_context():
+        return []
+    return current_app.extensions.get("db_replicas", [])
@@ -0,0 +1,318 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+import orjson
+from flask import Blueprint, current_app, jsonify, request
+
+from app import post_list
+from app.json_provider import OPTIONS
+
+# 실시간 알림 (Server-Sent Events)
+# - GET /api/events?topics=lost_item,found_item,comments:lost_item:3
+#   토픽: 게시판 이름(글 등록/수정/삭제) 또는 comments:<게시판>:<글 번호>(댓글 등록)
+#   이벤트 본문: {"id", "type", "topic", "data"}. type은 post.created / post.updated / post.deleted /
+#   comment.created, 그리고 놓친 이벤트가 있어 목록을 다시 받아야 할 때 reset
+# - 라우트는 commit 이후 publish()만 호출한다 -> 브로커가 구독 중인 연결에 나눠 준다
+#   EVENTS_BROKER_TYPE: memory(프로세스 안에서만) / redis(PUBLISH/SUBSCRIBE로 여러 워커·서버에 전달)
+#   기본값은 워커가 하나면 memory, 여러 개(WORKER_PROCESSES > 1)면 redis. memory로는 다른 워커에서 발행한 이벤트를
+#   받지 못하고 이벤트 번호도 워커마다 달라 Last-Event-ID로 이어 받기가 틀리므로, 워커가 여러 개인데 memory를
+#   지정하면 시작 전 점검(app/self_check.py)이 실패한다
+#   redis 클라이언트는 requirements.txt에 고정되어 있고, Redis 서버에 닿지 않으면 시작 전 점검이 URL과 함께 알려 준다
+#   EVENTS_REDIS_URL, 테스트에서는 EVENTS_REDIS_CLIENT에 redis 호환 객체(fakeredis 등)를 넣는다
+# - 최근 EVENTS_HISTORY개(기본 200) 이벤트를 보관해, 재연결할 때 Last-Event-ID 이후 것을 이어서 보낸다
+#   (보관 범위를 벗어났거나 연결이 밀려 큐가 넘치면 reset을 보내고 끊는다 -> 클라이언트가 다시 조회)
+# - gthread 워커는 연결 하나가 스레드 하나를 계속 잡는다. 그래서 프로세스당 EVENTS_MAX_CONNECTIONS개(기본 32)까지만 받고
+#   gunicorn.conf.py가 요청 처리용 GUNICORN_THREADS에 그만큼 스레드를 더 띄운다 (연결은 큐에서 기다리기만 하고 DB를 쓰지 않음)
+#   -> 동시 연결 수 = 워커 수 x EVENTS_MAX_CONNECTIONS. 넘으면 503 + Retry-After, 클라이언트는 점점 길게 기다렸다가
+#      다시 시도하고 계속 거절되면 구독을 그만둔다 (client/src/services/events.js)
+# - EVENTS_STREAM_SECONDS(기본 300초)마다 끊어서 스레드를 돌려준다 (브라우저가 Last-Event-ID로 바로 재연결)
+# - 응답은 압축하지 않는다 (Cache-Control: no-transform, app/compression.py) / nginx 버퍼링 끔 (X-Accel-Buffering)
+
+EVENTS_HISTORY = 200
+EVENTS_QUEUE_SIZE = 100
+EVENTS_MAX_CONNECTIONS = 32
+EVENTS_STREAM_SECONDS = 300
+KEEPALIVE_SECONDS = 15
+RETRY_MS = 3000
+OVERLOADED_RETRY_SECONDS = 30
+MAX_TOPICS = 20
+BOARDS = ("lost_item", "found_item", "share_item", "notice")
+REDIS_CHANNEL = "csibee:events"
+
+events_bp = Blueprint("events", __name__)
+
+
+class Subscription:
+    def __init__(self, topics, size):
+        self.topics = topics
+        self.queue = queue.Queue(maxsize=size)
+        self.overflowed = False
+
+    def put(self, event):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            # 읽는 쪽이 밀렸으면 더 쌓지 않고 reset 후 끊는다 (None = 끊으라는 표시)
+            self.overflowed = True
+            while True:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            self.queue.put_nowait(None)
+
+
+class MemoryBroker:
+    """프로세스 안에서만 전달하는 브로커. 이벤트 = (id, topic, body)"""
+
+    def __init__(self, history=EVENTS_HISTORY):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._history = deque(maxlen=history)
+        self._last_id = 0
+
+    def _next_id(self):
+        self._last_id += 1
+        return self._last_id
+
+    def publish(self, topic, body_for):
+        """body_for(id) -> 직렬화된 본문. id를 먼저 정해야 본문을 만들 수 있다."""
+        with self._lock:
+            event_id = self._next_id()
+            self._deliver((event_id, topic, body_for(event_id)))
+
+    def _deliver(self, event):
+        # self._lock을 잡은 상태에서 호출
+        self._history.append(event)
+        self._last_id = max(self._last_id, event[0])
+        for subscription in self._subscribers:
+            if event[1] in subscription.topics:
+                subscription.put(event)
+
+    def subscribe(self, topics, last_event_id, size):
+        """구독을 등록하고 (구독, 이어서 보낼 이벤트 목록 또는 놓친 게 있으면 None)을 돌려준다."""
+        subscription = Subscription(topics, size)
+        with self._lock:
+            self._subscribers.add(subscription)
+            if last_event_id is None:
+                return subscription, []
+            oldest = self._history[0][0] if self._history else self._last_id + 1
+            if last_event_id > self._last_id or last_event_id < oldest - 1:
+                return subscription, None  # 서버 재시작 / 보관 범위 밖
+            return subscription, [e for e in self._history if e[0] > last_event_id and e[1] in topics]
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+
+class RedisBroker(MemoryBroker):
+    """id는 INCR, 전달은 PUBLISH. 프로세스마다 SUBSCRIBE 스레드 하나가 받아서 자기 구독자에게 나눠 준다.
+    (자기가 발행한 이벤트도 이 스레드를 거쳐 받는다)"""
+
+    def __init__(self, client, history=EVENTS_HISTORY):
+        super().__init__(history)
+        self.client = client
+        self._listener_pid = None
+
+    def publish(self, topic, body_for):
+        event_id = self.client.incr(f"{REDIS_CHANNEL}:id")
+        self.client.publish(REDIS_CHANNEL, body_for(event_id))
+
+    def subscribe(self, topics, last_event_id, size):
+        self._ensure_listener()
+        return super().subscribe(topics, last_event_id, size)
+
+    def _ensure_listener(self):
+        # fork 이후의 워커 프로세스에서는 새로 띄운다 (preload 시 master에서 만든 스레드는 넘어오지 않음)
+        with self._lock:
+            if self._listener_pid == os.getpid():
+                return
+            self._listener_pid = os.getpid()
+            self._history.clear()
+            self._last_id = int(self.client.get(f"{REDIS_CHANNEL}:id") or 0)
+        threading.Thread(target=self._listen, name="events-listener", daemon=True).start()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(REDIS_CHANNEL)
+                for message in pubsub.listen():
+                    body = message["data"]
+                    event = orjson.loads(body)
+                    with self._lock:
+                        self._deliver((event["id"], event["topic"], body))
+            except Exception as e:
+                print("❌ [이벤트 수신 끊김] :", e)
+                time.sleep(1)
+
+
+_broker = MemoryBroker()
+_connections = 0
+_connections_lock = threading.Lock()
+
+
+def init_app(app):
+    global _broker
+    broker_type = app.config.get("EVENTS_BROKER_TYPE") or (
+        "redis" if app.config.get("WORKER_PROCESSES", 1) > 1 else "memory")
+    app.config["EVENTS_BROKER_TYPE"] = broker_type  # 시작 전 점검에서 실제로 쓰는 값을 본다
+    history = app.config.get("EVENTS_HISTORY", EVENTS_HISTORY)
+    if broker_type == "memory":
+        _broker = MemoryBroker(history)
+    elif broker_type == "redis":
+        client = app.config.get("EVENTS_REDIS_CLIENT")
+        if client is None:
+            # requirements.txt에 고정되어 있음 (워커가 여러 개인 기본 운영 설정에서 쓰므로)
+            import redis
+            client = redis.Redis.from_url(app.config.get("EVENTS_REDIS_URL", "redis://localhost:6379/0"))
+        _broker = RedisBroker(client, history)
+    else:
+        raise ValueError(f"알 수 없는 EVENTS_BROKER_TYPE: {broker_type}")
+
+
+def check():
+    """브로커에 닿는지 확인한다 (시작 전 점검용). 실패하면 예외."""
+    if isinstance(_broker, RedisBroker):
+        _broker.client.ping()
+
+
+def publish(topic, event_type, data):
+    """이벤트를 발행한다. commit 이후에 호출한다. 실패해도 요청은 그대로 성공시킨다."""
+    default = current_app.json.default
+
+    def body_for(event_id):
+        return orjson.dumps({"id": event_id, "type": event_type, "topic": topic, "data": data},
+                            default=default, option=OPTIONS)
+
+    try:
+        _broker.publish(topic, body_for)
+    except Exception as e:
+        print("❌ [이벤트 발행 실패] :", topic, event_type, e)
+
+
+def publish_post(board, event_type, post_id):
+    """게시글 이벤트. 삭제는 글 번호만, 등록/수정은 목록 원소와 같은 형식의 글을 보낸다 (app/post_list.py)."""
+    data = None
+    if event_type != "post.deleted":
+        try:
+            data = post_list.item(board, post_id)
+        except Exception as e:
+            print("❌ [이벤트 발행 실패] :", board, event_type, e)
+            return
+    publish(board, event_type, data or {f"{board}_post_id": post_id})
+
+
+def comment_topic(category, post_id):
+    return f"comments:{category}:{post_id}"
+
+
+def _parse_topics(raw):
+    topics = [t for t in (raw or "").split(",") if t]
+    if not topics or len(topics) > MAX_TOPICS:
+        return None
+    for topic in topics:
+        parts = topic.split(":")
+        if len(parts) == 1 and topic in BOARDS:
+            continue
+        if len(parts) == 3 and parts[0] == "comments" and parts[1] in BOARDS and parts[2].isdigit():
+            continue
+        return None
+    return frozenset(topics)
+
+
+def _frame(event_id, body):
+    head = b"id: %d\n" % event_id if event_id is not None else b""
+    return head + b"data: " + body + b"\n\n"
+
+
+def _reset_frame():
+    return _frame(None, orjson.dumps({"type": "reset"}))
+
+
+def _acquire(limit):
+    global _connections
+    with _connections_lock:
+        if _connections >= limit:
+            return False
+        _connections += 1
+        return True
+
+
+def _release():
+    global _connections
+    with _connections_lock:
+        _connections -= 1
+
+
+def _stream(subscription, backlog, stream_seconds):
+    # 본문은 요청이 끝난 뒤 WSGI 서버가 읽으므로 여기서는 앱 컨텍스트를 쓰지 않는다
+    yield b"retry: %d\n\n" % RETRY_MS
+    if backlog is None:
+        yield _reset_frame()
+        backlog = []
+    sent = set()
+    for event_id, _, body in backlog:
+        sent.add(event_id)
+        yield _frame(event_id, body)
+
+    deadline = time.monotonic() + stream_seconds
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            event = subscription.queue.get(timeout=min(KEEPALIVE_SECONDS, remaining))
+        except queue.Empty:
+            yield b": keepalive\n\n"  # 프록시가 유휴 연결을 끊지 않도록
+            continue
+        if event is None:
+            yield _reset_frame()
+            break
+        event_id, _, body = event
+        if event_id in sent:
+            continue  # 구독과 이어 보내기 사이에 들어와 이미 보낸 이벤트
+        yield _frame(event_id, body)
+
+
+@events_bp.route("/", methods=["GET"])
+def stream_events():
+    topics = _parse_topics(request.args.get("topics"))
+    if topics is None:
+        return jsonify({"error": "Invalid topics"}), 400
+
+    # EventSource는 재연결할 때 Last-Event-ID 헤더를 보낸다 (처음 연결은 쿼리 파라미터로도 받는다)
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    last_event_id = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+
+    config = current_app.config
+    if not _acquire(config.get("EVENTS_MAX_CONNECTIONS", EVENTS_MAX_CONNECTIONS)):
+        response = jsonify({"error": "Too many event streams"})
+        response.headers["Retry-After"] = str(OVERLOADED_RETRY_SECONDS)
+        return response, 503
+    try:
+        subscription, backlog = _broker.subscribe(topics, last_event_id,
+                                                  config.get("EVENTS_QUEUE_SIZE", EVENTS_QUEUE_SIZE))
+    except Exception:
+        _release()
+        raise
+
+    response = current_app.response_class(
+        _stream(subscription, backlog, config.get("EVENTS_STREAM_SECONDS", EVENTS_STREAM_SECONDS)),
+        mimetype="text/event-stream")
+
+    # 본문을 읽기 전에 끊겨도 정리되도록 제너레이터의 finally가 아니라 close 훅에서 해제
+    @response.call_on_close
+    def _closed():
+        _broker.unsubscribe(subscription)
+        _release()
+
+    response.headers["Cache-Control"] = "no-cache, no-transform"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
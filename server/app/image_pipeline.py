@@ -0,0 +1,173 @@
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageOps, features
+
+from app.database import db
+from app import cache, matching, events, upload_store
+from app.models import PostImage, UploadBlob
+
+# 업로드 이미지 후처리 파이프라인 (백그라운드 워커 풀)
+# - 게시글 등록 요청은 원본만 저장하고 바로 응답, 나머지는 여기서 비동기로 처리
+# - 원본은 건드리지 않는다: EXIF 제거 / 회전 반영은 저장 전에 끝나 있고 (app/upload_ingest.py)
+#   파일 이름이 내용의 sha256이라 덮어쓰면 중복 제거와 immutable 캐시가 깨진다
+# - 변형본: 긴 변 기준 thumb/medium/large 크기로 줄여 WebP(+ 지원 시 AVIF)로 저장하고
+#   post_images 테이블에 게시글 단위로 기록 (원본 행에는 크기를 채움) -> 목록 화면은 thumb만 내려준다
+# - 원본의 지각 해시(dHash)를 원본 행에 저장하고, 분실물/습득물이면 매칭을 다시 계산 (app/matching.py)
+# - 처리하는 동안 게시글이 삭제됐으면(원본 행이 없으면) 행을 넣지 않고, 다른 게시글이 같은 내용을 쓰지 않는 한
+#   방금 쓴 변형본 파일도 지운다 (삭제 쪽 정리 post_images.remove_post / upload_store.purge가 이미 지나갔을 수 있으므로)
+# - IMAGE_WORKERS: 워커 스레드 수 (기본 2)
+
+VARIANT_SIZES = {"thumb": 320, "medium": 800, "large": 1600}
+WEBP_QUALITY = 80
+AVIF_QUALITY = 60
+UPLOAD_URL_PREFIX = "/static/uploads/"
+
+_app = None
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def init_app(app):
+    global _app
+    _app = app
+
+
+def _get_executor():
+    # fork 이후의 워커 프로세스에서는 새 풀을 만든다
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=_app.config.get("IMAGE_WORKERS", 2),
+                thread_name_prefix="image-pipeline",
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def _formats():
+    formats = ["webp"]
+    if features.check("avif"):
+        formats.append("avif")
+    return formats
+
+
+def _local_path(url):
+    return os.path.join(_app.config["UPLOAD_FOLDER"], url[len(UPLOAD_URL_PREFIX):])
+
+
+def submit(board, post_id, image_urls):
+    """게시글 이미지 후처리를 워커 풀에 넘긴다. commit 이후에 호출한다."""
+    executor = _get_executor()
+    for position, url in enumerate(image_urls):
+        executor.submit(_run, board, post_id, position, url)
+
+
+def _run(board, post_id, position, url):
+    with _app.app_context():
+        try:
+            _process(board, post_id, position, url)
+        except Exception as e:
+            db.session.rollback()
+            print("❌ [이미지 처리 실패] :", url, e)
+        finally:
+            db.session.remove()
+
+
+def _save_atomic(image, path, **kwargs):
+    # 같은 파일을 여러 게시글이 동시에 처리해도 읽는 쪽이 반쯤 쓰인 파일을 보지 않도록
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    image.save(tmp_path, **kwargs)
+    os.replace(tmp_path, path)
+
+
+def _dhash(image):
+    # 9x8 흑백으로 줄여 옆 픽셀과 밝기를 비교한 64비트 해시 (비슷한 사진은 해밍 거리가 작다)
+    small = image.convert("L").resize((9, 8), Image.LANCZOS)
+    pixels = list(small.getdata())
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            value = (value << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return f"{value:016x}"
+
+
+def _process(board, post_id, position, url):
+    path = _local_path(url)
+    stem = os.path.splitext(url)[0]
+    planned = [(variant, fmt, f"{stem}_{variant}.{fmt}") for variant in VARIANT_SIZES for fmt in _formats()]
+
+    def make_row(variant, fmt, variant_url, width, height):
+        return PostImage(
+            board=board,
+            post_id=post_id,
+            position=position,
+            original_url=url,
+            variant=variant,
+            format=fmt,
+            url=variant_url,
+            width=width,
+            height=height,
+        )
+
+    variants, written = [], []
+    original_size = (None, None)
+    if all(os.path.exists(_local_path(variant_url)) for _, _, variant_url in planned):
+        # 같은 내용의 이미지가 이미 처리돼 있음 (upload_store 중복 제거) -> 기록만 추가
+        for variant, fmt, variant_url in planned:
+            with Image.open(_local_path(variant_url)) as done:
+                variants.append(make_row(variant, fmt, variant_url, done.width, done.height))
+        with Image.open(path) as source:
+            original_size = source.size
+            phash = _dhash(source)
+    else:
+        with Image.open(path) as source:
+            # 업로드 때 이미 회전을 반영했으므로 보통은 그대로. 예전(uuid 이름) 파일만 여기서 돌려서 변형본을 만든다
+            image = ImageOps.exif_transpose(source)
+            original_size = image.size
+            phash = _dhash(image)
+
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+            for variant, max_edge in VARIANT_SIZES.items():
+                resized = image.copy()
+                resized.thumbnail((max_edge, max_edge), Image.LANCZOS)  # 원본보다 키우지는 않음
+                for fmt in _formats():
+                    variant_url = f"{stem}_{variant}.{fmt}"
+                    quality = WEBP_QUALITY if fmt == "webp" else AVIF_QUALITY
+                    _save_atomic(resized, _local_path(variant_url), format=fmt.upper(), quality=quality)
+                    written.append(_local_path(variant_url))
+                    variants.append(make_row(variant, fmt, variant_url, resized.width, resized.height))
+
+    # 원본 행을 먼저 갱신해 잠근다: 0행이면 처리하는 동안 게시글이 삭제된 것 (삭제는 원본 행을 같이 지움)
+    updated = (PostImage.query
+               .filter_by(board=board, post_id=post_id, position=position, variant="original")
+               .update({"width": original_size[0], "height": original_size[1], "phash": phash},
+                       synchronize_session=False))
+    if not updated:
+        db.session.rollback()
+        _discard(url, written)
+        return
+    db.session.add_all(variants)
+    db.session.commit()
+    cache.invalidate_list(board)  # 목록 캐시에 썸네일이 반영되도록
+    matching.submit(board, post_id)  # 사진 유사도를 반영해 다시 계산 (분실물/습득물만)
+    events.publish_post(board, "post.updated", post_id)  # 열려 있는 목록에 썸네일 반영 (app/events.py)
+
+
+def _discard(url, paths):
+    """삭제된 게시글을 위해 쓴 변형본 파일을 지운다. 같은 내용을 아직 참조하는 업로드가 있으면 남긴다."""
+    match = upload_store.BLOB_PATH_RE.match(url[len(UPLOAD_URL_PREFIX):])
+    if match and db.session.query(UploadBlob.sha256).filter(
+            UploadBlob.sha256 == match.group(3), UploadBlob.ref_count > 0).first():
+        return
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
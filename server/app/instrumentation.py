@@ -0,0 +1,216 @@
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import abort, current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.auth import current_user
+
+# 요청별 SQL 계측
+# - SQLAlchemy 엔진 이벤트로 쿼리 수 / DB 시간을 재서 요청(g)에 모은다
+# - 응답에 Server-Timing 헤더(db;dur=..;desc="N queries", app;dur=..)를 붙인다 (SERVER_TIMING_HEADER, 기본 True)
+# - 엔드포인트별 누적값을 /metrics에서 Prometheus 텍스트 형식으로 내보낸다 (워커 프로세스별 값)
+#   METRICS_ENABLED(기본 True). 접근은 METRICS_ALLOWED_IPS(기본 127.0.0.1, ::1)에서 오는 요청과
+#   로그인한 관리자만 허용하고 나머지는 404 (프록시 뒤라면 PROXY_FIX_X_FOR로 실제 IP가 보여야 함, app/__init__.py)
+# - SQL_SLOW_MS(기본 200ms)보다 오래 걸린 쿼리는 로그로 남기고 최근 SLOW_LOG_SIZE개를 /metrics 주석으로 보여준다
+#   주석에는 엔드포인트와 시간만 넣고, SQL 문은 METRICS_SHOW_SLOW_SQL=True일 때만 넣는다 (스키마/검색어 노출 방지)
+# - N+1 회귀 방지: @query_budget(n)을 붙인 라우트가 n개보다 많은 쿼리를 쓰면
+#   QUERY_BUDGET_MODE에 따라 경고("warn", 기본) / 예외("raise", 테스트용) / 무시("off")
+#   테스트 코드에서는 with assert_max_queries(n): ... 로 임의 구간을 검사할 수 있다
+
+DEFAULT_METRICS_ALLOWED_IPS = ("127.0.0.1", "::1")
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+SLOW_LOG_SIZE = 50
+# 게시판 라우트 기본 상한 (캐시 미스 기준): 목록 = 개수 + 목록(컬럼만) + 페이지 글들의 이미지 URL 한 번
+# (app/post_list.py) + 여유분, 상세 = 게시글 + 이미지 + 여유분
+LIST_QUERY_BUDGET = 5
+DETAIL_QUERY_BUDGET = 3
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class _EndpointStats:
+    __slots__ = ("requests", "errors", "duration", "queries", "db_time", "buckets")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.duration = 0.0
+        self.queries = 0
+        self.db_time = 0.0
+        self.buckets = [0] * len(DURATION_BUCKETS)
+
+
+_stats = defaultdict(_EndpointStats)  # (endpoint, method) -> 누적값
+_slow = deque(maxlen=SLOW_LOG_SIZE)
+_lock = threading.Lock()
+_local = threading.local()  # assert_max_queries 카운터
+_listening = False
+
+
+def init_app(app):
+    global _listening
+    if not _listening:
+        # 모든 엔진(primary / 복제본)에 한 번만 건다
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _listening = True
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    if app.config.get("METRICS_ENABLED", True):
+        app.add_url_rule("/metrics", "metrics", metrics_view)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    for counter in getattr(_local, "counters", ()):
+        counter.append(statement)
+    if not has_request_context():
+        return
+    g.sql_count = g.get("sql_count", 0) + 1
+    g.sql_time = g.get("sql_time", 0.0) + elapsed
+    if elapsed * 1000 >= current_app.config.get("SQL_SLOW_MS", 200):
+        entry = (request.endpoint, round(elapsed * 1000, 1), " ".join(statement.split())[:500])
+        _slow.append(entry)
+        print("🐢 [느린 쿼리] :", *entry)
+
+
+def _start_request():
+    g.request_start = time.perf_counter()
+    g.sql_count = 0
+    g.sql_time = 0.0
+
+
+def _finish_request(response):
+    if "request_start" not in g:
+        return response
+    duration = time.perf_counter() - g.request_start
+    queries, db_time = g.get("sql_count", 0), g.get("sql_time", 0.0)
+    endpoint = request.endpoint or "unmatched"
+
+    with _lock:
+        stats = _stats[(endpoint, request.method)]
+        stats.requests += 1
+        stats.errors += response.status_code >= 500
+        stats.duration += duration
+        stats.queries += queries
+        stats.db_time += db_time
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if duration <= bound:
+                stats.buckets[i] += 1
+
+    if current_app.config.get("SERVER_TIMING_HEADER", True):
+        response.headers.add(
+            "Server-Timing",
+            f'db;dur={db_time * 1000:.1f};desc="{queries} queries", app;dur={duration * 1000:.1f}',
+        )
+
+    _check_budget(endpoint, queries)
+    return response
+
+
+def _check_budget(endpoint, queries):
+    mode = current_app.config.get("QUERY_BUDGET_MODE", "warn")
+    view = current_app.view_functions.get(endpoint)
+    budget = getattr(view, "query_budget", None)
+    if mode == "off" or budget is None or queries <= budget:
+        return
+    message = f"{endpoint}: 쿼리 {queries}개 실행 (허용 {budget}개)"
+    if mode == "raise":
+        raise QueryBudgetExceeded(message)
+    print("⚠️ [쿼리 수 초과] :", message)
+
+
+def query_budget(max_queries):
+    """라우트가 한 요청에 쓸 수 있는 쿼리 수 상한 (캐시 미스 기준)."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            return view(*args, **kwargs)
+        wrapper.query_budget = max_queries
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def assert_max_queries(max_queries):
+    """with 블록 안에서 실행된 쿼리가 max_queries개를 넘으면 QueryBudgetExceeded."""
+    statements = []
+    counters = getattr(_local, "counters", [])
+    _local.counters = counters + [statements]
+    try:
+        yield statements
+    finally:
+        _local.counters = counters
+    if len(statements) > max_queries:
+        raise QueryBudgetExceeded(
+            f"쿼리 {len(statements)}개 실행 (허용 {max_queries}개):\n" + "\n".join(statements))
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def render_metrics():
+    with _lock:
+        snapshot = {key: (s.requests, s.errors, s.duration, s.queries, s.db_time, list(s.buckets))
+                    for key, s in _stats.items()}
+        slow = list(_slow)
+
+    lines = [
+        "# HELP csibee_requests_total 처리한 요청 수",
+        "# TYPE csibee_requests_total counter",
+    ]
+    for (endpoint, method), (requests_, *_rest) in sorted(snapshot.items()):
+        lines.append(f'csibee_requests_total{{endpoint="{_label(endpoint)}",method="{method}"}} {requests_}')
+
+    lines += ["# HELP csibee_request_errors_total 5xx 응답 수", "# TYPE csibee_request_errors_total counter"]
+    for (endpoint, method), (_, errors, *_rest) in sorted(snapshot.items()):
+        lines.append(f'csibee_request_errors_total{{endpoint="{_label(endpoint)}",method="{method}"}} {errors}')
+
+    lines += ["# HELP csibee_request_duration_seconds 요청 처리 시간", "# TYPE csibee_request_duration_seconds histogram"]
+    for (endpoint, method), (requests_, _, duration, _, _, buckets) in sorted(snapshot.items()):
+        labels = f'endpoint="{_label(endpoint)}",method="{method}"'
+        for bound, count in zip(DURATION_BUCKETS, buckets):
+            lines.append(f'csibee_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+        lines.append(f'csibee_request_duration_seconds_bucket{{{labels},le="+Inf"}} {requests_}')
+        lines.append(f"csibee_request_duration_seconds_sum{{{labels}}} {duration:.6f}")
+        lines.append(f"csibee_request_duration_seconds_count{{{labels}}} {requests_}")
+
+    lines += ["# HELP csibee_db_queries_total 실행한 SQL 문 수", "# TYPE csibee_db_queries_total counter"]
+    for (endpoint, method), (_, _, _, queries, _, _) in sorted(snapshot.items()):
+        lines.append(f'csibee_db_queries_total{{endpoint="{_label(endpoint)}",method="{method}"}} {queries}')
+
+    lines += ["# HELP csibee_db_seconds_total SQL 실행에 쓴 시간", "# TYPE csibee_db_seconds_total counter"]
+    for (endpoint, method), (_, _, _, _, db_time, _) in sorted(snapshot.items()):
+        lines.append(f'csibee_db_seconds_total{{endpoint="{_label(endpoint)}",method="{method}"}} {db_time:.6f}')
+
+    show_sql = current_app.config.get("METRICS_SHOW_SLOW_SQL", False)
+    for endpoint, elapsed_ms, statement in slow:
+        line = f"# slow_query endpoint={endpoint} ms={elapsed_ms}"
+        lines.append(f"{line} sql={statement}" if show_sql else line)
+    return "\n".join(lines) + "\n"
+
+
+def _metrics_allowed():
+    allowed = current_app.config.get("METRICS_ALLOWED_IPS", DEFAULT_METRICS_ALLOWED_IPS)
+    if request.remote_addr in allowed:
+        return True
+    user = current_user()
+    return bool(user and user.is_confirmed and user.is_admin)
+
+
+def metrics_view():
+    if not _metrics_allowed():
+        abort(404)  # 있는지도 알리지 않는다
+    return current_app.response_class(render_metrics(), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,69 @@
+import orjson
+from flask import current_app, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+
+# JSON 직렬화 (orjson)
+# - app.json을 OrjsonProvider로 바꿔 jsonify / 응답 캐시(app/cache.py) 모두 orjson으로 직렬화한다
+# - datetime은 ISO 8601 문자열로 보낸다. DB의 naive datetime은 UTC로 저장하므로 +00:00을 붙인다
+#   (Flask 기본값은 "Sat, 18 Oct 2026 00:00:00 GMT" 형식. 클라이언트의 new Date()는 둘 다 읽는다)
+# - DB 커서를 따라 읽는 큰 응답(사용자 내보내기 등)은 stream_json()으로 원소를 하나씩 직렬화하며 청크로 내보낸다
+#   (이미 메모리에 다 만들어 둔 응답은 스트리밍해도 이득이 없고 ETag/304를 못 쓰므로 일반 응답으로)
+#   -> 응답 전체를 문자열로 만들지 않으므로 결과 크기와 관계없이 메모리 사용량이 일정하다
+
+OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # separators / indent 등 표준 json 인자를 직접 넘기는 경우 (세션 직렬화 등)
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=OPTIONS).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        option = OPTIONS
+        if self.compact is False or (self.compact is None and self._app.debug):
+            option |= orjson.OPT_INDENT_2
+        body = orjson.dumps(obj, default=self.default, option=option) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_app(app):
+    app.json = OrjsonProvider(app)
+
+
+def _dumps(obj):
+    return orjson.dumps(obj, default=current_app.json.default, option=OPTIONS)
+
+
+def stream_json(key, items, serialize=None, **meta):
+    """{key: [원소, ...], **meta} 응답을 원소 단위로 직렬화하며 내보낸다.
+
+    items는 DB 커서를 따라 읽는 iterable(예: query.yield_per(n)), serialize는 원소 -> dict 변환.
+    meta 값이 callable이면 모든 원소를 내보낸 뒤 호출한 결과를 넣는다 (next_cursor 등 끝까지 읽어야 아는 값).
+    본문은 STREAM_CHUNK_SIZE 단위로 모아서 보낸다.
+    """
+    def generate():
+        buffer = bytearray(b"{" + _dumps(key) + b":[")
+        for i, item in enumerate(items):
+            if i:
+                buffer += b","
+            buffer += _dumps(serialize(item) if serialize else item)
+            if len(buffer) >= STREAM_CHUNK_SIZE:
+                yield bytes(buffer)
+                buffer.clear()
+        buffer += b"]"
+        for name, value in meta.items():
+            buffer += b"," + _dumps(name) + b":" + _dumps(value() if callable(value) else value)
+        buffer += b"}\n"
+        yield bytes(buffer)
+
+    # 스트리밍 중에도 요청 컨텍스트(DB 세션)를 유지한다
+    return current_app.response_class(stream_with_context(generate()), mimetype="application/json")
@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import defaultdict, deque
+
+from flask import current_app
+
+# 로그인 시도 제한 (프로세스 내 슬라이딩 윈도우)
+# - IP별: LOGIN_IP_LIMIT회 / LOGIN_IP_WINDOW초 (기본 30회 / 60초), 성공·실패 모두 센다
+#   IP는 request.remote_addr. 프록시 뒤라면 PROXY_FIX_X_FOR를 설정해야 실제 클라이언트 IP가 된다
+#   (안 하면 모든 사용자가 프록시 IP 하나로 묶여 사이트 전체가 분당 30회로 제한됨)
+# - 계정별: 실패 LOGIN_ACCOUNT_LIMIT회 / LOGIN_ACCOUNT_WINDOW초 (기본 5회 / 300초), 로그인 성공 시 초기화
+# - 제한에 걸리면 비밀번호 해시를 계산하기 전에 429로 돌려보낸다
+# - 워커 프로세스마다 따로 센다 (워커 수만큼 느슨해짐)
+
+MAX_KEYS = 100000
+
+_attempts = defaultdict(deque)  # ("ip"|"account", 값) -> 시도 시각들
+_lock = threading.Lock()
+
+
+def _limits(kind):
+    config = current_app.config
+    if kind == "ip":
+        return config.get("LOGIN_IP_LIMIT", 30), config.get("LOGIN_IP_WINDOW", 60)
+    return config.get("LOGIN_ACCOUNT_LIMIT", 5), config.get("LOGIN_ACCOUNT_WINDOW", 300)
+
+
+def _retry_after(key, now):
+    """제한에 걸렸으면 다시 시도할 수 있을 때까지 남은 초, 아니면 0. _lock 안에서 호출."""
+    limit, window = _limits(key[0])
+    hits = _attempts.get(key)
+    if not hits:
+        return 0
+    while hits and hits[0] <= now - window:
+        hits.popleft()
+    if not hits:
+        del _attempts[key]
+        return 0
+    if len(hits) < limit:
+        return 0
+    return int(hits[0] + window - now) + 1
+
+
+def _hit(key, now):
+    if len(_attempts) >= MAX_KEYS:
+        _attempts.clear()
+    _attempts[key].append(now)
+
+
+def check(user_id, ip):
+    """로그인 시도를 기록하고, 제한에 걸렸으면 Retry-After 초를 돌려준다 (0이면 통과)."""
+    now = time.monotonic()
+    with _lock:
+        retry_after = max(_retry_after(("ip", ip), now), _retry_after(("account", user_id), now))
+        if retry_after:
+            return retry_after
+        _hit(("ip", ip), now)
+        return 0
+
+
+def record_failure(user_id):
+    with _lock:
+        _hit(("account", user_id), time.monotonic())
+
+
+def reset(user_id):
+    with _lock:
+        _attempts.pop(("account", user_id), None)
@@ -0,0 +1,230 @@
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from sqlalchemy import func, desc
+
+from app.database import db
+from app import cache
+from app.models import LostItemPost, FoundItemPost, PostImage, PostMatch, SearchToken
+from app.search import text_tokens
+
+# 분실물 <-> 습득물 매칭
+# - 게시글 등록/수정/이미지 처리 후 백그라운드 워커(MATCH_WORKERS, 기본 1)가 반대쪽 게시판에서 후보를 찾아
+#   post_matches 테이블에 점수와 함께 저장 -> 상세 화면은 저장된 값만 읽는다 (조회 시점 스캔 없음)
+# - 후보: 검색 색인(search_token)에서 물건 이름/장소 토큰이 겹치는 글을 최대 CANDIDATE_LIMIT개
+#   (색인은 게시글 등록/수정 때 이미 갱신되므로 매칭용 색인을 따로 두지 않는다)
+# - 점수: 물건 이름 / 장소 토큰 유사도(Jaccard), 작성일·시간 근접도, 사진 지각 해시(dHash) 거리의 가중 평균
+#   (사진이나 시간 정보가 없으면 그 항목은 빼고 나머지로 계산)
+# - 글마다 상위 MATCH_TOP_K개를 저장하고, 다른 글 쪽에서 만들어진 짝도 점수가 MATCH_MIN_SCORE 이상이면 유지
+
+CANDIDATE_LIMIT = 200
+MATCH_TOP_K = 5
+MATCH_MIN_SCORE = 0.3
+MATCH_WINDOW_DAYS = 60
+WEIGHTS = {"name": 0.45, "location": 0.25, "time": 0.15, "image": 0.15}
+HOUR_RE = re.compile(r"(\d{1,2})\s*시")
+
+# 게시판 -> (모델, PK 이름, 물건 이름 컬럼, 장소 컬럼, 시간 컬럼, post_matches의 내 쪽 컬럼, 반대쪽 게시판)
+SIDES = {
+    "lost_item": (LostItemPost, "lost_item_post_id", "lost_item_name", "lost_location", "lost_time",
+                  "lost_item_post_id", "found_item"),
+    "found_item": (FoundItemPost, "found_item_post_id", "found_item_name", "found_location", "found_time",
+                   "found_item_post_id", "lost_item"),
+}
+
+_app = None
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def init_app(app):
+    global _app
+    _app = app
+
+
+def _get_executor():
+    # fork 이후의 워커 프로세스에서는 새 풀을 만든다
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=_app.config.get("MATCH_WORKERS", 1),
+                thread_name_prefix="matching",
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def submit(board, post_id):
+    """게시글의 매칭 후보 계산을 워커 풀에 넘긴다. commit 이후에 호출한다."""
+    if board in SIDES:
+        _get_executor().submit(_run, board, post_id)
+
+
+def _run(board, post_id):
+    with _app.app_context():
+        try:
+            refresh(board, post_id)
+        except Exception as e:
+            db.session.rollback()
+            print("❌ [매칭 계산 실패] :", board, post_id, e)
+        finally:
+            db.session.remove()
+
+
+def _jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _hour(text):
+    match = HOUR_RE.search(text or "")
+    return int(match.group(1)) % 24 if match else None
+
+
+def _hamming(a, b):
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+def _features(board, post):
+    _, _, name_col, location_col, time_col, _, _ = SIDES[board]
+    return {
+        "name": text_tokens(getattr(post, name_col)) | text_tokens(getattr(post, f"{board}_post_name")),
+        "location": text_tokens(getattr(post, location_col)),
+        "hour": _hour(getattr(post, time_col)),
+        "created_at": post.created_at,
+    }
+
+
+def _score(mine, other, my_hashes, other_hashes):
+    parts = {
+        "name": _jaccard(mine["name"], other["name"]),
+        "location": _jaccard(mine["location"], other["location"]),
+    }
+    if mine["created_at"] and other["created_at"]:
+        days = abs((mine["created_at"] - other["created_at"]).total_seconds()) / 86400
+        time_score = max(0.0, 1 - days / MATCH_WINDOW_DAYS)
+        if mine["hour"] is not None and other["hour"] is not None:
+            hours = abs(mine["hour"] - other["hour"])
+            time_score = 0.7 * time_score + 0.3 * (1 - min(hours, 24 - hours) / 12)
+        parts["time"] = time_score
+    if my_hashes and other_hashes:
+        distance = min(_hamming(a, b) for a in my_hashes for b in other_hashes)
+        parts["image"] = max(0.0, 1 - distance / 32)  # 64비트 중 절반 이상 다르면 0
+    total_weight = sum(WEIGHTS[key] for key in parts)
+    return sum(WEIGHTS[key] * value for key, value in parts.items()) / total_weight
+
+
+def _image_hashes(board, post_ids):
+    hashes = {}
+    rows = (db.session.query(PostImage.post_id, PostImage.phash)
+            .filter(PostImage.board == board, PostImage.post_id.in_(post_ids),
+                    PostImage.variant == "original", PostImage.phash.isnot(None)))
+    for post_id, phash in rows:
+        hashes.setdefault(post_id, []).append(phash)
+    return hashes
+
+
+def _pair_columns(board):
+    _, _, _, _, _, my_col, other_board = SIDES[board]
+    return getattr(PostMatch, my_col), getattr(PostMatch, SIDES[other_board][5])
+
+
+def refresh(board, post_id):
+    """게시글 하나의 매칭 후보를 다시 계산해 저장한다."""
+    model, pk_name, _, _, _, my_col_name, other_board = SIDES[board]
+    other_model, other_pk_name = SIDES[other_board][0], SIDES[other_board][1]
+    other_pk = getattr(other_model, other_pk_name)
+    my_col, other_col = _pair_columns(board)
+
+    existing = {partner: score for partner, score in
+                db.session.query(other_col, PostMatch.score).filter(my_col == post_id)}
+    post = db.session.get(model, post_id)
+
+    keep = {}
+    if post is not None and not post.status:
+        mine = _features(board, post)
+        tokens = mine["name"] | mine["location"]
+        candidate_ids = set(existing)
+        if tokens:
+            candidate_ids.update(pid for pid, _ in (
+                db.session.query(SearchToken.post_id, func.sum(SearchToken.weight).label("weight"))
+                .filter(SearchToken.board == other_board, SearchToken.token.in_(tokens))
+                .group_by(SearchToken.post_id)
+                .order_by(desc("weight"))
+                .limit(CANDIDATE_LIMIT)))
+
+        query = other_model.query.filter(other_pk.in_(candidate_ids), other_model.status.isnot(True))
+        if post.created_at:
+            window = timedelta(days=MATCH_WINDOW_DAYS)
+            query = query.filter(other_model.created_at.between(post.created_at - window, post.created_at + window))
+        candidates = query.all() if candidate_ids else []
+
+        my_hashes = _image_hashes(board, [post_id]).get(post_id, [])
+        other_hashes = _image_hashes(other_board, [getattr(c, other_pk_name) for c in candidates])
+        scores = {}
+        for candidate in candidates:
+            candidate_id = getattr(candidate, other_pk_name)
+            scores[candidate_id] = _score(mine, _features(other_board, candidate),
+                                          my_hashes, other_hashes.get(candidate_id, []))
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        keep = {pid: score for pid, score in ranked[:MATCH_TOP_K] if score >= MATCH_MIN_SCORE}
+        # 상대 글의 상위 후보로 들어가 있던 짝은 점수가 충분하면 남긴다
+        keep.update({pid: scores[pid] for pid in existing if scores.get(pid, 0) >= MATCH_MIN_SCORE})
+
+    PostMatch.query.filter(my_col == post_id).delete(synchronize_session=False)
+    if keep:
+        db.session.execute(PostMatch.__table__.insert(), [
+            {my_col_name: post_id, SIDES[other_board][5]: partner, "score": round(score, 4)}
+            for partner, score in keep.items()
+        ])
+    db.session.commit()
+
+    # 매칭 목록은 상세 응답에 들어가므로 양쪽 상세 캐시를 지운다
+    cache.invalidate_detail(board, post_id)
+    for partner in set(existing) | set(keep):
+        cache.invalidate_detail(other_board, partner)
+
+
+def remove_post(board, post_id):
+    """삭제되는 게시글의 매칭 행을 지우고 짝이었던 반대쪽 글 번호를 돌려준다. 호출한 쪽에서 commit 한다.
+    commit 후 돌려받은 글들의 상세 캐시를 지운다 (invalidate_partners)."""
+    my_col, other_col = _pair_columns(board)
+    partners = [pid for (pid,) in db.session.query(other_col).filter(my_col == post_id)]
+    PostMatch.query.filter(my_col == post_id).delete(synchronize_session=False)
+    return partners
+
+
+def invalidate_partners(board, partners):
+    for partner in partners:
+        cache.invalidate_detail(SIDES[board][6], partner)
+
+
+def possible_matches(board, post_id):
+    """상세 화면용 저장된 매칭 후보 (점수순, 최대 MATCH_TOP_K개)."""
+    my_col, other_col = _pair_columns(board)
+    other_board = SIDES[board][6]
+    other_model, other_pk_name, name_col, location_col = SIDES[other_board][:4]
+    other_pk = getattr(other_model, other_pk_name)
+    rows = (db.session.query(other_pk, getattr(other_model, f"{other_board}_post_name"),
+                             getattr(other_model, name_col), getattr(other_model, location_col),
+                             other_model.created_at, PostMatch.score)
+            .join(PostMatch, other_col == other_pk)
+            .filter(my_col == post_id, other_model.status.isnot(True))
+            .order_by(PostMatch.score.desc())
+            .limit(MATCH_TOP_K))
+    return [{
+        "board": other_board,
+        other_pk_name: pid,
+        f"{other_board}_post_name": title,
+        name_col: item_name,
+        location_col: location,
+        "created_at": created_at,
+        "score": score,
+    } for pid, title, item_name, location, created_at, score in rows]
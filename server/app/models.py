@@ -18,6 +18,16 @@ class User(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # 관리자 사용자 목록(/api/users)의 필터 + 정렬 + keyset 페이지네이션용
+    __table_args__ = (
+        db.Index('ix_user_confirmed_created', 'is_confirmed', 'created_at', 'user_id'),
+        db.Index('ix_user_created', 'created_at', 'user_id'),
+        db.Index('ix_user_grade_class_student', 'grade', 'class_num', 'student_num', 'user_id'),
+        db.Index('ix_user_admission_year', 'admission_year', 'grade', 'class_num'),
+        db.Index('ix_user_name', 'user_name', 'user_id'),
+        db.Index('ix_user_admin_created', 'is_admin', 'created_at', 'user_id'),
+    )
+
 # ✅ 분실물 게시판 테이블
 class LostItemPost(db.Model):
     lost_item_post_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -28,11 +38,23 @@ class LostItemPost(db.Model):
     lost_location = db.Column(db.String(30), nullable=False)
     lost_time = db.Column(db.String(30), nullable=False)
     content = db.Column(db.Text, nullable=False)
-    image_urls = db.Column(db.Text)
+    # 이미지는 post_images 테이블 (원본 + 썸네일 등 변형본, position 순서)
+    images = db.relationship(
+        "PostImage",
+        primaryjoin="and_(PostImage.board == 'lost_item', foreign(PostImage.post_id) == LostItemPost.lost_item_post_id)",
+        order_by="PostImage.position",
+        viewonly=True,
+    )
     status = db.Column(db.Boolean, default=False)
     views = db.Column(db.Integer, default=0)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # 목록 정렬/커서 페이지네이션용 (created_at, id 내림차순 seek)
+    __table_args__ = (
+        db.Index('ix_lost_item_post_created', 'created_at', 'lost_item_post_id'),
+        db.Index('ix_lost_item_post_author', 'author_id', 'created_at'),
+    )
+
 # ✅ 습득물 게시판 테이블
 class FoundItemPost(db.Model):
     found_item_post_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -43,12 +65,24 @@ class FoundItemPost(db.Model):
     found_location = db.Column(db.String(30), nullable=False)
     found_time = db.Column(db.String(30), nullable=False)
     content = db.Column(db.Text, nullable=False)
-    image_urls = db.Column(db.Text)
+    # 이미지는 post_images 테이블 (원본 + 썸네일 등 변형본, position 순서)
+    images = db.relationship(
+        "PostImage",
+        primaryjoin="and_(PostImage.board == 'found_item', foreign(PostImage.post_id) == FoundItemPost.found_item_post_id)",
+        order_by="PostImage.position",
+        viewonly=True,
+    )
     resolved = db.Column(db.Boolean, default=False)
     status = db.Column(db.Boolean, default=False)
     views = db.Column(db.Integer, default=0)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # 목록 정렬/커서 페이지네이션용 (status=False 필터 후 최신순)
+    __table_args__ = (
+        db.Index('ix_found_item_post_status_created', 'status', 'created_at', 'found_item_post_id'),
+        db.Index('ix_found_item_post_author', 'author_id', 'created_at'),
+    )
+
 # ✅ 나눔 게시판 테이블
 class ShareItemPost(db.Model):
     share_item_post_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -56,11 +90,23 @@ class ShareItemPost(db.Model):
     author_id = db.Column(db.String(50), db.ForeignKey('user.user_id'), nullable=False)  # 🔹 변경됨
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     content = db.Column(db.Text, nullable=False)
-    image_urls = db.Column(db.Text)
+    # 이미지는 post_images 테이블 (원본 + 썸네일 등 변형본, position 순서)
+    images = db.relationship(
+        "PostImage",
+        primaryjoin="and_(PostImage.board == 'share_item', foreign(PostImage.post_id) == ShareItemPost.share_item_post_id)",
+        order_by="PostImage.position",
+        viewonly=True,
+    )
     status = db.Column(db.Boolean, default=False) # 나눔 완료인지 아닌지 
     views = db.Column(db.Integer, default=0)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # 목록 정렬/커서 페이지네이션용 (created_at, id 내림차순 seek)
+    __table_args__ = (
+        db.Index('ix_share_item_post_created', 'created_at', 'share_item_post_id'),
+        db.Index('ix_share_item_post_author', 'author_id', 'created_at'),
+    )
+
 # ✅ 댓글 테이블
 class CommentCategoryEnum(enum.Enum):  # ✅ Python의 Enum을 사용
     LOST_ITEM = "lost_item"
@@ -77,14 +123,97 @@ class Comment(db.Model):
     content = db.Column(db.Text, nullable=False)
     parent_comment_id = db.Column(db.Integer, db.ForeignKey('comment.comment_id'), nullable=True)  # 🔹 변경됨
 
+    # 게시글 단위 댓글 조회용 복합 인덱스 (category, post_id로 좁히고 최상위/대댓글 구분 후 created_at 순으로 정렬)
+    __table_args__ = (
+        db.Index('ix_comment_post_parent_created', 'category', 'post_id', 'parent_comment_id', 'created_at', 'comment_id'),
+        db.Index('ix_comment_parent', 'parent_comment_id'),
+        db.Index('ix_comment_author', 'author_id', 'created_at'),
+    )
+
 
 class NoticePost(db.Model):
     notice_post_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     notice_post_name = db.Column(db.String(100), nullable=False)
     author_id = db.Column(db.String(50), db.ForeignKey('user.user_id'), nullable=False)
     content = db.Column(db.Text, nullable=False)
-    image_urls = db.Column(db.Text)  # 선택사항, 필요 시 이미지 업로드
+    # 이미지는 post_images 테이블 (원본 + 썸네일 등 변형본, position 순서)
+    images = db.relationship(
+        "PostImage",
+        primaryjoin="and_(PostImage.board == 'notice', foreign(PostImage.post_id) == NoticePost.notice_post_id)",
+        order_by="PostImage.position",
+        viewonly=True,
+    )
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     views = db.Column(db.Integer, default=0)
 
+    # 목록 정렬/커서 페이지네이션용 (created_at, id 내림차순 seek)
+    __table_args__ = (
+        db.Index('ix_notice_post_created', 'created_at', 'notice_post_id'),
+        db.Index('ix_notice_post_author', 'author_id', 'created_at'),
+    )
+
+
+# 게시판 이름(CommentCategoryEnum 값) -> 게시글 모델
+BOARD_MODELS = {
+    "lost_item": LostItemPost,
+    "found_item": FoundItemPost,
+    "share_item": ShareItemPost,
+    "notice": NoticePost,
+}
+
+
+# ✅ 게시판 검색 색인 (app/search.py 참고)
+class SearchToken(db.Model):
+    board = db.Column(db.String(20), primary_key=True)     # lost_item / found_item / share_item / notice
+    post_id = db.Column(db.Integer, primary_key=True)
+    token = db.Column(db.String(40), primary_key=True)     # 글자 bigram 또는 "w:" + 단어
+    weight = db.Column(db.Integer, nullable=False, default=1)
+
+    __table_args__ = (
+        db.Index('ix_search_token_board_token', 'board', 'token', 'post_id'),
+    )
+
+
+# ✅ 게시글 이미지 (원본 + 변형본, app/post_images.py / app/image_pipeline.py 참고)
+class PostImage(db.Model):
+    __tablename__ = 'post_images'
+    post_image_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    board = db.Column(db.String(20), nullable=False)              # lost_item / found_item / share_item / notice
+    post_id = db.Column(db.Integer, nullable=False)
+    position = db.Column(db.Integer, nullable=False, default=0)   # 게시글 내 이미지 순서
+    variant = db.Column(db.String(20), nullable=False, default='original')  # original / thumb / medium / large
+    format = db.Column(db.String(10))                             # 변형본 포맷 (webp / avif), 원본은 None
+    url = db.Column(db.String(255), nullable=False)
+    original_url = db.Column(db.String(255), nullable=False)      # 변형본이 만들어진 원본 URL (원본은 자기 자신)
+    width = db.Column(db.Integer)
+    height = db.Column(db.Integer)
+    phash = db.Column(db.String(16))                              # 원본의 지각 해시(dHash, 16진수) - 분실/습득 매칭용
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_post_images_board_post', 'board', 'post_id', 'variant'),
+    )
+
+
+# ✅ 업로드 파일 (내용 해시 기준, app/upload_store.py 참고)
+class UploadBlob(db.Model):
+    sha256 = db.Column(db.String(64), primary_key=True)
+    ext = db.Column(db.String(10), nullable=False)
+    size = db.Column(db.Integer, nullable=False)
+    ref_count = db.Column(db.Integer, nullable=False, default=0)  # 이 파일을 쓰는 게시글 이미지 수
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+# ✅ 분실물 <-> 습득물 매칭 후보 (app/matching.py 참고)
+class PostMatch(db.Model):
+    __tablename__ = 'post_matches'
+    lost_item_post_id = db.Column(db.Integer, primary_key=True)
+    found_item_post_id = db.Column(db.Integer, primary_key=True)
+    score = db.Column(db.Float, nullable=False)                   # 0~1, 높을수록 같은 물건일 가능성이 큼
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_post_matches_lost_score', 'lost_item_post_id', 'score'),
+        db.Index('ix_post_matches_found_score', 'found_item_post_id', 'score'),
+    )
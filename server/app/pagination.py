@@ -0,0 +1,108 @@
+import base64
+import json
+import math
+from datetime import datetime
+
+from sqlalchemy import or_, and_
+
+from app import cache
+
+# 커서(cursor) 기반 페이지네이션 공용 유틸
+# - 커서는 (created_at, id) 쌍을 base64로 감싼 불투명 문자열
+# - OFFSET 없이 인덱스를 따라 바로 다음 위치로 이동(seek)한다
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at, row_id):
+    payload = json.dumps([created_at.isoformat() if created_at else None, row_id])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return (datetime.fromisoformat(created_at) if created_at else None), row_id
+    except Exception:
+        raise InvalidCursor("잘못된 cursor 값입니다.")
+
+
+def encode_keyset(values):
+    """여러 정렬 컬럼 값으로 된 커서 (관리자 사용자 목록 등). datetime은 ISO 문자열로 저장."""
+    payload = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_keyset(cursor, size):
+    """encode_keyset의 역. 값 개수가 size와 다르면 InvalidCursor. datetime 복원은 호출한 쪽에서."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise InvalidCursor("잘못된 cursor 값입니다.")
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor("잘못된 cursor 값입니다.")
+    return values
+
+
+# 목록 total_items 캐시
+# - 페이지마다 COUNT(*)를 다시 돌리지 않도록 (게시판, 필터) 단위로 잠깐 보관 (COUNT_CACHE_TTL, 기본 60초)
+# - 응답 캐시와 같은 백엔드에 저장하므로 redis면 모든 워커가 같은 값을 보고 같이 무효화된다 (app/cache.py)
+# - 등록/삭제/상태 변경 시 해당 게시판 항목을 지운다 (invalidate_counts)
+
+
+def cached_count(board, key, query):
+    return cache.cached_count(board, key, lambda: query.order_by(None).count())
+
+
+def invalidate_counts(board):
+    cache.invalidate_counts(board)
+
+
+def page_query(query, model, pk, page, limit, cursor=None):
+    """paginate_posts가 실행하는 한 페이지 쿼리 (최신순 정렬 + OFFSET 또는 keyset). 실행은 하지 않는다.
+    keyset 모드는 다음 페이지가 있는지 알기 위해 limit + 1개를 가져온다."""
+    limit = max(limit, 1)
+    query = query.order_by(model.created_at.desc(), pk.desc())
+    if cursor is None:
+        return query.limit(limit).offset((max(page, 1) - 1) * limit)
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            model.created_at < cursor_created_at,
+            and_(model.created_at == cursor_created_at, pk < cursor_id),
+        ))
+    return query.limit(limit + 1)
+
+
+def paginate_posts(query, board, model, pk, count_key, page, limit, cursor=None):
+    """게시판 목록 페이지네이션. (items, 응답 메타데이터)를 돌려준다.
+
+    cursor가 None이면 기존 page/limit(OFFSET) 방식,
+    문자열이면(빈 문자열 = 첫 페이지) (created_at, id) 기준 keyset 방식으로 조회한다.
+    """
+    limit = max(limit, 1)
+    total = cached_count(board, count_key, query)
+    total_pages = math.ceil(total / limit) if total else 0
+    items = page_query(query, model, pk, page, limit, cursor).all()
+
+    if cursor is None:
+        return items, {
+            "total_pages": total_pages,
+            "current_page": max(page, 1),
+            "total_items": total,
+        }
+
+    has_more = len(items) > limit
+    items = items[:limit]
+    last = items[-1] if items else None
+    return items, {
+        "total_pages": total_pages,
+        "current_page": None,
+        "total_items": total,
+        "next_cursor": encode_cursor(last.created_at, getattr(last, pk.key)) if has_more else None,
+        "has_more": has_more,
+    }
@@ -0,0 +1,106 @@
+import hmac
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# 비밀번호 해시 (werkzeug scrypt)
+# - 해시 계산은 일부러 느리고 CPU를 많이 쓰므로 요청 스레드에서 직접 돌리지 않고
+#   프로세스당 작은 워커 풀(PASSWORD_HASH_WORKERS, 기본 min(4, CPU 수))에서 돌린다
+#   -> 로그인이 몰려도 동시에 도는 해시 계산은 워커 수로 제한되어 다른 요청이 CPU를 뺏기지 않는다
+# - 대기열도 PASSWORD_HASH_QUEUE(기본 워커 수 x 8)로 제한, 가득 차면 PasswordPoolBusy -> 503
+# - 예전 평문 비밀번호는 로그인에 성공했을 때 verify_password()가 새 해시를 돌려주므로 그 자리에서 교체
+# - PASSWORD_HASH_METHOD로 방식 변경 가능 (기본 "scrypt", 예: "pbkdf2:sha256:600000")
+
+HASH_PREFIXES = ("scrypt:", "pbkdf2:")
+
+
+class PasswordPoolBusy(Exception):
+    pass
+
+
+_executor = None
+_executor_pid = None
+_slots = None
+_executor_lock = threading.Lock()
+_dummy_hash = None
+
+
+def _get_executor():
+    # fork 이후의 워커 프로세스에서는 새 풀을 만든다
+    global _executor, _executor_pid, _slots
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            workers = current_app.config.get("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1))
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+            _slots = threading.BoundedSemaphore(current_app.config.get("PASSWORD_HASH_QUEUE", workers * 8))
+            _executor_pid = os.getpid()
+        return _executor, _slots
+
+
+def _run(fn, *args):
+    executor, slots = _get_executor()
+    if not slots.acquire(timeout=current_app.config.get("PASSWORD_HASH_QUEUE_WAIT", 1)):
+        raise PasswordPoolBusy()
+    try:
+        future = executor.submit(fn, *args)
+    except Exception:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    try:
+        return future.result(timeout=current_app.config.get("PASSWORD_HASH_TIMEOUT", 10))
+    except TimeoutError:
+        raise PasswordPoolBusy()
+
+
+def _method():
+    return current_app.config.get("PASSWORD_HASH_METHOD", "scrypt")
+
+
+def is_hashed(stored):
+    return bool(stored) and stored.startswith(HASH_PREFIXES) and stored.count("$") == 2
+
+
+def _needs_rehash(stored):
+    # 설정한 방식(파라미터까지 적었으면 파라미터도)과 다르게 저장된 해시는 로그인할 때 새로 만든다
+    stored_method, method = stored.split("$", 1)[0], _method()
+    if ":" in method:
+        return stored_method != method
+    return stored_method.split(":", 1)[0] != method
+
+
+def hash_password(password):
+    """비밀번호를 해시한다 (워커 풀에서 계산)."""
+    return _run(generate_password_hash, password, _method())
+
+
+def hash_many(passwords):
+    """여러 비밀번호를 워커 풀에서 나눠 해시한다 (일괄 등록용). 순서대로 돌려준다."""
+    executor, _ = _get_executor()
+    method = _method()
+    return list(executor.map(lambda password: generate_password_hash(password, method), passwords))
+
+
+def verify_password(stored, password):
+    """(일치 여부, 교체할 새 해시 또는 None)을 돌려준다.
+    stored가 None(없는 사용자)이어도 같은 시간이 걸리도록 더미 해시와 비교한다."""
+    global _dummy_hash
+    if stored is None:
+        if _dummy_hash is None:
+            _dummy_hash = hash_password("dummy-password")
+        _run(check_password_hash, _dummy_hash, password)
+        return False, None
+
+    if not is_hashed(stored):
+        # 평문으로 저장된 예전 계정: 맞으면 바로 해시로 교체
+        if not hmac.compare_digest(stored.encode("utf-8"), password.encode("utf-8")):
+            return False, None
+        return True, hash_password(password)
+
+    if not _run(check_password_hash, stored, password):
+        return False, None
+    return True, hash_password(password) if _needs_rehash(stored) else None
+
@@ -0,0 +1,117 @@
+import os
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from PIL import Image
+from sqlalchemy import inspect, text, or_, and_
+
+from app.database import db
+from app.models import PostImage, BOARD_MODELS
+
+# 게시글 이미지 (post_images 테이블)
+# - 예전에는 게시글마다 image_urls 컬럼에 URL을 콤마로 이어 붙여 저장했음
+# - 이제는 원본(variant='original')과 썸네일 등 변형본을 행 단위로 저장하고,
+#   목록 조회는 urls_by_post()로 한 페이지 분량을 쿼리 한 번에 가져온다 (app/post_list.py)
+# - 기존 데이터는 `flask images backfill`로 옮긴다
+
+UPLOAD_URL_PREFIX = "/static/uploads/"
+BACKFILL_BATCH_SIZE = 1000
+
+
+def add_originals(board, post_id, urls):
+    """새 게시글의 원본 이미지 행을 추가한다. 호출한 쪽에서 commit 한다."""
+    db.session.add_all([
+        PostImage(board=board, post_id=post_id, position=position,
+                  variant="original", url=url, original_url=url)
+        for position, url in enumerate(urls)
+    ])
+
+
+def original_urls(post):
+    return [image.url for image in post.images if image.variant == "original"]
+
+
+def urls_by_post(board, post_ids):
+    """목록 한 페이지의 이미지 URL을 쿼리 한 번으로 읽는다.
+    {글 번호: (원본 URL 목록, webp 썸네일 URL 목록)}"""
+    urls = {post_id: ([], []) for post_id in post_ids}
+    if not post_ids:
+        return urls
+    rows = (db.session.query(PostImage.post_id, PostImage.variant, PostImage.url)
+            .filter(PostImage.board == board, PostImage.post_id.in_(post_ids),
+                    or_(PostImage.variant == "original",
+                        and_(PostImage.variant == "thumb", PostImage.format == "webp")))
+            .order_by(PostImage.post_id, PostImage.position))
+    for post_id, variant, url in rows:
+        urls[post_id][0 if variant == "original" else 1].append(url)
+    return urls
+
+
+def remove_post(board, post_id):
+    """게시글의 이미지 행을 모두 지우고 원본 URL 목록을 돌려준다 (upload_store.release에 넘김).
+    호출한 쪽에서 commit 한다."""
+    urls = [url for (url,) in db.session.query(PostImage.url)
+            .filter_by(board=board, post_id=post_id, variant="original")
+            .order_by(PostImage.position)]
+    PostImage.query.filter_by(board=board, post_id=post_id).delete(synchronize_session=False)
+    return urls
+
+
+def _image_size(url):
+    path = os.path.join(current_app.config["UPLOAD_FOLDER"], url[len(UPLOAD_URL_PREFIX):])
+    try:
+        with Image.open(path) as image:  # 헤더만 읽음
+            return image.size
+    except (OSError, ValueError):
+        return None, None
+
+
+def backfill(board):
+    """image_urls 컬럼의 값을 post_images 원본 행으로 옮긴다. 이미 옮긴 게시글은 건너뛴다."""
+    table = BOARD_MODELS[board].__table__
+    pk = list(table.primary_key.columns)[0].name
+    if "image_urls" not in {column["name"] for column in inspect(db.engine).get_columns(table.name)}:
+        return 0  # 이미 마이그레이션(0002)으로 컬럼이 삭제됨
+    done = {post_id for (post_id,) in db.session.query(PostImage.post_id)
+            .filter_by(board=board, variant="original").distinct()}
+
+    # image_urls는 모델에서 빠졌으므로 원본 SQL로 읽는다
+    migrated, last_id = 0, 0
+    while True:
+        rows = db.session.execute(text(
+            f"SELECT {pk}, image_urls FROM {table.name} "
+            f"WHERE {pk} > :last_id AND image_urls IS NOT NULL AND image_urls != '' "
+            f"ORDER BY {pk} LIMIT :limit"
+        ), {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE}).all()
+        if not rows:
+            break
+        images = []
+        for post_id, image_urls in rows:
+            if post_id in done:
+                continue
+            for position, url in enumerate(u for u in image_urls.split(",") if u):
+                width, height = _image_size(url)
+                images.append({
+                    "board": board, "post_id": post_id, "position": position,
+                    "variant": "original", "format": None, "url": url, "original_url": url,
+                    "width": width, "height": height,
+                })
+            migrated += 1
+        if images:
+            db.session.execute(PostImage.__table__.insert(), images)
+        db.session.commit()
+        last_id = rows[-1][0]
+    return migrated
+
+
+images_cli = AppGroup("images", help="게시글 이미지 관리")
+
+
+@images_cli.command("backfill")
+@click.argument("boards", nargs=-1, type=click.Choice(list(BOARD_MODELS)))
+def backfill_command(boards):
+    """기존 image_urls 컬럼을 post_images 테이블로 옮긴다. (예: flask images backfill lost_item)"""
+    for board in boards or BOARD_MODELS:
+        count = backfill(board)
+        click.echo(f"✅ {board}: {count}개 게시글 이미지 이전 완료")
@@ -0,0 +1,125 @@
+from flask import current_app
+from sqlalchemy import func
+
+from app.database import db
+from app.models import BOARD_MODELS, FoundItemPost
+from app import search, post_images
+from app.pagination import paginate_posts
+
+# 게시판 목록 조회 공용 계층 (분실물 / 습득물 / 나눔 / 공지)
+# - ORM 엔티티 대신 필요한 컬럼만 SELECT 해서 Row로 받는다 (객체 생성 / identity map 비용 없음)
+# - 본문(content)은 목록에 보내지 않고 앞 LIST_PREVIEW_LENGTH자(기본 100)만 content_preview로 보낸다
+#   (DB에서 substr로 잘라 오므로 긴 본문이 DB -> 서버로도 넘어오지 않음). 전체 본문은 상세 조회에서만
+# - fields=a,b,c 로 필요한 필드만 받을 수 있다 (sparse fieldset). 없으면 게시판별 기본 필드 전체
+# - 이미지 URL은 image_urls / thumbnail_urls를 요청했을 때만 페이지의 글 번호로 한 번에 조회
+
+PREVIEW_SUFFIX = "…"
+
+# 게시판 -> 게시판 고유 컬럼 (공통 컬럼: 글 번호, 제목, author_id, created_at)
+BOARD_COLUMNS = {
+    "lost_item": ("lost_item_name", "lost_location", "lost_time", "views", "status"),
+    "found_item": ("found_item_name", "found_location", "found_time", "views", "status"),
+    "share_item": ("status", "views"),
+    "notice": ("views",),
+}
+DERIVED_FIELDS = ("content_preview", "image_urls", "thumbnail_urls")
+# 게시판 -> 목록에 항상 거는 필터 (습득물은 아직 주인을 찾지 못한 글만)
+LIST_FILTERS = {
+    "found_item": (FoundItemPost.status.is_(False),),
+}
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+def _pk_name(board):
+    return f"{board}_post_id"
+
+
+def list_fields(board):
+    """게시판 목록에서 쓸 수 있는 필드 (= fields가 없을 때 내려주는 기본 필드)."""
+    return [_pk_name(board), f"{board}_post_name", "author_id", "created_at",
+            *BOARD_COLUMNS[board], *DERIVED_FIELDS]
+
+
+def parse_fields(board, raw):
+    """fields 쿼리 파라미터를 검사해 필드 목록으로 바꾼다. 모르는 필드가 있으면 InvalidFields."""
+    allowed = list_fields(board)
+    fields = [f for f in (raw or "").split(",") if f] or allowed
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise InvalidFields(f"Unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(fields))
+
+
+def _preview(text, length):
+    if text is None or len(text) <= length:
+        return text
+    return text[:length].rstrip() + PREVIEW_SUFFIX
+
+
+def _columns(board, fields, length):
+    model = BOARD_MODELS[board]
+    pk_name = _pk_name(board)
+    # 글 번호와 created_at은 커서 / 이미지 조회에 필요하므로 항상 가져온다
+    column_names = [name for name in fields if name not in DERIVED_FIELDS]
+    columns = [getattr(model, name) for name in dict.fromkeys([pk_name, "created_at", *column_names])]
+    if "content_preview" in fields:
+        # 잘렸는지 알 수 있도록 한 글자 더 가져온다
+        columns.append(func.substr(model.content, 1, length + 1).label("content_preview"))
+    return columns
+
+
+def _items(board, rows, fields, length):
+    pk_name = _pk_name(board)
+    images = {}
+    if "image_urls" in fields or "thumbnail_urls" in fields:
+        images = post_images.urls_by_post(board, [getattr(row, pk_name) for row in rows])
+
+    items = []
+    for row in rows:
+        data = row._mapping
+        item = {}
+        for name in fields:
+            if name == "content_preview":
+                item[name] = _preview(data[name], length)
+            elif name == "image_urls":
+                item[name] = images[data[pk_name]][0]
+            elif name == "thumbnail_urls":
+                item[name] = images[data[pk_name]][1]
+            else:
+                item[name] = data[name]
+        items.append(item)
+    return items
+
+
+def list_query(board, fields, keyword, ranked, *filters):
+    """정렬 / 페이지를 걸기 전의 목록 쿼리. list_payload와 `flask query-plans`(app/query_plans.py)가 같이 쓴다."""
+    length = current_app.config.get("LIST_PREVIEW_LENGTH", 100)
+    query = db.session.query(*_columns(board, fields, length)).filter(*LIST_FILTERS.get(board, ()), *filters)
+    if keyword:
+        # 검색 색인 기반 검색 (app/search.py), cursor 모드에서는 최신순 유지
+        query = search.apply_keyword_search(query, board, keyword, ranked=ranked)
+    return query
+
+
+def list_payload(board, page, limit, keyword, cursor, fields, *filters):
+    """게시판 목록 응답 payload. {"<board>s": [...], **페이지 메타데이터}
+    cursor 형식이 잘못되면 InvalidCursor (paginate_posts)."""
+    model = BOARD_MODELS[board]
+    length = current_app.config.get("LIST_PREVIEW_LENGTH", 100)
+    query = list_query(board, fields, keyword, cursor is None, *filters)
+    rows, page_meta = paginate_posts(query, board, model, getattr(model, _pk_name(board)),
+                                     keyword, page, limit, cursor)
+    return {f"{board}s": _items(board, rows, fields, length), **page_meta}
+
+
+def item(board, post_id):
+    """글 하나를 목록 원소와 같은 형식(기본 필드)으로. 실시간 알림(app/events.py)용. 없으면 None."""
+    fields = list_fields(board)
+    length = current_app.config.get("LIST_PREVIEW_LENGTH", 100)
+    pk = getattr(BOARD_MODELS[board], _pk_name(board))
+    rows = db.session.query(*_columns(board, fields, length)).filter(pk == post_id).all()
+    items = _items(board, rows, fields, length)
+    return items[0] if items else None
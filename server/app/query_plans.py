@@ -0,0 +1,153 @@
+from datetime import datetime
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import func, select, text
+from werkzeug.datastructures import MultiDict
+
+from app import post_list
+from app.database import db
+from app.models import BOARD_MODELS, LostItemPost, FoundItemPost, Comment, CommentCategoryEnum, PostImage, PostMatch
+from app.pagination import page_query, encode_cursor
+from app.routes.user_routes import user_list_query, USER_FIELDS, USER_SORTS, PENDING_USER_FIELDS
+
+# 라우트 쿼리 실행 계획 점검 (`flask query-plans`)
+# - 목록/검색/사용자 목록은 라우트가 쓰는 쿼리 빌더(post_list.list_query + pagination.page_query,
+#   user_routes.user_list_query)로 만든 쿼리를 그대로 EXPLAIN 한다 -> 라우트를 고쳐도 여기를 따로 고칠 필요 없음
+# - 테이블 전체를 훑는(full scan) 쿼리가 있으면 실패로 보고한다 (CI나 배포 전에 실행)
+# - 정렬용 임시 B-tree / filesort는 경고로만 보여준다
+# - 데이터가 거의 없는 DB에서는 MySQL/PostgreSQL 옵티마이저가 인덱스 대신 전체 스캔을 고를 수 있으므로
+#   운영과 비슷한 크기의 DB에서 돌릴 것 (SQLite는 데이터 양과 상관없이 인덱스 사용 여부가 드러난다)
+
+SAMPLE_TIME = datetime(2025, 1, 1)
+SAMPLE_KEYWORD = "검정 지갑"
+PAGE_LIMIT = 10
+USER_PAGE_LIMIT = 50
+# (이름, 쿼리 파라미터, 정렬) - 관리자 사용자 목록에서 쓰는 필터/정렬 조합
+USER_LIST_CASES = [
+    ("is_admin", {"is_admin": "true"}, "created_at"),
+    ("is_confirmed", {"is_confirmed": "true"}, "created_at"),
+    ("학급", {"grade": "1", "class_num": "3"}, "student"),
+    ("입학년도", {"admission_year": "2025"}, "admission_year"),
+    *[(f"sort={sort}", {}, sort) for sort in USER_SORTS],
+]
+
+
+def _board_queries(board):
+    model = BOARD_MODELS[board]
+    pk = getattr(model, f"{board}_post_id")
+    fields = post_list.list_fields(board)
+    cursor = encode_cursor(SAMPLE_TIME, 100)
+    name = f"{board}s 목록"
+    query = post_list.list_query(board, fields, "", True)
+    return [
+        (name, page_query(query, model, pk, 1, PAGE_LIMIT).statement),
+        (f"{name} (cursor)", page_query(query, model, pk, 1, PAGE_LIMIT, cursor).statement),
+        (f"{name} 수", select(func.count()).select_from(query.order_by(None).subquery())),
+        (f"{name} 검색", page_query(post_list.list_query(board, fields, SAMPLE_KEYWORD, True),
+                                  model, pk, 1, PAGE_LIMIT).statement),
+        (f"{name} 검색 (cursor)", page_query(post_list.list_query(board, fields, SAMPLE_KEYWORD, False),
+                                           model, pk, 1, PAGE_LIMIT, cursor).statement),
+    ]
+
+
+def _user_queries():
+    queries = []
+    for name, args, sort in USER_LIST_CASES:
+        query = user_list_query(MultiDict(args), USER_FIELDS, sort, sort == "created_at", USER_PAGE_LIMIT)
+        queries.append((f"사용자 목록 ({name})", query.statement))
+    pending = user_list_query(MultiDict(), PENDING_USER_FIELDS, "created_at", True, USER_PAGE_LIMIT,
+                              is_confirmed=False)
+    queries.append(("사용자 승인 대기", pending.statement))
+    return queries
+
+
+def route_queries():
+    """(이름, select 문) 목록. 댓글/이미지/매칭 쿼리는 라우트의 필터/정렬을 바꾸면 여기도 같이 고친다."""
+    queries = []
+    for board in BOARD_MODELS:
+        queries += _board_queries(board)
+    queries += _user_queries()
+
+    post_filter = (Comment.category == CommentCategoryEnum.LOST_ITEM, Comment.post_id == 1)
+    queries += [
+        ("댓글 (최상위)", select(Comment)
+         .filter(*post_filter, Comment.parent_comment_id.is_(None))
+         .order_by(Comment.created_at.asc(), Comment.comment_id.asc()).limit(21)),
+        ("댓글 (대댓글)", select(Comment)
+         .filter(*post_filter, Comment.parent_comment_id.in_([1, 2, 3]))
+         .order_by(Comment.created_at.asc(), Comment.comment_id.asc())),
+        ("댓글 수", select(Comment.post_id, func.count(Comment.comment_id))
+         .filter(Comment.category == CommentCategoryEnum.LOST_ITEM, Comment.post_id.in_([1, 2, 3]))
+         .group_by(Comment.post_id)),
+        ("게시글 이미지", select(PostImage)
+         .filter(PostImage.board == "lost_item", PostImage.post_id.in_([1, 2, 3]))
+         .order_by(PostImage.position)),
+        ("작성자별 게시글", select(LostItemPost.lost_item_post_id)
+         .filter(LostItemPost.author_id == "user").order_by(LostItemPost.created_at.desc())),
+        ("매칭 후보", select(FoundItemPost.found_item_post_id, PostMatch.score)
+         .join(PostMatch, PostMatch.found_item_post_id == FoundItemPost.found_item_post_id)
+         .filter(PostMatch.lost_item_post_id == 1).order_by(PostMatch.score.desc()).limit(5)),
+    ]
+    return queries
+
+
+def _explain(statement):
+    """(full scan 목록, 경고 목록)을 돌려준다."""
+    bind = db.session.get_bind()
+    sql = str(statement.compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True}))
+    dialect = bind.dialect.name
+    scans, warnings = [], []
+
+    # 서브쿼리 / CTE 결과(anon_1 등)를 훑는 것은 이미 걸러진 행을 읽는 것이므로 실제 테이블만 본다
+    tables = set(db.metadata.tables)
+
+    if dialect == "sqlite":
+        for row in db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}")):
+            detail = row[-1]
+            if (detail.startswith("SCAN ") and " USING " not in detail
+                    and detail.split()[1] in tables):
+                scans.append(detail)
+            elif "TEMP B-TREE" in detail:
+                warnings.append(detail)
+    elif dialect in ("mysql", "mariadb"):
+        for row in db.session.execute(text(f"EXPLAIN {sql}")).mappings():
+            if row.get("type") == "ALL" and row.get("table") in tables:
+                scans.append(f"{row.get('table')}: type=ALL")
+            elif "filesort" in (row.get("Extra") or ""):
+                warnings.append(f"{row.get('table')}: {row.get('Extra')}")
+    else:
+        for (line,) in db.session.execute(text(f"EXPLAIN {sql}")):
+            if "Seq Scan" in line:
+                scans.append(line.strip())
+            elif line.strip().startswith("Sort"):
+                warnings.append(line.strip())
+    return scans, warnings
+
+
+def check_query_plans():
+    """full scan이 있는 쿼리 {이름: 계획 목록}과 경고 {이름: 계획 목록}을 돌려준다."""
+    failures, warnings = {}, {}
+    for name, statement in route_queries():
+        scans, notes = _explain(statement)
+        if scans:
+            failures[name] = scans
+        if notes:
+            warnings[name] = notes
+    return failures, warnings
+
+
+@click.command("query-plans")
+@with_appcontext
+def query_plans_command():
+    """라우트 쿼리가 인덱스를 타는지 EXPLAIN으로 확인한다. full scan이 있으면 종료 코드 1."""
+    failures, warnings = check_query_plans()
+    for name, notes in warnings.items():
+        for note in notes:
+            click.echo(f"⚠️  {name}: {note}")
+    for name, scans in failures.items():
+        for scan in scans:
+            click.echo(f"❌ {name}: {scan}")
+    if failures:
+        raise SystemExit(1)
+    click.echo("✅ 모든 라우트 쿼리가 인덱스를 사용합니다")
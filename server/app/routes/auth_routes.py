@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify, session
 from app.models import User
 from app.database import db
+from app.auth import current_user
+from app import passwords, login_limiter
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -13,13 +15,30 @@ def login():
     if not user_id or not password:
         return jsonify({'error': '아이디와 비밀번호를 입력하세요.'}), 400
 
+    # 시도 제한 (IP별 / 계정별 실패 횟수, app/login_limiter.py)
+    # 프록시 뒤에서는 ProxyFix가 X-Forwarded-For의 실제 클라이언트 IP를 remote_addr에 넣는다 (PROXY_FIX_X_FOR, app/__init__.py)
+    retry_after = login_limiter.check(user_id, request.remote_addr)
+    if retry_after:
+        response = jsonify({'error': '로그인 시도가 너무 많습니다. 잠시 후 다시 시도하세요.'})
+        response.headers['Retry-After'] = str(retry_after)
+        return response, 429
+
     user = User.query.filter_by(user_id=user_id).first()
-    if not user:
-        return jsonify({'error': '아이디 또는 비밀번호가 올바르지 않습니다.'}), 401
 
-    # 비밀번호 평문 비교(현재 로직) - 필요시 해시 검증으로 교체 가능
-    if user.user_password != password:
+    # 해시 검증은 워커 풀에서 (app/passwords.py), 없는 아이디도 같은 시간이 걸리도록 비교는 항상 수행
+    try:
+        ok, new_hash = passwords.verify_password(user.user_password if user else None, password)
+    except passwords.PasswordPoolBusy:
+        return jsonify({'error': '요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도하세요.'}), 503
+    if not ok:
+        login_limiter.record_failure(user_id)
         return jsonify({'error': '아이디 또는 비밀번호가 올바르지 않습니다.'}), 401
+    login_limiter.reset(user_id)
+
+    # 평문(또는 예전 방식)으로 저장된 비밀번호는 새 해시로 교체
+    if new_hash:
+        user.user_password = new_hash
+        db.session.commit()
 
     # 관리자 승인 여부 확인
     if not user.is_confirmed:
@@ -49,13 +68,9 @@ def get_current_user():
     if 'user_id' not in session:
         return jsonify({'error': '로그인하지 않음'}), 401
 
-    user = User.query.filter_by(user_id=session['user_id']).first()
+    # 요청/프로세스 단위로 캐시된 사용자 정보 (app/auth.py)
+    user = current_user()
     if not user:
         return jsonify({'error': '유저 정보를 찾을 수 없음'}), 404
 
-    return jsonify({
-        'user_id': user.user_id,
-        'user_name': user.user_name,
-        'is_admin': user.is_admin,
-        'is_confirmed': user.is_confirmed
-    }), 200
+    return jsonify(user._asdict()), 200
@@ -1,28 +1,119 @@
 from flask import Blueprint, request, jsonify
+from sqlalchemy import or_, and_, func, select
 from app.models import Comment, CommentCategoryEnum
 from app.database import db
+from app import cache, events
+from app.auth import current_user, login_required, can_modify
+from app.instrumentation import query_budget
+from app.pagination import encode_cursor, decode_cursor, InvalidCursor
 
 comment_bp = Blueprint('comments', __name__)
 
-# comment_routes.py (일부)
+COMMENT_PAGE_LIMIT_MAX = 100
+COMMENT_QUERY_BUDGET = 3  # 최상위 1 + 대댓글 트리 1(재귀 CTE) + 여유분
+
+
+def serialize_comment(comment):
+    # category가 enum이면 .value, 아니면 문자열
+    category_str = comment.category.value if hasattr(comment.category, 'value') else comment.category
+    return {
+        'comment_id': comment.comment_id,
+        'category': category_str,
+        'author_id': comment.author_id,
+        'post_id': comment.post_id,
+        'content': comment.content,
+        'parent_comment_id': comment.parent_comment_id,
+        'created_at': comment.created_at  # JSON provider가 ISO 8601(UTC)로 직렬화
+    }
+
+
+# 특정 게시글의 댓글 조회 (최상위 댓글 기준 커서 페이지네이션 + 대댓글 트리)
+# GET /api/comments/?category=lost_item&post_id=3&limit=20&cursor=...
 @comment_bp.route('/', methods=['GET'])
+@query_budget(COMMENT_QUERY_BUDGET)
 def get_comments():
-    comments = Comment.query.all()
-    results = []
-    for comment in comments:
-        # category가 enum이면 .value, 아니면 문자열
-        category_str = comment.category.value if hasattr(comment.category, 'value') else comment.category
-        results.append({
-            'comment_id': comment.comment_id,
-            'category': category_str,
-            'author_id': comment.author_id,
-            'post_id': comment.post_id,
-            'content': comment.content,
-            'parent_comment_id': comment.parent_comment_id,
-            # ➡ 추가: created_at 필드
-            'created_at': comment.created_at.isoformat() if comment.created_at else None
-        })
-    return jsonify(results), 200
+    try:
+        category_enum = CommentCategoryEnum(request.args.get('category'))
+    except ValueError:
+        return jsonify({'error': 'Invalid category'}), 400
+    post_id = request.args.get('post_id', type=int)
+    if post_id is None:
+        return jsonify({'error': 'post_id is required'}), 400
+    limit = min(max(request.args.get('limit', 20, type=int), 1), COMMENT_PAGE_LIMIT_MAX)
+    cursor = request.args.get('cursor')
+
+    # (category, post_id, created_at) 인덱스를 타도록 항상 같은 순서로 필터
+    post_filter = (Comment.category == category_enum, Comment.post_id == post_id)
+
+    root_query = Comment.query.filter(*post_filter, Comment.parent_comment_id.is_(None))
+    if cursor:
+        try:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
+        root_query = root_query.filter(or_(
+            Comment.created_at > cursor_created_at,
+            and_(Comment.created_at == cursor_created_at, Comment.comment_id > cursor_id),
+        ))
+    roots = root_query.order_by(Comment.created_at.asc(), Comment.comment_id.asc()).limit(limit + 1).all()
+
+    has_more = len(roots) > limit
+    roots = roots[:limit]
+
+    # 이번 페이지 최상위 댓글 아래의 대댓글 전체를 재귀 CTE 한 번으로 조회 -> 깊이와 관계없이 쿼리 2개
+    nodes = {}
+    tree = []
+    for comment in roots:
+        node = serialize_comment(comment)
+        node['replies'] = []
+        nodes[comment.comment_id] = node
+        tree.append(node)
+
+    if nodes:
+        reply_ids = (select(Comment.comment_id)
+                     .where(*post_filter, Comment.parent_comment_id.in_(list(nodes)))
+                     .cte('reply_ids', recursive=True))
+        reply_ids = reply_ids.union(
+            select(Comment.comment_id)
+            .where(*post_filter, Comment.parent_comment_id == reply_ids.c.comment_id))
+        replies = (Comment.query
+                   .filter(Comment.comment_id.in_(select(reply_ids.c.comment_id)))
+                   .order_by(Comment.created_at.asc(), Comment.comment_id.asc())
+                   .all())
+        # 노드를 먼저 다 만든 뒤 연결한다 (created_at이 같아 부모보다 먼저 정렬된 답글도 제자리에)
+        for comment in replies:
+            node = serialize_comment(comment)
+            node['replies'] = []
+            nodes[comment.comment_id] = node
+        for comment in replies:
+            nodes[comment.parent_comment_id]['replies'].append(nodes[comment.comment_id])
+
+    next_cursor = encode_cursor(roots[-1].created_at, roots[-1].comment_id) if has_more else None
+    # 트리는 이미 메모리에 있으므로 한 번에 직렬화 (ETag / 304 / 압축은 다른 목록 응답과 같게, app/cache.py)
+    return cache.json_response({'comments': tree, 'next_cursor': next_cursor, 'has_more': has_more})
+
+
+# 게시글별 댓글 수 조회 (목록 화면용)
+# GET /api/comments/counts?category=lost_item&post_ids=1,2,3
+@comment_bp.route('/counts', methods=['GET'])
+@query_budget(1)
+def get_comment_counts():
+    try:
+        category_enum = CommentCategoryEnum(request.args.get('category'))
+    except ValueError:
+        return jsonify({'error': 'Invalid category'}), 400
+    try:
+        post_ids = [int(pid) for pid in request.args.get('post_ids', '').split(',') if pid]
+    except ValueError:
+        return jsonify({'error': 'Invalid post_ids'}), 400
+    if not post_ids:
+        return jsonify({'counts': {}}), 200
+
+    rows = (db.session.query(Comment.post_id, func.count(Comment.comment_id))
+            .filter(Comment.category == category_enum, Comment.post_id.in_(post_ids[:COMMENT_PAGE_LIMIT_MAX]))
+            .group_by(Comment.post_id)
+            .all())
+    return jsonify({'counts': {str(post_id): count for post_id, count in rows}}), 200
 
 
 @comment_bp.route('/<int:comment_id>', methods=['GET'])
@@ -40,6 +131,7 @@ def get_comment(comment_id):
     }), 200
 
 @comment_bp.route('/', methods=['POST'])
+@login_required
 def create_comment():
     data = request.json
     try:
@@ -50,20 +142,26 @@ def create_comment():
 
     comment = Comment(
         category=category_enum,
-        author_id=data.get('author_id'),
+        author_id=current_user().user_id,  # 작성자는 로그인 세션의 사용자 (본문의 author_id는 무시)
         post_id=data.get('post_id'),
         content=data.get('content'),
         parent_comment_id=data.get('parent_comment_id')
     )
     db.session.add(comment)
     db.session.commit()
+    # 해당 글의 댓글 창을 열어 둔 클라이언트에 바로 반영 (app/events.py)
+    events.publish(events.comment_topic(category_enum.value, comment.post_id), 'comment.created',
+                   serialize_comment(comment))
     return jsonify({'message': 'Comment created', 'comment_id': comment.comment_id}), 201
 
 @comment_bp.route('/<int:comment_id>', methods=['PUT'])
+@login_required
 def update_comment(comment_id):
     comment = Comment.query.get(comment_id)
     if not comment:
         return jsonify({'error': 'Comment not found'}), 404
+    if not can_modify(comment.author_id):
+        return jsonify({'error': '작성자 또는 관리자만 수정할 수 있습니다.'}), 403
     data = request.json
     if 'category' in data:
         try:
@@ -75,10 +173,13 @@ def update_comment(comment_id):
     return jsonify({'message': 'Comment updated'}), 200
 
 @comment_bp.route('/<int:comment_id>', methods=['DELETE'])
+@login_required
 def delete_comment(comment_id):
     comment = Comment.query.get(comment_id)
     if not comment:
         return jsonify({'error': 'Comment not found'}), 404
+    if not can_modify(comment.author_id):
+        return jsonify({'error': '작성자 또는 관리자만 삭제할 수 있습니다.'}), 403
     db.session.delete(comment)
     db.session.commit()
     return jsonify({'message': 'Comment deleted'}), 200
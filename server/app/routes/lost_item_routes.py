@@ -1,44 +1,30 @@
-import os
-import uuid
-from flask import Blueprint, request, jsonify, send_from_directory, current_app
-from werkzeug.utils import secure_filename
-from sqlalchemy import or_
-from app.models import LostItemPost, User
+from flask import Blueprint, request, jsonify
+from app.models import LostItemPost
 from app.database import db
+from app import search, post_list, view_counter, cache, image_pipeline, upload_store, upload_ingest, post_images, matching, events
+from app.auth import current_user, login_required, can_modify
+from app.instrumentation import query_budget, LIST_QUERY_BUDGET, DETAIL_QUERY_BUDGET
+from app.pagination import invalidate_counts, InvalidCursor
 
 lost_item_bp = Blueprint("lost_items", __name__)
 
-# 이미지 업로드 설정
-UPLOAD_FOLDER = os.path.join("app", "static", "uploads")
-ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "gif"}
-
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
-
-def allowed_file(filename):
-    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
 # 분실물 게시글 등록 (이미지 포함)
 @lost_item_bp.route("/", methods=["POST"])
+@login_required
+@upload_ingest.accepts_uploads
 def create_lost_item():
     data = request.form
     files = request.files.getlist("images")
 
-    # author_id 존재 여부 확인
-    author_id = data.get("author_id")
-    user = User.query.get(author_id)
-    if not user:
-        return jsonify({"error": "유효한 사용자 ID가 아닙니다."}), 400
-
-    image_urls = []
-    if files:
-        for file in files:
-            if file and allowed_file(file.filename):
-                # uuid를 사용해 고유한 파일명 생성
-                unique_filename = f"{uuid.uuid4().hex}_{secure_filename(file.filename)}"
-                filepath = os.path.join(UPLOAD_FOLDER, unique_filename)
-                file.save(filepath)
-                image_urls.append(f"/static/uploads/{unique_filename}")
+    # 작성자는 로그인 세션의 사용자 (app/auth.py)
+    author_id = current_user().user_id
+
+    # 실제 파일 형식(매직 바이트) / 개수 / 크기 검사 후 저장, 같은 사진은 한 번만 저장됨 (app/upload_ingest.py)
+    try:
+        image_urls = upload_ingest.ingest(files)
+    except upload_ingest.UploadRejected as e:
+        return jsonify({"error": str(e)}), 400
 
     lost_item = LostItemPost(
         lost_item_post_name=data.get("lost_item_post_name"),
@@ -47,70 +33,59 @@ def create_lost_item():
         lost_location=data.get("lost_location"),
         lost_time=data.get("lost_time"),
         content=data.get("content"),
-        image_urls=",".join(image_urls) if image_urls else None,
     )
 
     db.session.add(lost_item)
+    db.session.flush()
+    post_images.add_originals("lost_item", lost_item.lost_item_post_id, image_urls)
+    search.index_post("lost_item", lost_item)
     db.session.commit()
+    invalidate_counts("lost_item")
+    cache.invalidate_list("lost_item")
+    # 열려 있는 목록 화면에 바로 반영 (app/events.py)
+    events.publish_post("lost_item", "post.created", lost_item.lost_item_post_id)
+    # 썸네일/리사이즈/EXIF 제거는 백그라운드에서 처리 (app/image_pipeline.py)
+    image_pipeline.submit("lost_item", lost_item.lost_item_post_id, image_urls)
+    # 습득물 게시판에서 같은 물건일 가능성이 있는 글을 백그라운드에서 찾아 저장 (app/matching.py)
+    matching.submit("lost_item", lost_item.lost_item_post_id)
 
     return jsonify({"message": "분실물 게시글이 등록되었습니다.", "lost_item_post_id": lost_item.lost_item_post_id}), 201
 
 # 분실물 게시글 목록 조회 (페이지네이션 + 키워드 검색)
 @lost_item_bp.route("/", methods=["GET"])
+@query_budget(LIST_QUERY_BUDGET)
 def get_lost_items():
     page = request.args.get('page', 1, type=int)
     limit = request.args.get('limit', 10, type=int)
     keyword = request.args.get('keyword', '', type=str)
-
-    query = LostItemPost.query
-
-    if keyword:
-        # 여러 컬럼을 대상으로 OR 검색
-        query = query.filter(or_(
-            LostItemPost.lost_item_post_name.ilike(f"%{keyword}%"),
-            LostItemPost.lost_item_name.ilike(f"%{keyword}%"),
-            LostItemPost.content.ilike(f"%{keyword}%"),
-            LostItemPost.lost_location.ilike(f"%{keyword}%"),
-            LostItemPost.lost_time.ilike(f"%{keyword}%"),
-        ))
-
-    pagination = query.order_by(LostItemPost.created_at.desc()).paginate(page=page, per_page=limit, error_out=False)
-    lost_items = pagination.items
-
-    result = {
-        "lost_items": [
-            {
-                "lost_item_post_id": post.lost_item_post_id,
-                "lost_item_post_name": post.lost_item_post_name,
-                "author_id": post.author_id,
-                "created_at": post.created_at,
-                "lost_item_name": post.lost_item_name,
-                "lost_location": post.lost_location,
-                "lost_time": post.lost_time,
-                "content": post.content,
-                "image_urls": post.image_urls.split(",") if post.image_urls else [],
-                "views": post.views,
-                "status": post.status,
-            }
-            for post in lost_items
-        ],
-        "total_pages": pagination.pages,
-        "current_page": pagination.page,
-        "total_items": pagination.total
-    }
-    return jsonify(result)
-
-# 특정 분실물 게시글 조회 (조회수 증가)
+    cursor = request.args.get('cursor')  # 지정하면 keyset(cursor) 페이지네이션
+
+    try:
+        # 필요한 필드만 (fields=a,b,c), 본문은 앞부분 미리보기만 내려줌 (app/post_list.py)
+        fields = post_list.parse_fields("lost_item", request.args.get('fields'))
+        # 같은 (page, limit, keyword, cursor, fields) 요청은 캐시된 본문을 그대로 내려줌 (app/cache.py)
+        return cache.cached_list("lost_item", [page, limit, keyword, cursor, fields],
+                                 lambda: post_list.list_payload("lost_item", page, limit, keyword, cursor, fields))
+    except (InvalidCursor, post_list.InvalidFields) as e:
+        return jsonify({"error": str(e)}), 400
+
+# 특정 분실물 게시글 조회 (조회수 증가, 버퍼링)
 @lost_item_bp.route("/<int:lost_item_post_id>", methods=["GET"])
+@query_budget(DETAIL_QUERY_BUDGET)
 def get_lost_item(lost_item_post_id):
-    post = LostItemPost.query.get(lost_item_post_id)
-    if not post:
+    payload = cache.cached_detail("lost_item", lost_item_post_id, lambda: _lost_item_payload(lost_item_post_id))
+    if payload is None:
         return jsonify({"error": "해당 게시글을 찾을 수 없습니다."}), 404
 
-    post.views += 1
-    db.session.commit()
+    # 조회수는 메모리 버퍼에 모았다가 주기적으로 일괄 반영 (app/view_counter.py)
+    payload["views"] += view_counter.record_view("lost_item", lost_item_post_id)
+    return cache.json_response(payload)
 
-    return jsonify({
+def _lost_item_payload(lost_item_post_id):
+    post = LostItemPost.query.get(lost_item_post_id)
+    if not post:
+        return None
+    return {
         "lost_item_post_id": post.lost_item_post_id,
         "lost_item_post_name": post.lost_item_post_name,
         "author_id": post.author_id,
@@ -119,38 +94,57 @@ def get_lost_item(lost_item_post_id):
         "lost_location": post.lost_location,
         "lost_time": post.lost_time,
         "content": post.content,
-        "image_urls": post.image_urls.split(",") if post.image_urls else [],
+        "image_urls": post_images.original_urls(post),
         "views": post.views,
         "status": post.status,
-    })
+        "possible_matches": matching.possible_matches("lost_item", post.lost_item_post_id),
+    }
 
 # 분실물 게시글 삭제
 @lost_item_bp.route("/<int:lost_item_post_id>", methods=["DELETE"])
+@login_required
 def delete_lost_item(lost_item_post_id):
     post = LostItemPost.query.get(lost_item_post_id)
     if not post:
         return jsonify({"error": "해당 게시글을 찾을 수 없습니다."}), 404
+    if not can_modify(post.author_id):
+        return jsonify({"error": "작성자 또는 관리자만 삭제할 수 있습니다."}), 403
 
+    search.remove_post("lost_item", post.lost_item_post_id)
+    orphans = upload_store.release(post_images.remove_post("lost_item", post.lost_item_post_id))
+    partners = matching.remove_post("lost_item", post.lost_item_post_id)
     db.session.delete(post)
     db.session.commit()
+    upload_store.purge(orphans)
+    matching.invalidate_partners("lost_item", partners)
+    invalidate_counts("lost_item")
+    cache.invalidate_post("lost_item", lost_item_post_id)
+    events.publish_post("lost_item", "post.deleted", lost_item_post_id)
     return jsonify({"message": "게시글이 삭제되었습니다."}), 200
 
 # 분실물 게시글 수정 (상태 업데이트 등)
 @lost_item_bp.route("/<int:lost_item_post_id>", methods=["PUT"])
+@login_required
 def update_lost_item(lost_item_post_id):
     post = LostItemPost.query.get(lost_item_post_id)
     if not post:
         return jsonify({"error": "해당 게시글을 찾을 수 없습니다."}), 404
+    if not can_modify(post.author_id):
+        return jsonify({"error": "작성자 또는 관리자만 수정할 수 있습니다."}), 403
 
     data = request.json
     # status만 업데이트한다고 가정
     if "status" in data:
         post.status = data["status"]
     db.session.commit()
+    invalidate_counts("lost_item")  # 다른 게시판과 같이 수정 시에도 개수 캐시를 비운다 (상태 필터가 생겨도 맞도록)
+    cache.invalidate_post("lost_item", lost_item_post_id)
+    events.publish_post("lost_item", "post.updated", lost_item_post_id)
+    matching.submit("lost_item", lost_item_post_id)  # 해결된 글은 매칭에서 빠진다
 
     return jsonify({"message": "게시글이 수정되었습니다."}), 200
 
 # 업로드된 이미지 서빙
-@lost_item_bp.route("/uploads/<filename>", methods=["GET"])
+@lost_item_bp.route("/uploads/<path:filename>", methods=["GET"])
 def serve_uploaded_file(filename):
-    return send_from_directory(current_app.config["UPLOAD_FOLDER"], filename)
+    return upload_store.send_upload(filename)
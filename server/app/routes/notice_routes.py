@@ -1,150 +1,130 @@
 # notice_routes.py
 
-import os
-import uuid
-from flask import Blueprint, request, jsonify, current_app
-from werkzeug.utils import secure_filename
-from sqlalchemy import or_
-from app.models import NoticePost, User
+from flask import Blueprint, request, jsonify
+from app.models import NoticePost
 from app.database import db
+from app import search, post_list, view_counter, cache, image_pipeline, upload_store, upload_ingest, post_images, events
+from app.auth import current_user, admin_required
+from app.instrumentation import query_budget, LIST_QUERY_BUDGET, DETAIL_QUERY_BUDGET
+from app.pagination import invalidate_counts, InvalidCursor
 
 notice_bp = Blueprint("notices", __name__)
 
-UPLOAD_FOLDER = os.path.join("app", "static", "uploads")
-ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "gif"}
-
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
-
-def allowed_file(filename):
-    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
 # 공지사항 등록 (관리자만 가능)
 @notice_bp.route("/", methods=["POST"])
+@admin_required("관리자만 공지사항을 작성할 수 있습니다.")
+@upload_ingest.accepts_uploads
 def create_notice():
     data = request.form
     files = request.files.getlist("images")
 
-    # 작성자(author_id) 유효성 체크
-    author_id = data.get("author_id")
-    user = User.query.get(author_id)
-    if not user:
-        return jsonify({"error": "유효한 사용자 ID가 아닙니다."}), 400
-
-    # 관리자 여부 체크
-    if not user.is_admin:
-        return jsonify({"error": "관리자만 공지사항을 작성할 수 있습니다."}), 403
-
-    image_urls = []
-    if files:
-        for file in files:
-            if file and allowed_file(file.filename):
-                unique_filename = f"{uuid.uuid4().hex}_{secure_filename(file.filename)}"
-                filepath = os.path.join(UPLOAD_FOLDER, unique_filename)
-                file.save(filepath)
-                image_urls.append(f"/static/uploads/{unique_filename}")
+    # 작성자는 로그인 세션의 관리자 (app/auth.py)
+    author_id = current_user().user_id
+
+    # 실제 파일 형식(매직 바이트) / 개수 / 크기 검사 후 저장, 같은 사진은 한 번만 저장됨 (app/upload_ingest.py)
+    try:
+        image_urls = upload_ingest.ingest(files)
+    except upload_ingest.UploadRejected as e:
+        return jsonify({"error": str(e)}), 400
 
     notice = NoticePost(
         notice_post_name=data.get("notice_post_name"),
         author_id=author_id,
         content=data.get("content"),
-        image_urls=",".join(image_urls) if image_urls else None
     )
     db.session.add(notice)
+    db.session.flush()
+    post_images.add_originals("notice", notice.notice_post_id, image_urls)
+    search.index_post("notice", notice)
     db.session.commit()
+    invalidate_counts("notice")
+    cache.invalidate_list("notice")
+    # 열려 있는 목록 화면에 바로 반영 (app/events.py)
+    events.publish_post("notice", "post.created", notice.notice_post_id)
+    # 썸네일/리사이즈/EXIF 제거는 백그라운드에서 처리 (app/image_pipeline.py)
+    image_pipeline.submit("notice", notice.notice_post_id, image_urls)
 
     return jsonify({"message": "공지사항이 등록되었습니다.", "notice_post_id": notice.notice_post_id}), 201
 
 # 공지사항 목록 조회 (검색 및 페이지네이션 포함)
 @notice_bp.route("/", methods=["GET"])
+@query_budget(LIST_QUERY_BUDGET)
 def get_notices():
     page = request.args.get('page', 1, type=int)
     limit = request.args.get('limit', 10, type=int)
     keyword = request.args.get('keyword', '', type=str)
-
-    query = NoticePost.query
-
-    if keyword:
-        query = query.filter(or_(
-            NoticePost.notice_post_name.ilike(f"%{keyword}%"),
-            NoticePost.content.ilike(f"%{keyword}%")
-        ))
-
-    pagination = query.order_by(NoticePost.created_at.desc()).paginate(page=page, per_page=limit, error_out=False)
-    notices = pagination.items
-
-    result = {
-        "notices": [
-            {
-                "notice_post_id": post.notice_post_id,
-                "notice_post_name": post.notice_post_name,
-                "author_id": post.author_id,
-                "created_at": post.created_at,
-                "content": post.content,
-                "image_urls": post.image_urls.split(",") if post.image_urls else [],
-                "views": post.views,
-            }
-            for post in notices
-        ],
-        "total_pages": pagination.pages,
-        "current_page": pagination.page,
-        "total_items": pagination.total
-    }
-    return jsonify(result)
-
-# 특정 공지사항 조회 (조회수 증가)
+    cursor = request.args.get('cursor')  # 지정하면 keyset(cursor) 페이지네이션
+
+    try:
+        # 필요한 필드만 (fields=a,b,c), 본문은 앞부분 미리보기만 내려줌 (app/post_list.py)
+        fields = post_list.parse_fields("notice", request.args.get('fields'))
+        # 같은 (page, limit, keyword, cursor, fields) 요청은 캐시된 본문을 그대로 내려줌 (app/cache.py)
+        return cache.cached_list("notice", [page, limit, keyword, cursor, fields],
+                                 lambda: post_list.list_payload("notice", page, limit, keyword, cursor, fields))
+    except (InvalidCursor, post_list.InvalidFields) as e:
+        return jsonify({"error": str(e)}), 400
+
+# 특정 공지사항 조회 (조회수 증가, 버퍼링)
 @notice_bp.route("/<int:post_id>", methods=["GET"])
+@query_budget(DETAIL_QUERY_BUDGET)
 def get_notice(post_id):
-    post = NoticePost.query.get(post_id)
-    if not post:
+    payload = cache.cached_detail("notice", post_id, lambda: _notice_payload(post_id))
+    if payload is None:
         return jsonify({"error": "공지사항을 찾을 수 없습니다."}), 404
 
-    post.views += 1
-    db.session.commit()
+    # 조회수는 메모리 버퍼에 모았다가 주기적으로 일괄 반영 (app/view_counter.py)
+    payload["views"] += view_counter.record_view("notice", post_id)
+    return cache.json_response(payload)
 
-    return jsonify({
+def _notice_payload(post_id):
+    post = NoticePost.query.get(post_id)
+    if not post:
+        return None
+    return {
         "notice_post_id": post.notice_post_id,
         "notice_post_name": post.notice_post_name,
         "author_id": post.author_id,
         "created_at": post.created_at,
         "content": post.content,
-        "image_urls": post.image_urls.split(",") if post.image_urls else [],
+        "image_urls": post_images.original_urls(post),
         "views": post.views,
-    }), 200
+    }
 
 # 공지사항 수정 (관리자만 가능)
 @notice_bp.route("/<int:post_id>", methods=["PUT"])
+@admin_required("관리자만 공지사항을 수정할 수 있습니다.")
 def update_notice(post_id):
     post = NoticePost.query.get(post_id)
     if not post:
         return jsonify({"error": "공지사항을 찾을 수 없습니다."}), 404
 
     data = request.form  # 혹은 JSON
-    # 작성자(admin) 여부 체크: 실제로는 session이나 인증 토큰을 활용하는 게 좋음
-    author_id = data.get("author_id")
-    user = User.query.get(author_id)
-    if not user or not user.is_admin:
-        return jsonify({"error": "관리자만 공지사항을 수정할 수 있습니다."}), 403
 
     post.notice_post_name = data.get("notice_post_name", post.notice_post_name)
     post.content = data.get("content", post.content)
+    search.index_post("notice", post)
     db.session.commit()
+    invalidate_counts("notice")
+    cache.invalidate_post("notice", post_id)
+    events.publish_post("notice", "post.updated", post_id)
 
     return jsonify({"message": "공지사항이 수정되었습니다."}), 200
 
 # 공지사항 삭제 (관리자만 가능)
 @notice_bp.route("/<int:post_id>", methods=["DELETE"])
+@admin_required("관리자만 공지사항을 삭제할 수 있습니다.")
 def delete_notice(post_id):
     post = NoticePost.query.get(post_id)
     if not post:
         return jsonify({"error": "공지사항을 찾을 수 없습니다."}), 404
 
-    # 삭제 요청 시 작성자(admin) 여부 확인 (실제로는 session 활용)
-    author_id = request.args.get("author_id")
-    user = User.query.get(author_id)
-    if not user or not user.is_admin:
-        return jsonify({"error": "관리자만 공지사항을 삭제할 수 있습니다."}), 403
-
+    search.remove_post("notice", post.notice_post_id)
+    orphans = upload_store.release(post_images.remove_post("notice", post.notice_post_id))
     db.session.delete(post)
     db.session.commit()
+    upload_store.purge(orphans)
+    invalidate_counts("notice")
+    cache.invalidate_post("notice", post_id)
+    events.publish_post("notice", "post.deleted", post_id)
     return jsonify({"message": "공지사항이 삭제되었습니다."}), 200
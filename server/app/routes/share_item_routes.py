@@ -1,141 +1,137 @@
-import os
-import uuid
-from flask import Blueprint, request, jsonify, send_from_directory, current_app
-from werkzeug.utils import secure_filename
-from sqlalchemy import or_
-from app.models import ShareItemPost, User
+from flask import Blueprint, request, jsonify
+from app.models import ShareItemPost
 from app.database import db
+from app import search, post_list, view_counter, cache, image_pipeline, upload_store, upload_ingest, post_images, events
+from app.auth import current_user, login_required, can_modify
+from app.instrumentation import query_budget, LIST_QUERY_BUDGET, DETAIL_QUERY_BUDGET
+from app.pagination import invalidate_counts, InvalidCursor
 
 share_item_bp = Blueprint('share_items', __name__)
 
-UPLOAD_FOLDER = os.path.join("app", "static", "uploads")
-ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "gif"}
-
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
-
-def allowed_file(filename):
-    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
 # 나눔 게시글 등록 (이미지 포함)
 @share_item_bp.route('/', methods=['POST'])
+@login_required
+@upload_ingest.accepts_uploads
 def create_share_item():
     data = request.form
     files = request.files.getlist("images")
 
-    # 작성자(author_id) 유효성 체크
-    author_id = data.get('author_id')
-    user = User.query.get(author_id)
-    if not user:
-        return jsonify({"error": "유효한 사용자 ID가 아닙니다."}), 400
-
-    image_urls = []
-    if files:
-        for file in files:
-            if file and allowed_file(file.filename):
-                # uuid로 고유 파일명 생성
-                unique_filename = f"{uuid.uuid4().hex}_{secure_filename(file.filename)}"
-                filepath = os.path.join(UPLOAD_FOLDER, unique_filename)
-                file.save(filepath)
-                image_urls.append(f"/static/uploads/{unique_filename}")
+    # 작성자는 로그인 세션의 사용자 (app/auth.py)
+    author_id = current_user().user_id
+
+    # 실제 파일 형식(매직 바이트) / 개수 / 크기 검사 후 저장, 같은 사진은 한 번만 저장됨 (app/upload_ingest.py)
+    try:
+        image_urls = upload_ingest.ingest(files)
+    except upload_ingest.UploadRejected as e:
+        return jsonify({"error": str(e)}), 400
 
     share_item = ShareItemPost(
         share_item_post_name=data.get('share_item_post_name'),
         author_id=author_id,
         content=data.get('content'),
-        image_urls=",".join(image_urls) if image_urls else None,
         status=False  # 기본값: 진행중
     )
     db.session.add(share_item)
+    db.session.flush()
+    post_images.add_originals("share_item", share_item.share_item_post_id, image_urls)
+    search.index_post("share_item", share_item)
     db.session.commit()
+    invalidate_counts("share_item")
+    cache.invalidate_list("share_item")
+    # 열려 있는 목록 화면에 바로 반영 (app/events.py)
+    events.publish_post("share_item", "post.created", share_item.share_item_post_id)
+    # 썸네일/리사이즈/EXIF 제거는 백그라운드에서 처리 (app/image_pipeline.py)
+    image_pipeline.submit("share_item", share_item.share_item_post_id, image_urls)
 
     return jsonify({"message": "나눔 게시글이 등록되었습니다.", "share_item_post_id": share_item.share_item_post_id}), 201
 
 # 나눔 게시글 목록 조회 (키워드 검색 + 페이지네이션)
 @share_item_bp.route('/', methods=['GET'])
+@query_budget(LIST_QUERY_BUDGET)
 def get_share_items():
     page = request.args.get('page', 1, type=int)
     limit = request.args.get('limit', 10, type=int)
     keyword = request.args.get('keyword', '', type=str)
-
-    query = ShareItemPost.query
-
-    if keyword:
-        query = query.filter(or_(
-            ShareItemPost.share_item_post_name.ilike(f"%{keyword}%"),
-            ShareItemPost.content.ilike(f"%{keyword}%"),
-        ))
-
-    pagination = query.order_by(ShareItemPost.created_at.desc()).paginate(page=page, per_page=limit, error_out=False)
-    share_items = pagination.items
-
-    result = {
-        "share_items": [
-            {
-                "share_item_post_id": post.share_item_post_id,
-                "share_item_post_name": post.share_item_post_name,
-                "author_id": post.author_id,
-                "created_at": post.created_at,
-                "content": post.content,
-                "image_urls": post.image_urls.split(",") if post.image_urls else [],
-                "status": post.status,
-                "views": post.views,
-            }
-            for post in share_items
-        ],
-        "total_pages": pagination.pages,
-        "current_page": pagination.page,
-        "total_items": pagination.total
-    }
-    return jsonify(result)
-
-# 특정 나눔 게시글 조회 (조회수 증가)
+    cursor = request.args.get('cursor')  # 지정하면 keyset(cursor) 페이지네이션
+
+    try:
+        # 필요한 필드만 (fields=a,b,c), 본문은 앞부분 미리보기만 내려줌 (app/post_list.py)
+        fields = post_list.parse_fields("share_item", request.args.get('fields'))
+        # 같은 (page, limit, keyword, cursor, fields) 요청은 캐시된 본문을 그대로 내려줌 (app/cache.py)
+        return cache.cached_list("share_item", [page, limit, keyword, cursor, fields],
+                                 lambda: post_list.list_payload("share_item", page, limit, keyword, cursor, fields))
+    except (InvalidCursor, post_list.InvalidFields) as e:
+        return jsonify({"error": str(e)}), 400
+
+# 특정 나눔 게시글 조회 (조회수 증가, 버퍼링)
 @share_item_bp.route('/<int:post_id>', methods=['GET'])
+@query_budget(DETAIL_QUERY_BUDGET)
 def get_share_item(post_id):
-    post = ShareItemPost.query.get(post_id)
-    if not post:
+    payload = cache.cached_detail("share_item", post_id, lambda: _share_item_payload(post_id))
+    if payload is None:
         return jsonify({'error': '게시글을 찾을 수 없습니다.'}), 404
 
-    post.views += 1
-    db.session.commit()
+    # 조회수는 메모리 버퍼에 모았다가 주기적으로 일괄 반영 (app/view_counter.py)
+    payload["views"] += view_counter.record_view("share_item", post_id)
+    return cache.json_response(payload)
 
-    return jsonify({
+def _share_item_payload(post_id):
+    post = ShareItemPost.query.get(post_id)
+    if not post:
+        return None
+    return {
         "share_item_post_id": post.share_item_post_id,
         "share_item_post_name": post.share_item_post_name,
         "author_id": post.author_id,
         "created_at": post.created_at,
         "content": post.content,
-        "image_urls": post.image_urls.split(",") if post.image_urls else [],
+        "image_urls": post_images.original_urls(post),
         "status": post.status,
         "views": post.views,
-    }), 200
+    }
 
 # 나눔 게시글 수정 (나눔 완료 처리 등)
 @share_item_bp.route('/<int:post_id>', methods=['PUT'])
+@login_required
 def update_share_item(post_id):
     post = ShareItemPost.query.get(post_id)
     if not post:
         return jsonify({'error': '게시글을 찾을 수 없습니다.'}), 404
+    if not can_modify(post.author_id):
+        return jsonify({'error': '작성자 또는 관리자만 수정할 수 있습니다.'}), 403
 
     data = request.json
     if 'status' in data:
         post.status = data['status']
     db.session.commit()
+    invalidate_counts("share_item")  # 다른 게시판과 같이 수정 시에도 개수 캐시를 비운다 (상태 필터가 생겨도 맞도록)
+    cache.invalidate_post("share_item", post_id)
+    events.publish_post("share_item", "post.updated", post_id)
 
     return jsonify({'message': '게시글이 수정되었습니다.'}), 200
 
 # 나눔 게시글 삭제
 @share_item_bp.route('/<int:post_id>', methods=['DELETE'])
+@login_required
 def delete_share_item(post_id):
     post = ShareItemPost.query.get(post_id)
     if not post:
         return jsonify({'error': '게시글을 찾을 수 없습니다.'}), 404
+    if not can_modify(post.author_id):
+        return jsonify({'error': '작성자 또는 관리자만 삭제할 수 있습니다.'}), 403
 
+    search.remove_post("share_item", post.share_item_post_id)
+    orphans = upload_store.release(post_images.remove_post("share_item", post.share_item_post_id))
     db.session.delete(post)
     db.session.commit()
+    upload_store.purge(orphans)
+    invalidate_counts("share_item")
+    cache.invalidate_post("share_item", post_id)
+    events.publish_post("share_item", "post.deleted", post_id)
     return jsonify({'message': '게시글이 삭제되었습니다.'}), 200
 
 # 업로드된 이미지 서빙
-@share_item_bp.route("/uploads/<filename>", methods=["GET"])
+@share_item_bp.route("/uploads/<path:filename>", methods=["GET"])
 def serve_uploaded_file(filename):
-    return send_from_directory(current_app.config["UPLOAD_FOLDER"], filename)
+    return upload_store.send_upload(filename)
@@ -1,23 +1,144 @@
-from flask import Blueprint, request, jsonify
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify, current_app
+from sqlalchemy import tuple_
 from app.models import User
 from app.database import db
+from app import auth, passwords, user_import
+from app.auth import admin_required, login_required, current_user, can_modify
+from app.json_provider import stream_json
+from app.pagination import encode_keyset, decode_keyset, InvalidCursor
 
 user_bp = Blueprint('users', __name__)
 
+# 관리자 사용자 목록 (필터 / 정렬 / keyset 페이지네이션 / 컬럼 선택)
+# GET /api/users/?is_confirmed=false&grade=1&class_num=3&admission_year=2025&is_admin=false
+#                &sort=created_at&order=desc&limit=50&cursor=...&fields=user_id,user_name,grade
+# 응답: {'users': [...], 'next_cursor': ..., 'has_more': ...}
+USER_FIELDS = ['user_id', 'user_name', 'phone_number', 'admission_year', 'grade', 'class_num',
+               'student_num', 'is_admin', 'is_confirmed', 'created_at']  # user_password는 절대 내보내지 않음
+USER_SORTS = {
+    'created_at': ['created_at', 'user_id'],
+    'user_id': ['user_id'],
+    'user_name': ['user_name', 'user_id'],
+    'student': ['grade', 'class_num', 'student_num', 'user_id'],
+    'admission_year': ['admission_year', 'grade', 'class_num', 'student_num', 'user_id'],
+}
+PENDING_USER_FIELDS = ['user_id', 'user_name', 'is_admin', 'is_confirmed']
+USER_INT_FILTERS = ['grade', 'class_num', 'admission_year']
+USER_BOOL_FILTERS = ['is_confirmed', 'is_admin']
+USER_PAGE_LIMIT_MAX = 200
+USER_EXPORT_BATCH_SIZE = 1000
+
+
+def _bool_arg(value):
+    if value is None or value == '':
+        return None
+    if value.lower() in ('1', 'true', 'yes'):
+        return True
+    if value.lower() in ('0', 'false', 'no'):
+        return False
+    raise ValueError(value)
+
+
+def _user_fields(default_fields):
+    fields = [f for f in request.args.get('fields', '').split(',') if f] or default_fields
+    unknown = [f for f in fields if f not in USER_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def _user_filters(args, forced_filters):
+    """목록 / 내보내기 공통 필터. 잘못된 값이면 ValueError."""
+    filters = []
+    for name in USER_INT_FILTERS:
+        value = args.get(name, type=int)
+        if value is not None:
+            filters.append(getattr(User, name) == value)
+    for name in USER_BOOL_FILTERS:
+        try:
+            value = forced_filters[name] if name in forced_filters else _bool_arg(args.get(name))
+        except ValueError:
+            raise ValueError(f'{name} must be true or false')
+        if value is not None:
+            filters.append(getattr(User, name) == value)
+    return filters
+
+
+def user_list_query(args, fields, sort, descending, limit, after=None, **forced_filters):
+    """사용자 목록 한 페이지 쿼리 (limit + 1개, 실행 전). 필터 값이 잘못되면 ValueError.
+    after는 커서에서 꺼낸 정렬 컬럼 값. `flask query-plans`(app/query_plans.py)도 이 함수로 EXPLAIN 한다."""
+    filters = _user_filters(args, forced_filters)
+    # 필요한 컬럼만 조회 (정렬 컬럼은 커서를 만들기 위해 항상 포함)
+    sort_names = USER_SORTS[sort]
+    selected = list(dict.fromkeys(fields + sort_names))
+    sort_columns = [getattr(User, name) for name in sort_names]
+    query = db.session.query(*[getattr(User, name) for name in selected]).filter(*filters)
+    if after is not None:
+        key, after = tuple_(*sort_columns), tuple_(*after)
+        query = query.filter(key < after if descending else key > after)
+    order_by = [c.desc() if descending else c.asc() for c in sort_columns]
+    return query.order_by(*order_by).limit(limit + 1)
+
+
+def _list_users(default_fields, **forced_filters):
+    args = request.args
+    sort = args.get('sort', 'created_at')
+    if sort not in USER_SORTS:
+        return jsonify({'error': f"sort must be one of: {', '.join(USER_SORTS)}"}), 400
+    descending = args.get('order', 'desc' if sort == 'created_at' else 'asc') == 'desc'
+    limit = min(max(args.get('limit', 50, type=int), 1), USER_PAGE_LIMIT_MAX)
+    sort_names = USER_SORTS[sort]
+
+    after = None
+    cursor = args.get('cursor')
+    if cursor:
+        try:
+            values = decode_keyset(cursor, len(sort_names))
+            after = [datetime.fromisoformat(v) if name == 'created_at' and v else v
+                     for name, v in zip(sort_names, values)]
+        except (InvalidCursor, ValueError, TypeError):
+            return jsonify({'error': '잘못된 cursor 값입니다.'}), 400
+
+    try:
+        fields = _user_fields(default_fields)
+        query = user_list_query(args, fields, sort, descending, limit, after, **forced_filters)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    rows = query.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # created_at 등 datetime은 JSON provider가 ISO 8601로 직렬화 (app/json_provider.py)
+    users = [{name: row._mapping[name] for name in fields} for row in rows]
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_keyset([rows[-1]._mapping[name] for name in sort_names])
+    return jsonify({'users': users, 'next_cursor': next_cursor, 'has_more': has_more}), 200
+
+
 @user_bp.route('/', methods=['GET'])
+@admin_required()
 def get_users():
-    users = User.query.all()
-    return jsonify([{
-        'user_id': user.user_id,
-        'user_name': user.user_name,
-        'phone_number': user.phone_number,
-        'admission_year': user.admission_year,
-        'grade': user.grade,
-        'class_num': user.class_num,
-        'student_num': user.student_num,
-        'is_admin': user.is_admin,
-        'is_confirmed': user.is_confirmed
-    } for user in users]), 200
+    return _list_users(USER_FIELDS)
+
+# 사용자 내보내기 (필터 / 컬럼 선택은 목록과 같고, 페이지 없이 전체를 학번순으로)
+# GET /api/users/export?is_confirmed=true&grade=1&fields=user_id,user_name
+# DB 커서에서 USER_EXPORT_BATCH_SIZE행씩 읽으며 바로 직렬화해 스트리밍 -> 인원수와 관계없이 메모리 일정
+@user_bp.route('/export', methods=['GET'])
+@admin_required()
+def export_users():
+    try:
+        fields = _user_fields(USER_FIELDS)
+        filters = _user_filters(request.args, {})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    rows = (db.session.query(*[getattr(User, name) for name in fields])
+            .filter(*filters)
+            .order_by(*[getattr(User, name) for name in USER_SORTS['student']])
+            .yield_per(USER_EXPORT_BATCH_SIZE))
+    return stream_json('users', rows, lambda row: {name: row._mapping[name] for name in fields})
 
 @user_bp.route('/<string:user_id>', methods=['GET'])
 def get_user(user_id):
@@ -41,18 +162,24 @@ def create_user():
     data = request.json
     if not data.get('user_id'):
         return jsonify({'error': 'user_id is required.'}), 400
-    
+    if not data.get('user_password'):
+        return jsonify({'error': 'user_password is required.'}), 400
+
+    try:
+        password_hash = passwords.hash_password(data['user_password'])
+    except passwords.PasswordPoolBusy:
+        return jsonify({'error': 'Server is busy, try again later.'}), 503
 
     user = User(
         user_id=data.get('user_id'),
-        user_password=data.get('user_password'),
+        user_password=password_hash,
         user_name=data.get('user_name'),
         admission_year=data.get('admission_year'),
         grade=data.get('grade'),
         class_num=data.get('class_num'),
         student_num=data.get('student_num'),
         phone_number=data.get('phone_number'),
-        is_admin=data.get('is_admin', False),
+        is_admin=False,  # 관리자 권한은 관리자가 승인할 때 준다 (approve_user)
         is_confirmed=False  # 가입 시에는 무조건 False
     )
     db.session.add(user)
@@ -65,13 +192,24 @@ def create_user():
 
     return jsonify({'message': 'User created', 'user_id': user.user_id}), 201
 
+# 본인 또는 관리자만 수정. 권한 / 승인 상태(is_admin, is_confirmed)는 관리자만 바꿀 수 있다
 @user_bp.route('/<string:user_id>', methods=['PUT'])
+@login_required
 def update_user(user_id):
+    if not can_modify(user_id):
+        return jsonify({'error': '본인 또는 관리자만 수정할 수 있습니다.'}), 403
     user = User.query.get(user_id)
     if not user:
         return jsonify({'error': 'User not found'}), 404
     data = request.json
-    user.user_password = data.get('user_password', user.user_password)
+    if not current_user().is_admin and (data.get('is_admin', user.is_admin) != user.is_admin
+                                        or data.get('is_confirmed', user.is_confirmed) != user.is_confirmed):
+        return jsonify({'error': '관리자만 권한 / 승인 상태를 바꿀 수 있습니다.'}), 403
+    if data.get('user_password'):
+        try:
+            user.user_password = passwords.hash_password(data['user_password'])
+        except passwords.PasswordPoolBusy:
+            return jsonify({'error': 'Server is busy, try again later.'}), 503
     user.user_name = data.get('user_name', user.user_name)
     user.admission_year = data.get('admission_year', user.admission_year)
     user.grade = data.get('grade', user.grade)
@@ -81,40 +219,127 @@ def update_user(user_id):
     user.is_admin = data.get('is_admin', user.is_admin)
     user.is_confirmed = data.get('is_confirmed', user.is_confirmed)
     db.session.commit()
+    auth.invalidate_user(user_id)
     return jsonify({'message': 'User updated'}), 200
 
 @user_bp.route('/<string:user_id>', methods=['DELETE'])
+@admin_required()
 def delete_user(user_id):
     user = User.query.get(user_id)
     if not user:
         return jsonify({'error': 'User not found'}), 404
     db.session.delete(user)
     db.session.commit()
+    auth.invalidate_user(user_id)
     return jsonify({'message': 'User deleted'}), 200
 
-# (예시) 관리자 승인 대기 목록 조회 (is_confirmed=False)
+# 관리자 승인 대기 목록 조회 (is_confirmed=False, 나머지 파라미터는 get_users와 같음)
 @user_bp.route('/pending', methods=['GET'])
+@admin_required()
 def get_pending_users():
-    # 관리자만 접근 가능하다고 가정(실제론 인증/인가 로직 필요)
-    pending_users = User.query.filter_by(is_confirmed=False).all()
-    return jsonify([{
-        'user_id': user.user_id,
-        'user_name': user.user_name,
-        'is_admin': user.is_admin,
-        'is_confirmed': user.is_confirmed
-    } for user in pending_users]), 200
+    return _list_users(PENDING_USER_FIELDS, is_confirmed=False)
 
-# (예시) 특정 사용자 승인/권한 설정
+# 특정 사용자 승인/권한 설정 (관리자만, 여러 명은 bulk-approve)
 @user_bp.route('/<string:user_id>/approve', methods=['PUT'])
+@admin_required()
 def approve_user(user_id):
-    # 관리자만 접근 가능하다고 가정(실제론 인증/인가 로직 필요)
     user = User.query.get(user_id)
     if not user:
         return jsonify({'error': 'User not found'}), 404
 
-    data = request.json  # { "is_admin": true/false }
+    data = request.get_json(silent=True) or {}  # { "is_admin": true/false }, bulk-approve와 같이 본문은 생략 가능
     user.is_confirmed = True
-    user.is_admin = data.get('is_admin', False)
+    user.is_admin = bool(data.get('is_admin', False))
     db.session.commit()
+    auth.invalidate_user(user_id)
 
     return jsonify({'message': 'User approved', 'user_id': user.user_id, 'is_admin': user.is_admin}), 200
+
+# 여러 사용자 한 번에 승인 (한 트랜잭션, UPDATE 한 번)
+# POST /api/users/bulk-approve  { "user_ids": [...], "is_admin": false }
+BULK_LIMIT_MAX = 5000
+
+
+def _bulk_user_ids():
+    data = request.get_json(silent=True) or {}
+    user_ids = data.get('user_ids')
+    if not isinstance(user_ids, list) or not user_ids or not all(isinstance(u, str) for u in user_ids):
+        return None, data
+    return list(dict.fromkeys(user_ids))[:BULK_LIMIT_MAX], data
+
+
+@user_bp.route('/bulk-approve', methods=['POST'])
+@admin_required()
+def bulk_approve_users():
+    user_ids, data = _bulk_user_ids()
+    if user_ids is None:
+        return jsonify({'error': 'user_ids must be a non-empty list'}), 400
+
+    found = {u for (u,) in db.session.query(User.user_id).filter(User.user_id.in_(user_ids))}
+    (User.query
+     .filter(User.user_id.in_(found))
+     .update({'is_confirmed': True, 'is_admin': bool(data.get('is_admin', False))}, synchronize_session=False))
+    db.session.commit()
+    for user_id in found:
+        auth.invalidate_user(user_id)
+
+    return jsonify({
+        'message': 'Users approved',
+        'approved': sorted(found),
+        'not_found': [u for u in user_ids if u not in found],
+    }), 200
+
+
+# 승인 대기 중인 가입 신청 여러 개 한 번에 거절 (삭제). 이미 승인된 사용자는 건드리지 않는다.
+# POST /api/users/bulk-reject  { "user_ids": [...] }
+@user_bp.route('/bulk-reject', methods=['POST'])
+@admin_required()
+def bulk_reject_users():
+    user_ids, _ = _bulk_user_ids()
+    if user_ids is None:
+        return jsonify({'error': 'user_ids must be a non-empty list'}), 400
+
+    pending = {u for (u,) in db.session.query(User.user_id)
+               .filter(User.user_id.in_(user_ids), User.is_confirmed.is_(False))}
+    User.query.filter(User.user_id.in_(pending)).delete(synchronize_session=False)
+    db.session.commit()
+    for user_id in pending:
+        auth.invalidate_user(user_id)
+
+    return jsonify({
+        'message': 'Users rejected',
+        'rejected': sorted(pending),
+        'skipped': [u for u in user_ids if u not in pending],
+    }), 200
+
+
+# CSV / XLSX로 사용자 일괄 등록 (app/user_import.py)
+# POST /api/users/import  (multipart: file, is_confirmed=true|false)
+@user_bp.route('/import', methods=['POST'])
+@admin_required()
+def import_users():
+    # 게시판 이미지 업로드와 별도의 크기 상한 (파일 파트는 Werkzeug 기본 방식으로 받는다)
+    request.max_content_length = current_app.config.get('USER_IMPORT_MAX_BYTES', user_import.IMPORT_MAX_BYTES)
+    file = request.files.get('file')
+    if not file or not file.filename:
+        return jsonify({'error': 'file is required'}), 400
+    try:
+        is_confirmed = _bool_arg(request.form.get('is_confirmed', 'true'))
+    except ValueError:
+        return jsonify({'error': 'is_confirmed must be true or false'}), 400
+
+    try:
+        imported, errors = user_import.import_users(file, is_confirmed=bool(is_confirmed))
+        db.session.commit()
+    except user_import.ImportFormatError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+    except passwords.PasswordPoolBusy:
+        db.session.rollback()
+        return jsonify({'error': 'Server is busy, try again later.'}), 503
+    except Exception as e:
+        db.session.rollback()
+        print(e)
+        return jsonify({'error': str(e)}), 500
+
+    return jsonify({'imported': imported, 'failed': len(errors), 'errors': errors}), 200
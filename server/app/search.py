@@ -0,0 +1,183 @@
+import re
+from collections import defaultdict
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import or_, func, case
+
+from app.database import db
+from app.models import LostItemPost, FoundItemPost, ShareItemPost, NoticePost, SearchToken
+
+# 게시판 키워드 검색용 역색인(inverted index)
+# - 단어 전체 토큰("w:지갑")과 글자 bigram 토큰("지갑", "검은" ...)을 함께 저장
+# - 한글은 띄어쓰기/조사 때문에 단어 단위로는 잘 안 걸리므로 bigram으로 부분 일치를 처리하고,
+#   단어 전체가 일치하면 가중치를 더 줘서 관련도 순으로 정렬한다 (hybrid 매칭)
+# - 게시글 등록/수정/삭제 시 같은 트랜잭션 안에서 색인을 갱신한다
+
+WORD_RE = re.compile(r"\w+")
+WORD_PREFIX = "w:"
+WORD_BONUS = 3
+MAX_TOKEN_LEN = 30
+REBUILD_BATCH_SIZE = 1000
+
+# 게시판별 검색 대상 컬럼과 컬럼 가중치 (board 이름은 CommentCategoryEnum 값과 동일)
+BOARDS = {
+    "lost_item": (LostItemPost, "lost_item_post_id", [
+        ("lost_item_post_name", 3),
+        ("lost_item_name", 3),
+        ("lost_location", 2),
+        ("lost_time", 1),
+        ("content", 1),
+    ]),
+    "found_item": (FoundItemPost, "found_item_post_id", [
+        ("found_item_post_name", 3),
+        ("found_item_name", 3),
+        ("found_location", 2),
+        ("found_time", 1),
+        ("content", 1),
+    ]),
+    "share_item": (ShareItemPost, "share_item_post_id", [
+        ("share_item_post_name", 3),
+        ("content", 1),
+    ]),
+    "notice": (NoticePost, "notice_post_id", [
+        ("notice_post_name", 3),
+        ("content", 1),
+    ]),
+}
+
+
+def _bigrams(word):
+    return [word[i:i + 2] for i in range(len(word) - 1)]
+
+
+def _document_tokens(text):
+    for word in WORD_RE.findall(text.lower()):
+        word = word[:MAX_TOKEN_LEN]
+        yield WORD_PREFIX + word, WORD_BONUS
+        for gram in _bigrams(word):
+            yield gram, 1
+
+
+def text_tokens(text):
+    """색인과 같은 방식으로 나눈 토큰 집합 (app/matching.py에서 유사도 계산에 사용)."""
+    return {token for token, _ in _document_tokens(text or "")}
+
+
+def _query_tokens(keyword):
+    """검색어 -> (반드시 포함돼야 하는 bigram 집합, 가산점용 단어 토큰 집합).
+    한 글자 단어가 섞여 있으면 bigram으로 표현할 수 없으므로 None을 돌려준다."""
+    required, bonus = set(), set()
+    for word in WORD_RE.findall(keyword.lower()):
+        if len(word) < 2:
+            return None
+        word = word[:MAX_TOKEN_LEN]
+        required.update(_bigrams(word))
+        bonus.add(WORD_PREFIX + word)
+    if not required:
+        return None
+    return required, bonus
+
+
+def _post_rows(board, post):
+    _, pk_name, fields = BOARDS[board]
+    weights = defaultdict(int)
+    for field, field_weight in fields:
+        for token, token_weight in _document_tokens(getattr(post, field) or ""):
+            weights[token] += field_weight * token_weight
+    post_id = getattr(post, pk_name)
+    return [
+        {"board": board, "post_id": post_id, "token": token, "weight": weight}
+        for token, weight in weights.items()
+    ]
+
+
+def index_post(board, post):
+    """게시글 색인 등록/갱신. 호출한 쪽에서 commit 한다 (post의 PK가 있어야 하므로 flush 이후 호출)."""
+    remove_post(board, getattr(post, BOARDS[board][1]))
+    rows = _post_rows(board, post)
+    if rows:
+        db.session.execute(SearchToken.__table__.insert(), rows)
+
+
+def remove_post(board, post_id):
+    SearchToken.query.filter_by(board=board, post_id=post_id).delete(synchronize_session=False)
+
+
+def _apply_ilike(query, board, keyword):
+    model, _, fields = BOARDS[board]
+    return query.filter(or_(*[
+        getattr(model, field).ilike(f"%{keyword}%") for field, _ in fields
+    ]))
+
+
+def apply_keyword_search(query, board, keyword, ranked=True):
+    """목록 조회 쿼리에 키워드 검색 조건을 적용한다.
+    ranked=True면 색인 관련도(score) 순 정렬을 먼저 건다. 최신순 정렬은 호출한 쪽에서 붙인다.
+    (cursor 페이지네이션은 (created_at, id) 순서를 그대로 써야 하므로 ranked=False)"""
+    if current_app.config.get("SEARCH_BACKEND", "index") != "index":
+        return _apply_ilike(query, board, keyword)
+
+    tokens = _query_tokens(keyword)
+    if tokens is None:
+        # 한 글자 검색어 등 색인으로 처리할 수 없는 경우는 기존 ilike 검색
+        return _apply_ilike(query, board, keyword)
+    required, bonus = tokens
+
+    model, pk_name, _ = BOARDS[board]
+    # 안쪽: (board, token IN ...)으로 ix_search_token_board_token만 읽는다. (post_id, token)은 PK라 묶어도 행 수는 그대로지만,
+    # 바로 post_id로 묶으면 SQLite가 GROUP BY 정렬을 피하려고 PK 인덱스(board, post_id, token)로 게시판의 모든 토큰을 훑는다
+    hits = (
+        db.session.query(
+            SearchToken.post_id.label("post_id"),
+            SearchToken.token.label("token"),
+            func.max(SearchToken.weight).label("weight"),
+        )
+        .filter(SearchToken.board == board, SearchToken.token.in_(required | bonus))
+        .group_by(SearchToken.post_id, SearchToken.token)
+        .subquery()
+    )
+    matches = (
+        db.session.query(hits.c.post_id.label("post_id"), func.sum(hits.c.weight).label("score"))
+        .group_by(hits.c.post_id)
+        .having(func.sum(case((hits.c.token.in_(required), 1), else_=0)) >= len(required))
+        .subquery()
+    )
+    query = query.join(matches, getattr(model, pk_name) == matches.c.post_id)
+    if ranked:
+        query = query.order_by(matches.c.score.desc())
+    return query
+
+
+def rebuild_index(board):
+    model, pk_name, _ = BOARDS[board]
+    pk = getattr(model, pk_name)
+    SearchToken.query.filter_by(board=board).delete(synchronize_session=False)
+
+    # PK 순서로 끊어서 읽으며 배치 단위로 executemany insert
+    indexed, last_id = 0, 0
+    while True:
+        posts = model.query.filter(pk > last_id).order_by(pk).limit(REBUILD_BATCH_SIZE).all()
+        if not posts:
+            break
+        rows = [row for post in posts for row in _post_rows(board, post)]
+        if rows:
+            db.session.execute(SearchToken.__table__.insert(), rows)
+        indexed += len(posts)
+        last_id = getattr(posts[-1], pk_name)
+        db.session.expunge_all()
+    db.session.commit()
+    return indexed
+
+
+search_cli = AppGroup("search", help="게시판 검색 색인 관리")
+
+
+@search_cli.command("rebuild")
+@click.argument("boards", nargs=-1, type=click.Choice(list(BOARDS)))
+def rebuild_command(boards):
+    """검색 색인을 처음부터 다시 만든다. (예: flask search rebuild lost_item notice)"""
+    for board in boards or BOARDS:
+        count = rebuild_index(board)
+        click.echo(f"✅ {board}: {count}개 게시글 색인 완료")
@@ -0,0 +1,88 @@
+import os
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import text
+
+from app import cache, events, upload_store
+from app.database import db
+
+# 서버 시작 전 점검 (wsgi.py에서 실행, `flask self-check`로 수동 실행 가능)
+# 문제가 있으면 메시지 목록을 돌려준다. 빈 목록이면 정상.
+
+
+def _pending_migrations(app):
+    from alembic.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    migrate = app.extensions["migrate"]
+    script = ScriptDirectory.from_config(migrate.migrate.get_config(migrate.directory))
+    current = set(MigrationContext.configure(db.session.connection()).get_current_heads())
+    return [head for head in script.get_heads() if head not in current]
+
+
+def run_self_check(app):
+    problems = []
+    with app.app_context():
+        try:
+            db.session.execute(text("SELECT 1"))
+            pending = _pending_migrations(app)
+            if pending:
+                problems.append(f"적용되지 않은 DB 마이그레이션이 있습니다 (flask db upgrade): {', '.join(pending)}")
+        except Exception as e:
+            problems.append(f"DB 연결 실패: {e}")
+        finally:
+            db.session.remove()
+
+    # 워커가 여러 개면 캐시 무효화가 모든 워커에 닿아야 한다 (app/cache.py)
+    if app.config.get("WORKER_PROCESSES", 1) > 1 and app.config.get("RESPONSE_CACHE_TYPE") == "memory":
+        problems.append("워커가 여러 개인데 RESPONSE_CACHE_TYPE=memory 입니다 "
+                        "(다른 워커가 예전 목록/상세를 계속 보냄, redis 또는 null로 설정)")
+    try:
+        cache.check()
+    except Exception as e:
+        if app.config.get("RESPONSE_CACHE_TYPE") == "redis":
+            url = app.config.get("RESPONSE_CACHE_REDIS_URL", "redis://localhost:6379/0")
+            problems.append(f"응답 캐시용 Redis 서버에 연결할 수 없습니다 ({url}): {e} "
+                            "(Redis를 띄우거나 RESPONSE_CACHE_REDIS_URL을 고칠 것, 캐시 없이 띄우려면 RESPONSE_CACHE_TYPE=null)")
+        else:
+            problems.append(f"응답 캐시 백엔드 연결 실패 (RESPONSE_CACHE_TYPE={app.config.get('RESPONSE_CACHE_TYPE')}): {e}")
+
+    # 실시간 알림도 마찬가지로 모든 워커의 구독자에게 닿아야 한다 (app/events.py)
+    if app.config.get("WORKER_PROCESSES", 1) > 1 and app.config.get("EVENTS_BROKER_TYPE") == "memory":
+        problems.append("워커가 여러 개인데 EVENTS_BROKER_TYPE=memory 입니다 "
+                        "(다른 워커에서 발행한 알림을 받지 못함, redis로 설정)")
+    try:
+        events.check()
+    except Exception as e:
+        url = app.config.get("EVENTS_REDIS_URL", "redis://localhost:6379/0")
+        problems.append(f"실시간 알림용 Redis 서버에 연결할 수 없습니다 ({url}): {e} "
+                        "(Redis를 띄우거나 EVENTS_REDIS_URL을 고칠 것)")
+
+    upload_folder = app.config.get("UPLOAD_FOLDER")
+    if not upload_folder or not os.access(upload_folder, os.W_OK):
+        problems.append(f"업로드 폴더에 쓸 수 없습니다: {upload_folder}")
+    elif app.config.get("UPLOAD_SEND_MODE", "flask") != "flask":
+        # x-accel / x-sendfile은 웹 서버(다른 사용자)가 파일을 직접 읽는다 (app/upload_store.py)
+        unreadable = upload_store.unreadable_paths(upload_folder)
+        if unreadable:
+            problems.append(f"UPLOAD_SEND_MODE={app.config['UPLOAD_SEND_MODE']}인데 웹 서버가 읽을 수 없는 업로드 파일/폴더가 "
+                            f"{len(unreadable)}개 있습니다 (chmod o+r, 폴더는 o+x): {', '.join(unreadable[:5])}")
+    if not app.config.get("SECRET_KEY"):
+        problems.append("SECRET_KEY가 설정되지 않았습니다 (세션 사용 불가)")
+    if app.debug:
+        problems.append("DEBUG 모드가 켜져 있습니다 (운영 서버에서는 끌 것)")
+    return problems
+
+
+@click.command("self-check")
+@with_appcontext
+def self_check_command():
+    """운영 서버 시작 전 점검 항목을 실행한다."""
+    from flask import current_app
+    problems = run_self_check(current_app._get_current_object())
+    for problem in problems:
+        click.echo(f"❌ {problem}")
+    if problems:
+        raise SystemExit(1)
+    click.echo("✅ 점검 통과")
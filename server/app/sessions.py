@@ -0,0 +1,31 @@
+from flask_session import Session
+
+# 세션 저장소 선택 (SESSION_BACKEND)
+# - "cookie"(기본): Flask 기본 서명 쿠키. 서버에 아무것도 저장하지 않으므로 여러 워커/서버에서 그대로 동작,
+#   만료는 서명 시각 + PERMANENT_SESSION_LIFETIME으로 검사한다
+# - "redis": Flask-Session + Redis. 키마다 TTL(PERMANENT_SESSION_LIFETIME)이 걸려 Redis가 알아서 만료/정리
+#   SESSION_REDIS_URL, 테스트에서는 SESSION_REDIS_CLIENT에 redis 호환 객체(fakeredis 등)를 넣는다
+# - "filesystem": 예전 방식 (단일 서버 개발용)
+
+
+def init_app(app):
+    backend = app.config.get("SESSION_BACKEND", "cookie")
+    app.config.setdefault("SESSION_PERMANENT", False)
+    # 로그인 정보가 바뀔 때만 저장 (매 요청마다 쿠키/저장소를 다시 쓰지 않음)
+    app.config.setdefault("SESSION_REFRESH_EACH_REQUEST", False)
+
+    if backend == "cookie":
+        return
+    if backend == "redis":
+        client = app.config.get("SESSION_REDIS_CLIENT")
+        if client is None:
+            import redis  # 선택 의존성: redis 백엔드를 쓸 때만 필요
+            client = redis.Redis.from_url(app.config.get("SESSION_REDIS_URL", "redis://localhost:6379/1"))
+        app.config["SESSION_TYPE"] = "redis"
+        app.config["SESSION_REDIS"] = client
+        app.config.setdefault("SESSION_KEY_PREFIX", "csibee:session:")
+    elif backend == "filesystem":
+        app.config["SESSION_TYPE"] = "filesystem"
+    else:
+        raise ValueError(f"알 수 없는 SESSION_BACKEND: {backend}")
+    Session(app)
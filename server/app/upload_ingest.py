@@ -0,0 +1,318 @@
+import functools
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Request, current_app, jsonify, request
+from PIL import Image, ImageOps
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from app import upload_store
+
+# 게시글 이미지 업로드 수신 (4개 게시판 공통)
+# - @accepts_uploads를 붙인 게시판 등록 라우트에만 적용된다. 다른 라우트(/api/users/import 등)의 파일 파트는
+#   Werkzeug 기본 방식으로 받고 크기 상한도 각자 정한다 (MAX_CONTENT_LENGTH가 없으면 UPLOAD_MAX_REQUEST_BYTES)
+# - 요청 크기 상한: UPLOAD_MAX_REQUEST_BYTES(기본 50MB), 넘으면 413
+#   파일 하나 상한: UPLOAD_MAX_FILE_BYTES(기본 20MB), 파일 개수 상한: UPLOAD_MAX_FILES(기본 10)
+# - 폼 파서가 파일 파트를 메모리(BytesIO)가 아니라 처음부터 디스크 임시 파일(SpoolFile)에 청크 단위로 쓰고,
+#   쓰는 동안 sha256 / 크기 / 앞부분(파일 형식 검사용)을 함께 계산한다 -> 파일 크기와 관계없이 메모리 일정,
+#   저장할 때 파일을 다시 읽지 않는다
+# - 파일 형식은 확장자가 아니라 앞부분의 매직 바이트로 판별 (png / jpg / gif만 허용)
+# - EXIF(촬영 위치 등) / XMP는 저장하기 전에 빼고 회전 정보는 픽셀에 반영한다 (메타데이터가 있는 파일만 다시 인코딩)
+#   위치 정보가 남은 원본이 한순간도 공개되지 않도록 요청 안에서 처리하므로, 디코딩에 드는 메모리(픽셀 수 x 3~4바이트)를
+#   UPLOAD_MAX_PIXELS(기본 4천만 화소, 약 120MB)로 제한하고 넘으면 거절한다 (헤더만 읽고 판단)
+#   -> 해시(파일 이름)는 정리된 내용 기준이고, 저장된 파일은 이후 절대 덮어쓰지 않는다
+#   (이름과 내용이 항상 같아야 중복 제거 / 참조 수 / immutable 캐시가 맞다, app/upload_store.py)
+# - 임시 파일 위치: UPLOAD_SPOOL_DIR(기본 instance/upload-spool). 메타데이터를 빼기 전 원본이 /static 아래로 노출되지 않도록
+#   서빙하는 폴더 밖에 둔다. 업로드 폴더와 같은 파일 시스템이면 rename 한 번으로 저장,
+#   다르면(로컬 디스크에 받고 NFS 등에 저장하는 경우) UPLOAD_WRITE_WORKERS(기본 4)개 스레드로 여러 파일을 동시에 복사
+# - 임시 파일은 0600으로 만들어지므로 저장할 때 umask를 따른 일반 파일 권한(보통 0644)으로 바꾼다
+#   (X-Accel-Redirect / X-Sendfile로 nginx·Apache가 다른 사용자로 읽을 수 있어야 함, app/upload_store.py)
+
+UPLOAD_MAX_REQUEST_BYTES = 50 * 1024 * 1024
+UPLOAD_MAX_FILE_BYTES = 20 * 1024 * 1024
+UPLOAD_MAX_FILES = 10
+UPLOAD_MAX_PIXELS = 40_000_000
+HEAD_BYTES = 16
+COPY_CHUNK_SIZE = 1024 * 1024
+METADATA_KEYS = ("exif", "xmp", "XML:com.adobe.xmp")
+
+# 매직 바이트 -> 저장 확장자
+SIGNATURES = [
+    (b"\xff\xd8\xff", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+]
+
+# 현재 umask (읽으려면 바꿔야 하므로 스레드가 뜨기 전, import 시점에 한 번만 읽는다)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+class UploadRejected(ValueError):
+    pass
+
+
+class SpoolFile:
+    """폼 파서가 파일 파트를 쓰는 디스크 임시 파일.
+    쓰면서 sha256 / 크기 / 앞부분을 계산하고, UPLOAD_MAX_FILE_BYTES를 넘으면 413을 낸다.
+    닫힐 때(요청이 끝날 때) 아직 남아 있는 임시 파일은 지운다."""
+
+    def __init__(self, directory, max_bytes):
+        fd, self.path = tempfile.mkstemp(dir=directory, prefix="spool-")
+        self._file = os.fdopen(fd, "w+b")
+        self._max_bytes = max_bytes
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+        self.head = b""
+
+    def write(self, data):
+        self.size += len(data)
+        if self.size > self._max_bytes:
+            self.close()  # 파싱이 중단되면 요청의 files에 들어가지 않으므로 여기서 정리
+            raise RequestEntityTooLarge(f"파일 하나는 {self._max_bytes // (1024 * 1024)}MB까지 올릴 수 있습니다.")
+        if len(self.head) < HEAD_BYTES:
+            self.head += bytes(data[:HEAD_BYTES - len(self.head)])
+        self.sha256.update(data)
+        return self._file.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+    def __iter__(self):
+        return iter(self._file)
+
+    def moved(self):
+        """임시 파일을 다른 곳으로 옮겼으면 호출 (close 때 지우지 않음)."""
+        self.path = None
+
+    def close(self):
+        self._file.close()
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+
+
+class UploadRequest(Request):
+    spool_uploads = False  # @accepts_uploads 라우트에서만 True
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if not self.spool_uploads:
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+        return SpoolFile(spool_dir(), current_app.config.get("UPLOAD_MAX_FILE_BYTES", UPLOAD_MAX_FILE_BYTES))
+
+
+def accepts_uploads(view):
+    """게시판 이미지 업로드 라우트: 파일 파트를 SpoolFile로 받고 요청 크기 상한을 UPLOAD_MAX_REQUEST_BYTES로 둔다.
+    폼을 읽기 전에 설정해야 하므로 라우트의 다른 데코레이터 아래(뷰 바로 위)에 붙인다."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        request.spool_uploads = True
+        request.max_content_length = current_app.config.get("UPLOAD_MAX_REQUEST_BYTES", UPLOAD_MAX_REQUEST_BYTES)
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def init_app(app):
+    if app.config.get("MAX_CONTENT_LENGTH") is None:
+        app.config["MAX_CONTENT_LENGTH"] = app.config.get("UPLOAD_MAX_REQUEST_BYTES", UPLOAD_MAX_REQUEST_BYTES)
+    # 요청 클래스는 앱 전체에 걸리지만 스풀은 accepts_uploads 라우트에서만 켜진다
+    app.request_class = UploadRequest
+    app.register_error_handler(RequestEntityTooLarge, _too_large)
+    app.config["UPLOAD_SPOOL_DIR"] = (app.config.get("UPLOAD_SPOOL_DIR")
+                                      or os.path.join(app.instance_path, "upload-spool"))
+    os.makedirs(app.config["UPLOAD_SPOOL_DIR"], exist_ok=True)
+
+
+def _too_large(e):
+    # 파일 하나가 큰 경우는 SpoolFile이 넣은 메시지, 요청 전체가 큰 경우(라우트별 max_content_length)는 기본 메시지
+    if e.description == RequestEntityTooLarge.description:
+        limit = request.max_content_length // (1024 * 1024)
+        return jsonify({"error": f"한 번에 {limit}MB까지 올릴 수 있습니다."}), 413
+    return jsonify({"error": e.description}), 413
+
+
+def spool_dir():
+    return current_app.config["UPLOAD_SPOOL_DIR"]
+
+
+def _get_executor():
+    # fork 이후의 워커 프로세스에서는 새 풀을 만든다
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=current_app.config.get("UPLOAD_WRITE_WORKERS", 4),
+                thread_name_prefix="upload-write",
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def detect_type(head):
+    """파일 앞부분(매직 바이트)으로 판별한 확장자. 허용하지 않는 형식이면 None."""
+    for signature, ext in SIGNATURES:
+        if head.startswith(signature):
+            return ext
+    return None
+
+
+def _spool_copy(stream):
+    """SpoolFile이 아닌 스트림(직접 만든 FileStorage 등)을 같은 방식으로 임시 파일에 옮긴다."""
+    spool = SpoolFile(spool_dir(), current_app.config.get("UPLOAD_MAX_FILE_BYTES", UPLOAD_MAX_FILE_BYTES))
+    while True:
+        chunk = stream.read(COPY_CHUNK_SIZE)
+        if not chunk:
+            break
+        spool.write(chunk)
+    return spool
+
+
+def _copy_into_place(source, final_path):
+    # 복사 중인 파일이 보이지 않도록 같은 폴더의 임시 이름에 쓴 뒤 rename
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    fd, partial = tempfile.mkstemp(dir=os.path.dirname(final_path), prefix=".partial-")
+    try:
+        with os.fdopen(fd, "wb") as out, open(source, "rb") as src:
+            shutil.copyfileobj(src, out, COPY_CHUNK_SIZE)
+        os.chmod(partial, FILE_MODE)
+        os.replace(partial, final_path)
+    except BaseException:
+        os.remove(partial)
+        raise
+
+
+def _strip_metadata(path, directory, max_bytes, max_pixels):
+    """메타데이터를 빼고 회전을 반영한 새 SpoolFile. 뺄 것이 없으면 None.
+    픽셀 수가 max_pixels를 넘으면 UploadRejected, 읽을 수 없는 이미지면 ValueError."""
+    try:
+        with Image.open(path) as source:
+            if source.width * source.height > max_pixels:
+                raise UploadRejected(f"이미지가 너무 큽니다 ({source.width}x{source.height}, 최대 {max_pixels:,}화소).")
+            if getattr(source, "is_animated", False):
+                return None  # 애니메이션 GIF는 그대로 둔다
+            if not source.getexif() and not any(key in source.info for key in METADATA_KEYS):
+                return None
+            image_format = source.format
+            image = ImageOps.exif_transpose(source)
+            image.load()
+    except (OSError, SyntaxError, Image.DecompressionBombError) as e:
+        raise ValueError(str(e)) from e
+
+    for key in METADATA_KEYS:
+        image.info.pop(key, None)
+    save_kwargs = {"quality": 95} if image_format == "JPEG" else {}
+    if image.info.get("icc_profile"):
+        save_kwargs["icc_profile"] = image.info["icc_profile"]  # 색 프로필은 남긴다
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, **save_kwargs)
+
+    # 다시 쓰면서 정리된 내용의 sha256을 계산한다
+    clean = SpoolFile(directory, max_bytes)
+    try:
+        buffer.seek(0)
+        while True:
+            chunk = buffer.read(COPY_CHUNK_SIZE)
+            if not chunk:
+                break
+            clean.write(chunk)
+        clean.flush()
+    except BaseException:
+        clean.close()
+        raise
+    return clean
+
+
+def _strip_all(spools, names, created):
+    # 디코딩/인코딩은 Pillow가 GIL을 놓으므로 여러 장을 업로드 쓰기 풀에서 동시에 처리
+    directory = spool_dir()
+    max_bytes = current_app.config.get("UPLOAD_MAX_FILE_BYTES", UPLOAD_MAX_FILE_BYTES)
+    max_pixels = current_app.config.get("UPLOAD_MAX_PIXELS", UPLOAD_MAX_PIXELS)
+    futures = []
+    for spool, _ in spools:
+        spool.flush()
+        futures.append(_get_executor().submit(_strip_metadata, spool.path, directory, max_bytes, max_pixels))
+
+    result, error = [], None
+    for (spool, ext), name, future in zip(spools, names, futures):
+        try:
+            clean = future.result()
+        except UploadRejected as e:
+            error = error or e
+            continue
+        except ValueError:
+            error = error or UploadRejected(f"이미지 파일을 읽을 수 없습니다: {name}")
+            continue
+        except Exception as e:
+            error = error or e
+            continue
+        if clean is not None:
+            created.append(clean)  # 나머지가 실패해도 임시 파일이 정리되도록 먼저 등록
+            spool = clean
+        result.append((spool, ext))
+    if error is not None:
+        raise error
+    return result
+
+
+def ingest(files):
+    """업로드된 이미지들을 검사하고 메타데이터를 뺀 뒤 저장하고 URL 목록을 돌려준다. 호출한 쪽에서 commit 한다.
+    개수 초과 / 이미지가 아닌 파일이 있으면 아무것도 저장하지 않고 UploadRejected."""
+    files = [file for file in files if file and file.filename]
+    max_files = current_app.config.get("UPLOAD_MAX_FILES", UPLOAD_MAX_FILES)
+    if len(files) > max_files:
+        raise UploadRejected(f"이미지는 {max_files}개까지 올릴 수 있습니다.")
+
+    spools, created = [], []
+    try:
+        for file in files:
+            if isinstance(file.stream, SpoolFile):
+                spool = file.stream
+            else:
+                spool = _spool_copy(file.stream)
+                created.append(spool)
+            ext = detect_type(spool.head)
+            if ext is None:
+                raise UploadRejected(f"이미지 파일(png, jpg, gif)만 올릴 수 있습니다: {file.filename}")
+            spools.append((spool, ext))
+        spools = _strip_all(spools, [file.filename for file in files], created)
+        return _place(spools)
+    finally:
+        for spool in created:
+            spool.close()
+
+
+def _place(spools):
+    root = current_app.config["UPLOAD_FOLDER"]
+    same_device = os.stat(spool_dir()).st_dev == os.stat(root).st_dev
+    urls, copies, placed = [], [], set()
+    for spool, ext in spools:
+        url, final_path = upload_store.store(spool, ext)
+        urls.append(url)
+        if final_path is None or final_path in placed:
+            continue  # 이미 같은 내용이 저장돼 있음
+        placed.add(final_path)
+        spool.flush()
+        if same_device:
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            os.chmod(spool.path, FILE_MODE)  # mkstemp은 0600
+            os.replace(spool.path, final_path)
+            spool.moved()
+        else:
+            copies.append(_get_executor().submit(_copy_into_place, spool.path, final_path))
+    for future in copies:
+        future.result()  # 복사 실패는 그대로 올려 보낸다 (commit 전이므로 참조 수도 롤백됨)
+    return urls
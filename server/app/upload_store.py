@@ -0,0 +1,168 @@
+import glob
+import mimetypes
+import os
+import re
+import stat
+
+from flask import current_app, abort, send_from_directory
+from werkzeug.security import safe_join
+from sqlalchemy import update, delete, select
+from sqlalchemy.exc import IntegrityError
+
+from app.database import db
+from app.models import UploadBlob
+
+# 내용 주소 기반(content-addressed) 업로드 저장소
+# - 업로드 수신(임시 파일에 쓰면서 sha256 계산, 형식 검사)은 app/upload_ingest.py
+# - 같은 내용은 한 번만 저장: uploads/ab/cd/<sha256>.<확장자> (앞 4글자로 2단계 샤딩)
+# - UploadBlob.ref_count로 여러 게시글이 같은 파일을 참조하는 횟수를 센다
+# - 게시글 삭제 시 release()로 참조를 줄이고, 0이 된 파일(과 썸네일 변형본)은 commit 후 purge()로 지운다
+#   purge()는 새 트랜잭션에서 "아직 참조 0인" 행을 먼저 지우고(행 잠금) 파일을 지운 뒤 commit 한다
+#   -> 그 사이 같은 내용을 올리는 store()는 행 잠금에서 기다렸다가 행을 새로 만들고, 행을 새로 만든 쪽은 파일을 다시 쓴다
+#   (참조 수가 다시 올라갔으면 purge는 아무것도 지우지 않는다)
+
+UPLOAD_URL_PREFIX = "/static/uploads/"
+BLOB_PATH_RE = re.compile(r"^([0-9a-f]{2})/([0-9a-f]{2})/([0-9a-f]{64})\.\w+$")
+
+
+def _root():
+    return current_app.config["UPLOAD_FOLDER"]
+
+
+def _relative_path(sha256, ext):
+    return f"{sha256[:2]}/{sha256[2:4]}/{sha256}.{ext}"
+
+
+def _acquire(sha256, ext, size):
+    """참조 수를 1 올리고 (저장에 쓸 확장자, 행을 새로 만들었는지)를 돌려준다 (처음 보는 내용이면 행을 만든다)."""
+    increment = (update(UploadBlob)
+                 .where(UploadBlob.sha256 == sha256)
+                 .values(ref_count=UploadBlob.ref_count + 1))
+    created = False
+    if db.session.execute(increment).rowcount == 0:
+        try:
+            with db.session.begin_nested():
+                db.session.add(UploadBlob(sha256=sha256, ext=ext, size=size, ref_count=1))
+            created = True
+        except IntegrityError:
+            # 다른 요청이 먼저 만들었으면 참조 수만 올린다
+            db.session.execute(increment)
+    return db.session.get(UploadBlob, sha256).ext, created
+
+
+def store(spool, ext):
+    """수신을 마친 업로드(upload_ingest.SpoolFile)의 참조를 등록하고 (URL, 파일을 둘 경로)를 돌려준다.
+    같은 내용이 이미 저장돼 있으면 경로는 None. 호출한 쪽에서 파일을 옮긴 뒤 commit 한다.
+    행을 새로 만들었으면 파일이 남아 있어도 다시 쓴다 (참조가 끝나 purge가 지우는 중인 파일일 수 있으므로)."""
+    sha256 = spool.sha256.hexdigest()
+    stored_ext, created = _acquire(sha256, ext, spool.size)
+    relative_path = _relative_path(sha256, stored_ext)
+    final_path = os.path.join(_root(), relative_path)
+    write = created or not os.path.exists(final_path)
+    return UPLOAD_URL_PREFIX + relative_path, (final_path if write else None)
+
+
+def release(urls):
+    """게시글이 참조하던 이미지들의 참조 수를 줄인다.
+    더 이상 아무도 참조하지 않는 파일 경로 목록을 돌려주며, commit 후 purge()에 넘긴다.
+    참조 수가 0이 된 행은 지우지 않고 남겨 두고 purge()가 파일과 함께 정리한다."""
+    orphans = []
+    for url in urls:
+        if not url.startswith(UPLOAD_URL_PREFIX):
+            continue
+        relative_path = url[len(UPLOAD_URL_PREFIX):]
+        match = BLOB_PATH_RE.match(relative_path)
+        if not match:
+            # 예전 방식(uuid 파일명)으로 저장된 파일은 게시글 하나만 쓰므로 바로 정리 대상
+            orphans.append(relative_path)
+            continue
+        sha256 = match.group(3)
+        db.session.execute(update(UploadBlob)
+                           .where(UploadBlob.sha256 == sha256)
+                           .values(ref_count=UploadBlob.ref_count - 1))
+        if db.session.scalar(select(UploadBlob.ref_count).where(UploadBlob.sha256 == sha256)) == 0:
+            orphans.append(relative_path)
+    return orphans
+
+
+def purge(relative_paths):
+    """참조가 끝난 원본과 그 변형본(<이름>_thumb.webp 등) 파일을 지운다. release()를 commit 한 뒤 호출한다.
+    파일마다 새 트랜잭션에서 행을 다시 확인한다: 그 사이 다른 게시글이 같은 내용을 다시 올렸으면 지우지 않는다."""
+    root = _root()
+    for relative_path in relative_paths:
+        match = BLOB_PATH_RE.match(relative_path)
+        if match:
+            # 조건부 DELETE가 행을 잠근 채로 파일을 지우고 commit -> 같은 내용의 store()는 commit 뒤에 행을 새로 만든다
+            removed = db.session.execute(delete(UploadBlob)
+                                         .where(UploadBlob.sha256 == match.group(3), UploadBlob.ref_count <= 0))
+            if not removed.rowcount:
+                db.session.commit()
+                continue
+        path = os.path.join(root, relative_path)
+        stem = os.path.splitext(path)[0]
+        for target in [path] + glob.glob(glob.escape(stem) + "_*"):
+            try:
+                os.remove(target)
+            except OSError:
+                pass
+        db.session.commit()
+
+
+# 업로드 파일 서빙
+# - 해시 이름(ab/cd/<sha256>.jpg, <sha256>_thumb.webp)은 내용이 바뀌지 않으므로 1년 immutable 캐시
+#   원본은 EXIF 제거 / 회전 반영을 끝낸 뒤에 저장되고 (app/upload_ingest.py) 그 뒤로 덮어쓰는 곳이 없다.
+#   변형본은 원본에서 항상 같은 결과로 만들어지고 임시 이름에 쓴 뒤 rename 하므로 처음 보이는 순간부터 완성본이다
+#   -> 저장된 해시 파일을 수정하는 코드를 추가하면 안 된다 (이미 받아 간 브라우저/CDN은 1년 동안 다시 묻지 않음)
+# - 조건부 요청(ETag/If-Modified-Since)과 Range 요청은 send_from_directory(conditional=True)가 처리
+# - UPLOAD_SEND_MODE: "flask"(기본) / "x-accel"(nginx, UPLOAD_ACCEL_PREFIX 내부 location으로 넘김)
+#   / "x-sendfile"(apache 등) -> 웹 서버가 파일을 직접 보내므로 파이썬 워커는 바이트를 읽지 않는다
+#   웹 서버는 보통 다른 사용자로 돌므로 파일은 다른 사용자도 읽을 수 있어야(o+r, 폴더는 o+x) 한다
+#   -> 이 두 모드에서는 시작 전 점검이 unreadable_paths()로 확인한다 (app/self_check.py)
+IMMUTABLE_PATH_RE = re.compile(r"^[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(_\w+)?\.\w+$")
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+LEGACY_MAX_AGE = 24 * 3600
+PERMISSION_CHECK_LIMIT = 2000  # 시작할 때마다 도는 점검이므로 훑는 항목 수를 제한
+
+
+def send_upload(relative_path):
+    # 예전 방식(uuid 이름) 파일은 내용이 같다는 보장이 없으므로 하루만 캐시
+    immutable = bool(IMMUTABLE_PATH_RE.match(relative_path))
+    mode = current_app.config.get("UPLOAD_SEND_MODE", "flask")
+
+    if mode == "x-accel":
+        if not safe_join(_root(), relative_path) or not os.path.isfile(os.path.join(_root(), relative_path)):
+            abort(404)
+        response = current_app.response_class()
+        response.headers["X-Accel-Redirect"] = current_app.config.get(
+            "UPLOAD_ACCEL_PREFIX", "/protected-uploads/") + relative_path
+        response.mimetype = mimetypes.guess_type(relative_path)[0] or "application/octet-stream"
+    else:
+        # x-sendfile 모드는 create_app에서 켠 USE_X_SENDFILE을 보고 send_file이 헤더만 내보낸다
+        response = send_from_directory(
+            _root(), relative_path, conditional=True,
+            max_age=IMMUTABLE_MAX_AGE if immutable else LEGACY_MAX_AGE,
+        )
+
+    response.cache_control.public = True
+    response.cache_control.max_age = IMMUTABLE_MAX_AGE if immutable else LEGACY_MAX_AGE
+    response.cache_control.immutable = immutable
+    return response
+
+
+def unreadable_paths(root, limit=PERMISSION_CHECK_LIMIT):
+    """root 아래에서 다른 사용자(웹 서버)가 읽을 수 없는 파일 / 들어갈 수 없는 폴더 목록. 최대 limit개 항목만 훑는다."""
+    problems, seen = [], 0
+    for directory, _, files in os.walk(root):
+        if not os.stat(directory).st_mode & stat.S_IXOTH:
+            problems.append(directory)
+        for name in files:
+            path = os.path.join(directory, name)
+            try:
+                if not os.stat(path).st_mode & stat.S_IROTH:
+                    problems.append(path)
+            except OSError:
+                pass  # 점검 중에 지워진 파일
+            seen += 1
+            if seen >= limit:
+                return problems
+    return problems
@@ -0,0 +1,153 @@
+import csv
+import io
+
+from app.database import db
+from app.models import User
+from app import passwords
+
+# 사용자 일괄 등록 (CSV / XLSX)
+# - 컬럼 구성은 db구성.xlsx의 유저 테이블 기준. 머리글은 필드명(user_id ...)이나 한글 개념명(유저id ...) 모두 허용
+# - 파일 전체를 메모리에 올리지 않고 한 행씩 읽는다 (CSV: 스트림, XLSX: openpyxl read_only)
+# - 행마다 검증 오류를 모아 돌려주고, 통과한 행은 IMPORT_BATCH_SIZE개씩 executemany INSERT
+# - 요청 크기 상한: USER_IMPORT_MAX_BYTES(기본 10MB), 넘으면 413 (게시판 이미지 업로드 상한과 별개)
+
+IMPORT_BATCH_SIZE = 500
+IMPORT_MAX_BYTES = 10 * 1024 * 1024
+
+COLUMN_ALIASES = {
+    "user_id": "user_id", "유저id": "user_id", "아이디": "user_id",
+    "user_password": "user_password", "비밀번호": "user_password",
+    "user_name": "user_name", "유저이름": "user_name", "이름": "user_name",
+    "admission_year": "admission_year", "입학년도": "admission_year",
+    "grade": "grade", "학년": "grade",
+    "class_num": "class_num", "반": "class_num",
+    "student_num": "student_num", "번호": "student_num",
+    "phone_number": "phone_number", "핸드폰번호": "phone_number",
+    "is_admin": "is_admin", "관리자여부": "is_admin",
+}
+REQUIRED = ["user_id", "user_password", "user_name", "admission_year", "grade", "class_num",
+            "student_num", "phone_number"]
+INT_COLUMNS = ["admission_year", "grade", "class_num", "student_num"]
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def _iter_csv(stream):
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    yield from csv.reader(text)
+
+
+def _iter_xlsx(stream):
+    from openpyxl import load_workbook  # 선택 의존성: XLSX 업로드에만 필요
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        for row in workbook.active.iter_rows(values_only=True):
+            yield row
+    finally:
+        workbook.close()
+
+
+def iter_rows(file):
+    """(행 번호, {필드: 값}) 을 차례로 돌려준다. 행 번호는 머리글을 1행으로 센다."""
+    ext = file.filename.rsplit(".", 1)[-1].lower() if "." in file.filename else ""
+    if ext == "csv":
+        rows = _iter_csv(file.stream)
+    elif ext in ("xlsx", "xlsm"):
+        rows = _iter_xlsx(file.stream)
+    else:
+        raise ImportFormatError("CSV 또는 XLSX 파일만 가져올 수 있습니다.")
+
+    header = next(rows, None)
+    if not header:
+        raise ImportFormatError("빈 파일입니다.")
+    columns = [COLUMN_ALIASES.get(str(name).strip().lower() if name is not None else "") for name in header]
+    missing = [name for name in REQUIRED if name not in columns]
+    if missing:
+        raise ImportFormatError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+
+    for number, values in enumerate(rows, start=2):
+        if not values or all(v is None or str(v).strip() == "" for v in values):
+            continue
+        yield number, {column: value for column, value in zip(columns, values) if column}
+
+
+def _clean(raw):
+    """행 하나를 검증해 (INSERT용 dict, 오류 목록)을 돌려준다."""
+    row, errors = {}, []
+    for name in REQUIRED + ["is_admin"]:
+        value = raw.get(name)
+        value = value.strip() if isinstance(value, str) else value
+        if name in REQUIRED and (value is None or value == ""):
+            errors.append(f"{name} 값이 비어 있습니다.")
+            continue
+        if name in INT_COLUMNS:
+            try:
+                value = int(float(value))
+            except (TypeError, ValueError):
+                errors.append(f"{name} 값이 숫자가 아닙니다: {value}")
+                continue
+        elif name == "is_admin":
+            value = str(value).strip().lower() in ("1", "true", "y", "yes", "o", "관리자")
+        else:
+            value = str(value)
+        row[name] = value
+    return row, errors
+
+
+def _flush(batch, errors, is_confirmed):
+    """배치 안의 행을 DB 중복 검사 후 한 번의 executemany로 넣는다. 넣은 행 수를 돌려준다."""
+    ids = [row["user_id"] for _, row in batch]
+    phones = [row["phone_number"] for _, row in batch]
+    taken_ids = {v for (v,) in db.session.query(User.user_id).filter(User.user_id.in_(ids))}
+    taken_phones = {v for (v,) in db.session.query(User.phone_number).filter(User.phone_number.in_(phones))}
+
+    valid = []
+    for number, row in batch:
+        row_errors = []
+        if row["user_id"] in taken_ids:
+            row_errors.append(f"이미 있는 아이디입니다: {row['user_id']}")
+        if row["phone_number"] in taken_phones:
+            row_errors.append(f"이미 등록된 전화번호입니다: {row['phone_number']}")
+        if row_errors:
+            errors.append({"row": number, "user_id": row["user_id"], "errors": row_errors})
+        else:
+            valid.append(row)
+    if not valid:
+        return 0
+
+    hashes = passwords.hash_many([row["user_password"] for row in valid])
+    for row, password_hash in zip(valid, hashes):
+        row["user_password"] = password_hash
+        row["is_confirmed"] = is_confirmed
+    db.session.execute(User.__table__.insert(), valid)
+    return len(valid)
+
+
+def import_users(file, is_confirmed=True):
+    """파일의 사용자를 한 트랜잭션으로 등록한다. (등록 수, 행별 오류 목록)을 돌려준다.
+    호출한 쪽에서 commit 한다."""
+    errors = []
+    imported = 0
+    seen_ids, seen_phones = set(), set()
+    batch = []
+    for number, raw in iter_rows(file):
+        row, row_errors = _clean(raw)
+        if not row_errors:
+            if row["user_id"] in seen_ids:
+                row_errors.append(f"파일 안에서 아이디가 중복됩니다: {row['user_id']}")
+            if row["phone_number"] in seen_phones:
+                row_errors.append(f"파일 안에서 전화번호가 중복됩니다: {row['phone_number']}")
+        if row_errors:
+            errors.append({"row": number, "user_id": raw.get("user_id"), "errors": row_errors})
+            continue
+        seen_ids.add(row["user_id"])
+        seen_phones.add(row["phone_number"])
+        batch.append((number, row))
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            imported += _flush(batch, errors, is_confirmed)
+            batch = []
+    if batch:
+        imported += _flush(batch, errors, is_confirmed)
+    return imported, errors
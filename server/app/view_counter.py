@@ -0,0 +1,118 @@
+import atexit
+import os
+import threading
+from collections import defaultdict
+
+from flask import session
+from sqlalchemy import bindparam, func
+
+from app.database import db
+from app import cache
+from app.models import BOARD_MODELS
+
+# 조회수 write-behind 카운터
+# - 상세 조회(GET)에서는 메모리 버퍼에 +1만 하고 DB에 쓰지 않는다
+# - 백그라운드 스레드가 VIEW_FLUSH_INTERVAL초마다 모아둔 값을
+#   "UPDATE ... SET views = views + n" 한 번의 executemany로 반영 (원자적 증가라 lost update 없음)
+# - VIEW_DEDUPE_PER_SESSION=True면 같은 세션의 같은 게시글 재조회는 세지 않는다
+
+SESSION_KEY = "viewed_posts"
+SESSION_MAX_ENTRIES = 50  # 쿠키 세션 크기 제한(4KB) 안쪽으로 유지
+
+_pending = defaultdict(int)  # (board, post_id) -> 아직 DB에 반영 안 된 조회수
+_lock = threading.Lock()
+_app = None
+_flusher_pid = None
+_stop = threading.Event()
+
+
+def init_app(app):
+    global _app
+    _app = app
+    atexit.register(_flush_at_exit)
+
+
+def _ensure_flusher():
+    # gunicorn 등에서 fork된 워커는 부모의 스레드를 물려받지 못하므로 프로세스마다 한 번 띄운다
+    global _flusher_pid
+    if _flusher_pid == os.getpid():
+        return
+    with _lock:
+        if _flusher_pid == os.getpid():
+            return
+        _flusher_pid = os.getpid()
+    threading.Thread(target=_flush_loop, name="view-counter-flush", daemon=True).start()
+
+
+def _flush_loop():
+    interval = _app.config.get("VIEW_FLUSH_INTERVAL", 5)
+    while not _stop.wait(interval):
+        with _app.app_context():
+            try:
+                flush()
+            except Exception as e:
+                print("❌ [조회수 반영 실패] :", e)
+
+
+def _flush_at_exit():
+    _stop.set()
+    if _app is not None and _pending:
+        with _app.app_context():
+            flush()
+
+
+def _already_viewed(board, post_id):
+    key = f"{board}:{post_id}"
+    viewed = session.get(SESSION_KEY, [])
+    if key in viewed:
+        return True
+    session[SESSION_KEY] = (viewed + [key])[-SESSION_MAX_ENTRIES:]
+    return False
+
+
+def record_view(board, post_id):
+    """조회 1회를 버퍼에 기록하고, 아직 DB에 반영되지 않은 조회수를 돌려준다.
+    응답에는 post.views + 반환값을 내려주면 방금 조회까지 포함된 값이 된다."""
+    _ensure_flusher()
+    if _app.config.get("VIEW_DEDUPE_PER_SESSION", False) and _already_viewed(board, post_id):
+        with _lock:
+            return _pending.get((board, post_id), 0)
+    with _lock:
+        _pending[(board, post_id)] += 1
+        return _pending[(board, post_id)]
+
+
+def flush():
+    """버퍼에 쌓인 조회수를 게시판별 UPDATE 한 번씩으로 반영한다."""
+    global _pending
+    with _lock:
+        if not _pending:
+            return 0
+        pending, _pending = _pending, defaultdict(int)
+
+    by_board = defaultdict(list)
+    for (board, post_id), count in pending.items():
+        by_board[board].append({"b_post_id": post_id, "b_count": count})
+
+    try:
+        for board, rows in by_board.items():
+            table = BOARD_MODELS[board].__table__
+            pk = list(table.primary_key.columns)[0]
+            # updated_at을 자기 값으로 지정해 onupdate(utcnow)가 돌지 않게 한다 (조회는 수정이 아님)
+            stmt = (table.update()
+                    .where(pk == bindparam("b_post_id"))
+                    .values(views=func.coalesce(table.c.views, 0) + bindparam("b_count"),
+                            updated_at=table.c.updated_at))
+            db.session.execute(stmt, rows)
+        db.session.commit()
+        # 캐시된 상세 응답은 반영 전 조회수를 들고 있으므로 지운다
+        for board, post_id in pending:
+            cache.invalidate_detail(board, post_id)
+    except Exception:
+        db.session.rollback()
+        # 실패한 증가분은 버퍼로 되돌려 다음 주기에 다시 시도
+        with _lock:
+            for key, count in pending.items():
+                _pending[key] += count
+        raise
+    return len(pending)
@@ -0,0 +1,375 @@
+# 게시판 API 부하 테스트 / 벤치마크
+#
+# 사용법 (server 디렉터리에서):
+#   python -m benchmarks.api_benchmark                                   # 기본: 게시판당 10만 글, 댓글 100만 개
+#   python -m benchmarks.api_benchmark --posts 20000 --comments 100000 --concurrency 8 --requests 1000
+#   python -m benchmarks.api_benchmark --db /tmp/bench.db --reuse        # 한 번 채운 DB 재사용
+#   python -m benchmarks.api_benchmark --base-url http://localhost:8000  # 실행 중인 서버(gunicorn 등)에 요청
+#   python -m benchmarks.api_benchmark --output before.json              # 커밋 간 비교용 결과 저장
+#   python -m benchmarks.api_benchmark --accept-encoding "br, gzip"      # 압축 응답 크기(mean_response_bytes) 측정
+#
+# SQLite DB에 사용자 / 4개 게시판 글 / 댓글(대댓글 포함) / 이미지 행과 파일을 채운 뒤
+# 목록, 커서 목록, 검색, 상세, 댓글, 업로드 시나리오를 정해진 동시성으로 호출하고
+# 시나리오별 처리량, p50/p95/p99 지연, 요청당 쿼리 수(Server-Timing 헤더, app/instrumentation.py)를 JSON으로 출력한다.
+# --base-url을 주면 DB 채우기는 건너뛰고(서버 쪽 DB는 미리 --db로 채워 두고 띄울 것) HTTP로 호출한다.
+
+import argparse
+import io
+import json
+import os
+import random
+import re
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from PIL import Image
+
+from app import create_app, passwords, search
+from app.database import db
+from app.models import (User, LostItemPost, FoundItemPost, ShareItemPost, NoticePost, Comment,
+                        CommentCategoryEnum, PostImage)
+
+ITEMS = ["지갑", "에어팟", "아이폰", "갤럭시", "우산", "필통", "학생증", "교통카드", "안경", "텀블러", "이어폰", "노트북"]
+COLORS = ["검은", "흰색", "파란", "빨간", "회색", "분홍", "초록"]
+PLACES = ["도서관", "체육관", "급식실", "본관 3층", "운동장", "과학실", "음악실", "매점", "정문", "버스정류장"]
+FILLER = "찾아주시면 사례하겠습니다 꼭 연락 부탁드립니다 오늘 오후에 잃어버린 것 같아요"
+KEYWORDS = ["지갑", "검은 지갑", "에어팟", "도서관", "학생증", "파란 우산", "체육관", "아이폰", "텀블러", "정문"]
+
+BOARDS = {
+    # 게시판 -> (모델, URL 접두어, 글 번호 컬럼)
+    "lost_item": (LostItemPost, "/api/lost-items", "lost_item_post_id"),
+    "found_item": (FoundItemPost, "/api/found_items", "found_item_post_id"),
+    "share_item": (ShareItemPost, "/api/share_items", "share_item_post_id"),
+    "notice": (NoticePost, "/api/notices", "notice_post_id"),
+}
+SCENARIOS = ["list", "list_cursor", "search", "detail", "comments", "upload"]
+
+BATCH_SIZE = 10000
+USER_COUNT = 500
+DISTINCT_IMAGES = 20
+BENCH_PASSWORD = "bench-password"
+QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+
+class BenchConfig:
+    SECRET_KEY = "bench"
+    DB_CREATE_ALL = True
+    SEARCH_BACKEND = "index"
+    QUERY_BUDGET_MODE = "off"
+    SQL_SLOW_MS = 10 ** 9
+    LOGIN_IP_LIMIT = 10 ** 9
+    LOGIN_ACCOUNT_LIMIT = 10 ** 9
+
+
+def _make_app(db_path, upload_folder, cache_type):
+    config = type("Config", (BenchConfig,), {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}",
+        "UPLOAD_FOLDER": upload_folder,
+        "RESPONSE_CACHE_TYPE": cache_type,
+    })
+    return create_app(config)
+
+
+def _insert(table, rows):
+    if not rows:
+        return
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(table.insert(), rows[start:start + BATCH_SIZE])
+    db.session.commit()
+
+
+def _make_image_files(upload_folder, rng):
+    """게시글 이미지로 쓸 작은 JPEG 원본과 WebP 썸네일 파일을 만든다. [(원본 URL, 썸네일 URL)]"""
+    folder = os.path.join(upload_folder, "bench")
+    os.makedirs(folder, exist_ok=True)
+    urls = []
+    for i in range(DISTINCT_IMAGES):
+        color = tuple(rng.randrange(256) for _ in range(3))
+        Image.new("RGB", (1200, 900), color).save(os.path.join(folder, f"{i}.jpg"), quality=85)
+        Image.new("RGB", (320, 240), color).save(os.path.join(folder, f"{i}_thumb.webp"), quality=80)
+        urls.append((f"/static/uploads/bench/{i}.jpg", f"/static/uploads/bench/{i}_thumb.webp"))
+    return urls
+
+
+def _post_row(board, pk_name, post_id, rng, created_at):
+    item, color, place = rng.choice(ITEMS), rng.choice(COLORS), rng.choice(PLACES)
+    row = {
+        pk_name: post_id,
+        f"{board}_post_name": f"{color} {item} {'찾습니다' if board == 'lost_item' else '주인 찾아요'}",
+        "author_id": f"user{rng.randrange(USER_COUNT)}",
+        "created_at": created_at,
+        "content": f"{place}에서 {color} {item} 관련 글입니다. {FILLER}",
+        "views": rng.randrange(200),
+    }
+    if board == "lost_item":
+        row.update(lost_item_name=item, lost_location=place, lost_time=f"{rng.randint(8, 17)}시", status=False)
+    elif board == "found_item":
+        row.update(found_item_name=item, found_location=place, found_time=f"{rng.randint(8, 17)}시",
+                   status=rng.random() < 0.2, resolved=False)
+    elif board == "share_item":
+        row.update(status=rng.random() < 0.3)
+    return row
+
+
+def seed(posts, comments, image_ratio, upload_folder):
+    rng = random.Random(42)
+    password_hash = passwords.hash_password(BENCH_PASSWORD)
+    _insert(User.__table__, [{
+        "user_id": f"user{i}", "user_password": password_hash, "user_name": f"학생{i}",
+        "admission_year": 2023 + i % 3, "grade": 1 + i % 3, "class_num": 1 + i % 10, "student_num": 1 + i % 30,
+        "phone_number": f"010-{i:08d}", "is_admin": i == 0, "is_confirmed": True,
+    } for i in range(USER_COUNT)])
+
+    image_files = _make_image_files(upload_folder, rng)
+    base = datetime(2024, 3, 1)
+    for board, (model, _, pk_name) in BOARDS.items():
+        rows, images = [], []
+        for post_id in range(1, posts + 1):
+            rows.append(_post_row(board, pk_name, post_id, rng, base + timedelta(minutes=post_id)))
+            if rng.random() < image_ratio:
+                for position in range(rng.randint(1, 3)):
+                    original, thumb = rng.choice(image_files)
+                    images.append({"board": board, "post_id": post_id, "position": position, "variant": "original",
+                                   "format": None, "url": original, "original_url": original,
+                                   "width": 1200, "height": 900})
+                    images.append({"board": board, "post_id": post_id, "position": position, "variant": "thumb",
+                                   "format": "webp", "url": thumb, "original_url": original,
+                                   "width": 320, "height": 240})
+        _insert(model.__table__, rows)
+        _insert(PostImage.__table__, images)
+        search.rebuild_index(board)
+
+    # 댓글: 80%는 최상위 댓글, 나머지는 이미 댓글이 있는 게시글의 최상위 댓글에 단 대댓글
+    # (100만 개를 한 번에 메모리에 올리지 않도록 BATCH_SIZE개씩 넣는다)
+    categories = list(CommentCategoryEnum)
+    roots_by_post = {}
+    root_keys = []
+    rows = []
+    for comment_id in range(1, comments + 1):
+        if root_keys and rng.random() < 0.2:
+            category, post_id = rng.choice(root_keys)
+            parent = rng.choice(roots_by_post[(category, post_id)])
+        else:
+            category, post_id, parent = rng.choice(categories), rng.randint(1, posts), None
+            if (category, post_id) not in roots_by_post:
+                roots_by_post[(category, post_id)] = []
+                root_keys.append((category, post_id))
+            roots_by_post[(category, post_id)].append(comment_id)
+        rows.append({
+            "comment_id": comment_id, "category": category.name, "post_id": post_id,
+            "author_id": f"user{rng.randrange(USER_COUNT)}", "parent_comment_id": parent,
+            "content": "저도 비슷한 걸 봤어요" if parent else "혹시 아직 못 찾으셨나요?",
+            "created_at": base + timedelta(seconds=comment_id),
+        })
+        if len(rows) == BATCH_SIZE:
+            _insert(Comment.__table__, rows)
+            rows = []
+    _insert(Comment.__table__, rows)
+
+
+class InProcessClient:
+    """Flask test client (네트워크 없이 앱 + DB 경로만 측정)."""
+
+    def __init__(self, app, accept_encoding=""):
+        self.client = app.test_client()
+        self.headers = {"Accept-Encoding": accept_encoding} if accept_encoding else {}
+        with self.client.session_transaction() as session:
+            session["user_id"] = "user1"
+
+    def request(self, method, path, **kwargs):
+        # test client는 압축을 풀지 않으므로 len(data)가 곧 전송 크기
+        response = self.client.open(path, method=method, headers=self.headers, **kwargs)
+        return response.status_code, response.headers.get("Server-Timing", ""), len(response.data)
+
+
+class HttpClient:
+    """실행 중인 서버에 HTTP로 요청 (requests.Session, 로그인 쿠키 유지)."""
+
+    def __init__(self, base_url, accept_encoding=""):
+        import requests  # --base-url을 쓸 때만 필요
+        self.base_url = base_url.rstrip("/")
+        self.session = requests.Session()
+        self.session.headers["Accept-Encoding"] = accept_encoding or "identity"
+        self.session.post(f"{self.base_url}/api/auth/login",
+                          json={"user_id": "user1", "password": BENCH_PASSWORD})
+
+    def request(self, method, path, query_string=None, data=None, content_type=None):
+        files = None
+        if data and any(isinstance(v, tuple) for v in data.values()):
+            files = {k: (v[1], v[0]) for k, v in data.items() if isinstance(v, tuple)}
+            data = {k: v for k, v in data.items() if not isinstance(v, tuple)}
+        response = self.session.request(method, self.base_url + path, params=query_string, data=data, files=files)
+        # raw.tell(): 압축을 풀기 전 실제로 받은 바이트 수
+        return response.status_code, response.headers.get("Server-Timing", ""), response.raw.tell()
+
+
+def _random_jpeg(rng):
+    buffer = io.BytesIO()
+    Image.new("RGB", (1600, 1200), tuple(rng.randrange(256) for _ in range(3))).save(buffer, "JPEG", quality=85)
+    buffer.seek(0)
+    return buffer
+
+
+def _make_request(scenario, rng, posts, comment_keys, cursors):
+    """(method, path, kwargs) 하나를 만든다."""
+    board = rng.choice(list(BOARDS))
+    _, prefix, _ = BOARDS[board]
+    if scenario == "list":
+        return "GET", prefix + "/", {"query_string": {"page": rng.randint(1, 50), "limit": 10}}
+    if scenario == "list_cursor":
+        cursor = rng.choice(cursors[board]) if cursors.get(board) else ""
+        return "GET", prefix + "/", {"query_string": {"cursor": cursor, "limit": 10}}
+    if scenario == "search":
+        return "GET", prefix + "/", {"query_string": {"keyword": rng.choice(KEYWORDS), "limit": 10}}
+    if scenario == "detail":
+        return "GET", f"{prefix}/{rng.randint(1, posts)}", {}
+    if scenario == "comments":
+        category, post_id = rng.choice(comment_keys)
+        return "GET", "/api/comments/", {"query_string": {"category": category, "post_id": post_id, "limit": 20}}
+    if scenario == "upload":
+        item, place = rng.choice(ITEMS), rng.choice(PLACES)
+        return "POST", "/api/lost-items/", {"content_type": "multipart/form-data", "data": {
+            "lost_item_post_name": f"{item} 찾습니다", "lost_item_name": item, "lost_location": place,
+            "lost_time": "12시", "content": f"{place}에서 잃어버렸어요. {FILLER}",
+            "images": (_random_jpeg(rng), "photo.jpg"),
+        }}
+    raise ValueError(scenario)
+
+
+def _percentile(values, pct):
+    return values[min(len(values) - 1, max(0, int(round(len(values) * pct / 100.0)) - 1))]
+
+
+def run_scenario(make_client, scenario, count, concurrency, warmup, posts, comment_keys, cursors, seed_value):
+    local = threading.local()
+
+    def one(i):
+        if not hasattr(local, "client"):
+            local.client = make_client()
+            local.rng = random.Random(seed_value * 1000 + threading.get_ident() % 1000)
+        method, path, kwargs = _make_request(scenario, local.rng, posts, comment_keys, cursors)
+        start = time.perf_counter()
+        status, timing, size = local.client.request(method, path, **kwargs)
+        elapsed = (time.perf_counter() - start) * 1000
+        match = QUERIES_RE.search(timing)
+        return elapsed, status, int(match.group(1)) if match else None, size
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(warmup)))
+        start = time.perf_counter()
+        results = list(pool.map(one, range(count)))
+        wall = time.perf_counter() - start
+
+    latencies = sorted(r[0] for r in results)
+    queries = [r[2] for r in results if r[2] is not None]
+    errors = sum(1 for r in results if r[1] >= 400)
+    return {
+        "requests": count,
+        "errors": errors,
+        "throughput_rps": round(count / wall, 1),
+        "mean_ms": round(statistics.mean(latencies), 3),
+        "p50_ms": round(_percentile(latencies, 50), 3),
+        "p95_ms": round(_percentile(latencies, 95), 3),
+        "p99_ms": round(_percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3),
+        "queries_per_request": round(statistics.mean(queries), 2) if queries else None,
+        "max_queries": max(queries) if queries else None,
+        "mean_response_bytes": round(statistics.mean(r[3] for r in results)),
+    }
+
+
+def _collect_cursors(app, posts):
+    """cursor 시나리오용으로 게시판마다 앞쪽 몇 페이지의 next_cursor를 모아 둔다."""
+    client = app.test_client()
+    cursors = {}
+    for board, (_, prefix, _) in BOARDS.items():
+        cursor, found = "", []
+        for _ in range(min(20, max(posts // 10, 1))):
+            data = client.get(prefix + "/", query_string={"cursor": cursor, "limit": 10}).get_json()
+            cursor = data.get("next_cursor")
+            if not cursor:
+                break
+            found.append(cursor)
+        cursors[board] = found
+    return cursors
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="게시판 API 부하 테스트")
+    parser.add_argument("--posts", type=int, default=100000, help="게시판당 글 수")
+    parser.add_argument("--comments", type=int, default=1000000)
+    parser.add_argument("--image-ratio", type=float, default=0.5, help="이미지가 있는 글의 비율")
+    parser.add_argument("--requests", type=int, default=2000, help="시나리오당 요청 수")
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--cache", default="null", choices=["null", "memory"],
+                        help="응답 캐시 (기본 null: 매 요청 DB 경로를 측정)")
+    parser.add_argument("--db", help="SQLite 파일 경로 (기본: 임시 파일)")
+    parser.add_argument("--reuse", action="store_true", help="--db가 이미 채워져 있으면 다시 채우지 않음")
+    parser.add_argument("--base-url", help="실행 중인 서버 주소 (지정하면 HTTP로 호출)")
+    parser.add_argument("--output", help="결과 JSON을 저장할 파일")
+    parser.add_argument("--accept-encoding", default="",
+                        help="요청에 붙일 Accept-Encoding (예: 'br, gzip'). 기본: 압축 없이")
+    args = parser.parse_args()
+    scenarios = [s for s in args.scenarios.split(",") if s]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or os.path.join(tmp, "bench.db")
+        upload_folder = os.path.join(os.path.dirname(os.path.abspath(db_path)), "bench_uploads")
+        app = _make_app(db_path, upload_folder, args.cache)
+
+        seed_s = None
+        with app.app_context():
+            if not (args.reuse and User.query.first()):
+                start = time.perf_counter()
+                seed(args.posts, args.comments, args.image_ratio, upload_folder)
+                seed_s = round(time.perf_counter() - start, 1)
+            comment_keys = [(category.value, post_id) for category, post_id in db.session.query(
+                Comment.category, Comment.post_id).filter(Comment.parent_comment_id.is_(None)).limit(5000)]
+            posts = db.session.query(db.func.max(LostItemPost.lost_item_post_id)).scalar() or 1
+        cursors = _collect_cursors(app, posts)
+
+        if args.base_url:
+            make_client = lambda: HttpClient(args.base_url, args.accept_encoding)  # noqa: E731
+        else:
+            make_client = lambda: InProcessClient(app, args.accept_encoding)  # noqa: E731
+
+        result = {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "target": args.base_url or "in-process",
+            "posts_per_board": posts,
+            "comments": args.comments,
+            "concurrency": args.concurrency,
+            "cache": args.cache,
+            "accept_encoding": args.accept_encoding,
+            "seed_s": seed_s,
+            "scenarios": {},
+        }
+        for i, scenario in enumerate(scenarios):
+            result["scenarios"][scenario] = run_scenario(
+                make_client, scenario, args.requests, args.concurrency, args.warmup,
+                posts, comment_keys, cursors, seed_value=i)
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# 로그인 벤치마크: 동시 로그인 부하에서의 응답 시간 (app/passwords.py 해시 워커 풀)
+#
+# 사용법 (server 디렉터리에서):
+#   python -m benchmarks.login_benchmark --users 200 --clients 32 --requests 1000
+#
+# 임시 SQLite DB에 사용자를 채우고(일부는 평문 비밀번호 -> 첫 로그인 때 해시로 교체),
+# 여러 스레드가 동시에 /api/auth/login을 호출하는 동안 가벼운 요청(/api/auth/me)의 응답 시간도 함께 재서
+# 해시 계산이 다른 요청을 굶기지 않는지 확인한다. 결과(p50/p95/p99)는 JSON으로 출력.
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Flask
+from sqlalchemy import or_
+
+from app.database import db
+from app.models import User
+from app import passwords
+from app.routes.auth_routes import auth_bp
+
+
+def _make_app(db_path, workers):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["SECRET_KEY"] = "bench"
+    app.config["PASSWORD_HASH_WORKERS"] = workers
+    # 부하 측정이 목적이므로 시도 제한은 사실상 끈다
+    app.config["LOGIN_IP_LIMIT"] = 10 ** 9
+    app.config["LOGIN_ACCOUNT_LIMIT"] = 10 ** 9
+    db.init_app(app)
+    app.register_blueprint(auth_bp, url_prefix="/api/auth")
+    return app
+
+
+def _seed(count, plaintext_ratio):
+    hashed = passwords.hash_password("password")  # 같은 비밀번호라 해시 하나를 재사용
+    rows = []
+    for i in range(count):
+        rows.append({
+            "user_id": f"user{i}",
+            "user_password": "password" if i < count * plaintext_ratio else hashed,
+            "user_name": f"학생{i}",
+            "admission_year": 2025, "grade": 1, "class_num": 1, "student_num": i,
+            "phone_number": f"010-{i:08d}",
+            "is_admin": False, "is_confirmed": True,
+        })
+    db.session.execute(User.__table__.insert(), rows)
+    db.session.commit()
+
+
+def _summary(timings):
+    timings = sorted(timings)
+    return {
+        "requests": len(timings),
+        "mean_ms": round(statistics.mean(timings), 3),
+        "p50_ms": round(timings[len(timings) // 2], 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+        "p99_ms": round(timings[int(len(timings) * 0.99) - 1], 3),
+        "max_ms": round(timings[-1], 3),
+    }
+
+
+def _login(app, user_id):
+    client = app.test_client()
+    start = time.perf_counter()
+    response = client.post("/api/auth/login", json={"user_id": user_id, "password": "password"})
+    elapsed = (time.perf_counter() - start) * 1000
+    return elapsed, response.status_code
+
+
+def _probe(app, stop, timings):
+    # 로그인 부하 중에 해시와 무관한 요청이 얼마나 밀리는지 측정
+    client = app.test_client()
+    while not stop.is_set():
+        start = time.perf_counter()
+        client.get("/api/auth/me")
+        timings.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.005)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 로그인 부하 측정")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--plaintext-ratio", type=float, default=0.5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = _make_app(os.path.join(tmp, "bench.db"), args.workers)
+        with app.app_context():
+            db.create_all()
+            _seed(args.users, args.plaintext_ratio)
+
+        rng = random.Random(42)
+        user_ids = [f"user{rng.randrange(args.users)}" for _ in range(args.requests)]
+
+        stop, probe_timings = threading.Event(), []
+        probe = threading.Thread(target=_probe, args=(app, stop, probe_timings))
+        probe.start()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.clients) as pool:
+            results = list(pool.map(lambda user_id: _login(app, user_id), user_ids))
+        wall_s = time.perf_counter() - start
+        stop.set()
+        probe.join()
+
+        with app.app_context():
+            hashed = or_(*[User.user_password.startswith(prefix) for prefix in passwords.HASH_PREFIXES])
+            remaining = User.query.filter(~hashed).count()
+
+    statuses = {}
+    for _, status in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    result = {
+        "users": args.users,
+        "clients": args.clients,
+        "hash_workers": args.workers,
+        "wall_s": round(wall_s, 3),
+        "logins_per_s": round(len(results) / wall_s, 1),
+        "status_codes": statuses,
+        "login": _summary([elapsed for elapsed, _ in results]),
+        "other_requests_during_load": _summary(probe_timings) if probe_timings else None,
+        "plaintext_rows_left": remaining,
+    }
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
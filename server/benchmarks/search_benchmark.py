@@ -0,0 +1,121 @@
+# 검색 벤치마크: 기존 ilike 검색 vs 검색 색인(app/search.py)
+#
+# 사용법 (server 디렉터리에서):
+#   python -m benchmarks.search_benchmark --posts 100000 --queries 200
+#
+# 임시 SQLite DB에 분실물 게시글을 채우고, 같은 검색어 목록으로
+# 두 경로(SEARCH_BACKEND=like / index)의 목록 조회 시간을 측정해 JSON으로 출력한다.
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from flask import Flask
+
+from app.database import db
+from app.models import User, LostItemPost
+from app import search
+
+ITEMS = ["지갑", "에어팟", "아이폰", "갤럭시", "우산", "필통", "학생증", "교통카드", "안경", "텀블러", "이어폰", "노트북"]
+COLORS = ["검은", "흰색", "파란", "빨간", "회색", "분홍", "초록"]
+PLACES = ["도서관", "체육관", "급식실", "본관 3층", "운동장", "과학실", "음악실", "매점", "정문", "버스정류장"]
+FILLER = "찾아주시면 사례하겠습니다 꼭 연락 부탁드립니다 오늘 오후에 잃어버린 것 같아요"
+
+QUERIES = ["지갑", "검은 지갑", "에어팟", "도서관", "학생증", "파란 우산", "체육관", "아이폰", "텀블러", "정문"]
+
+
+def _make_app(db_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    db.init_app(app)
+    return app
+
+
+def _seed(count):
+    db.session.add(User(
+        user_id="bench", user_password="bench", user_name="bench",
+        admission_year=2025, grade=1, class_num=1, student_num=1, phone_number="010-0000-0000",
+    ))
+    db.session.commit()
+
+    rng = random.Random(42)
+    base = datetime(2025, 3, 1)
+    rows = []
+    for i in range(count):
+        item = rng.choice(ITEMS)
+        color = rng.choice(COLORS)
+        place = rng.choice(PLACES)
+        rows.append({
+            "lost_item_post_name": f"{color} {item} 찾습니다",
+            "author_id": "bench",
+            "created_at": base + timedelta(minutes=i),
+            "lost_item_name": item,
+            "lost_location": place,
+            "lost_time": f"{rng.randint(8, 17)}시",
+            "content": f"{place}에서 {color} {item}을 잃어버렸어요. {FILLER}",
+            "views": 0,
+            "status": False,
+        })
+        if len(rows) == 5000:
+            db.session.execute(LostItemPost.__table__.insert(), rows)
+            rows = []
+    if rows:
+        db.session.execute(LostItemPost.__table__.insert(), rows)
+    db.session.commit()
+
+
+def _run(app, backend, queries, limit):
+    app.config["SEARCH_BACKEND"] = backend
+    timings = []
+    for keyword in queries:
+        start = time.perf_counter()
+        query = search.apply_keyword_search(LostItemPost.query, "lost_item", keyword)
+        query = query.order_by(LostItemPost.created_at.desc())
+        query.paginate(page=1, per_page=limit, error_out=False)
+        timings.append((time.perf_counter() - start) * 1000)
+        db.session.remove()
+    timings.sort()
+    return {
+        "queries": len(timings),
+        "mean_ms": round(statistics.mean(timings), 3),
+        "p50_ms": round(timings[len(timings) // 2], 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+        "max_ms": round(timings[-1], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ilike 검색과 검색 색인 비교")
+    parser.add_argument("--posts", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = _make_app(os.path.join(tmp, "bench.db"))
+        with app.app_context():
+            db.create_all()
+            _seed(args.posts)
+
+            start = time.perf_counter()
+            search.rebuild_index("lost_item")
+            rebuild_s = time.perf_counter() - start
+
+            queries = [QUERIES[i % len(QUERIES)] for i in range(args.queries)]
+            result = {
+                "posts": args.posts,
+                "index_rebuild_s": round(rebuild_s, 3),
+                "like": _run(app, "like", queries, args.limit),
+                "index": _run(app, "index", queries, args.limit),
+            }
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# gunicorn 설정 (server 디렉터리에서 `gunicorn` 만 실행하면 이 파일을 읽는다)
+#
+# - gthread 워커: 프로세스(GUNICORN_WORKERS) x 스레드(GUNICORN_THREADS + 실시간 알림 연결 수)로 여러 코어 사용
+# - 값은 환경 변수 > config.Config 속성 > 기본값 순서로 정한다
+# - 무중단 재시작:
+#     GUNICORN_PRELOAD=false 일 때  kill -HUP <master pid>  (워커를 차례로 새 코드로 교체)
+#     preload 사용 시(기본)         kill -USR2 <master pid> 후 새 master가 뜨면 이전 master에 -QUIT
+#   (preload는 코드를 master에서 한 번만 읽어 메모리를 아끼는 대신 HUP으로는 코드가 다시 읽히지 않음)
+
+import multiprocessing
+import os
+
+try:
+    from config import Config
+except ImportError:
+    Config = object
+
+
+def _setting(name, default):
+    return os.environ.get(name) or getattr(Config, name, default)
+
+
+wsgi_app = "wsgi:app"
+bind = _setting("GUNICORN_BIND", "0.0.0.0:5000")
+worker_class = "gthread"
+workers = int(_setting("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+# 실시간 알림(SSE) 연결은 끝날 때까지 스레드를 하나씩 잡으므로 그만큼 더 띄운다 (app/events.py, config.py에서 설정)
+event_streams = int(_setting("EVENTS_MAX_CONNECTIONS", 32))
+threads = int(_setting("GUNICORN_THREADS", 4)) + event_streams
+# 앱이 워커 수를 알 수 있도록 넘겨 준다 (2개 이상이면 캐시/실시간 알림 기본 백엔드가 redis, app/__init__.py)
+# 워커 수는 -w 옵션이 아니라 GUNICORN_WORKERS로 정할 것
+os.environ["GUNICORN_WORKERS"] = str(workers)
+preload_app = str(_setting("GUNICORN_PRELOAD", "true")).lower() == "true"
+timeout = int(_setting("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(_setting("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(_setting("GUNICORN_KEEPALIVE", 5))
+# 메모리 누수 대비: 일정 요청 수마다 워커 교체 (동시에 몰리지 않도록 jitter)
+max_requests = int(_setting("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = int(_setting("GUNICORN_MAX_REQUESTS_JITTER", 200))
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    # preload 시 master에서 만든 DB 커넥션을 워커가 같이 쓰지 않도록 풀을 비운다 (읽기 복제본 bind 포함)
+    if server.cfg.preload_app:
+        from app.database import dispose_engines
+        from wsgi import app
+        with app.app_context():
+            dispose_engines(close=False)
@@ -0,0 +1,169 @@
+"""initial schema and indexes
+
+기존 서버는 db.create_all()로 테이블을 만들었으므로, 이미 있는 테이블/인덱스는 건너뛰고
+없는 것만 만든다. (새 DB에서는 전체 스키마를 만든다)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+COMMENT_CATEGORY = sa.Enum('LOST_ITEM', 'FOUND_ITEM', 'SHARE_ITEM', 'NOTICE', name='commentcategoryenum')
+
+
+def _post_columns(prefix):
+    return [
+        sa.Column(f'{prefix}_post_id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column(f'{prefix}_post_name', sa.String(100), nullable=False),
+        sa.Column('author_id', sa.String(50), sa.ForeignKey('user.user_id'), nullable=False),
+        sa.Column('created_at', sa.DateTime()),
+    ]
+
+
+TABLES = {
+    'user': lambda: [
+        sa.Column('user_id', sa.String(50), primary_key=True),
+        sa.Column('user_password', sa.String(255), nullable=False),
+        sa.Column('user_name', sa.String(50), nullable=False),
+        sa.Column('admission_year', sa.Integer(), nullable=False),
+        sa.Column('grade', sa.Integer(), nullable=False),
+        sa.Column('class_num', sa.Integer(), nullable=False),
+        sa.Column('student_num', sa.Integer(), nullable=False),
+        sa.Column('phone_number', sa.String(20), nullable=False, unique=True),
+        sa.Column('is_admin', sa.Boolean()),
+        sa.Column('is_confirmed', sa.Boolean()),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime()),
+    ],
+    'lost_item_post': lambda: _post_columns('lost_item') + [
+        sa.Column('lost_item_name', sa.String(30), nullable=False),
+        sa.Column('lost_location', sa.String(30), nullable=False),
+        sa.Column('lost_time', sa.String(30), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('status', sa.Boolean()),
+        sa.Column('views', sa.Integer()),
+        sa.Column('updated_at', sa.DateTime()),
+    ],
+    'found_item_post': lambda: _post_columns('found_item') + [
+        sa.Column('found_item_name', sa.String(30), nullable=False),
+        sa.Column('found_location', sa.String(30), nullable=False),
+        sa.Column('found_time', sa.String(30), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('resolved', sa.Boolean()),
+        sa.Column('status', sa.Boolean()),
+        sa.Column('views', sa.Integer()),
+        sa.Column('updated_at', sa.DateTime()),
+    ],
+    'share_item_post': lambda: _post_columns('share_item') + [
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('status', sa.Boolean()),
+        sa.Column('views', sa.Integer()),
+        sa.Column('updated_at', sa.DateTime()),
+    ],
+    'comment': lambda: [
+        sa.Column('comment_id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('category', COMMENT_CATEGORY, nullable=False),
+        sa.Column('author_id', sa.String(50), sa.ForeignKey('user.user_id'), nullable=False),
+        sa.Column('post_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('parent_comment_id', sa.Integer(), sa.ForeignKey('comment.comment_id'), nullable=True),
+    ],
+    'notice_post': lambda: [
+        sa.Column('notice_post_id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('notice_post_name', sa.String(100), nullable=False),
+        sa.Column('author_id', sa.String(50), sa.ForeignKey('user.user_id'), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime()),
+        sa.Column('views', sa.Integer()),
+    ],
+    'search_token': lambda: [
+        sa.Column('board', sa.String(20), primary_key=True),
+        sa.Column('post_id', sa.Integer(), primary_key=True),
+        sa.Column('token', sa.String(40), primary_key=True),
+        sa.Column('weight', sa.Integer(), nullable=False),
+    ],
+    'post_images': lambda: [
+        sa.Column('post_image_id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('board', sa.String(20), nullable=False),
+        sa.Column('post_id', sa.Integer(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('variant', sa.String(20), nullable=False),
+        sa.Column('format', sa.String(10)),
+        sa.Column('url', sa.String(255), nullable=False),
+        sa.Column('original_url', sa.String(255), nullable=False),
+        sa.Column('width', sa.Integer()),
+        sa.Column('height', sa.Integer()),
+        sa.Column('created_at', sa.DateTime()),
+    ],
+    'upload_blob': lambda: [
+        sa.Column('sha256', sa.String(64), primary_key=True),
+        sa.Column('ext', sa.String(10), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime()),
+    ],
+}
+
+# 라우트의 필터 / 정렬(order by)에 맞춘 인덱스 (app/models.py의 __table_args__와 같게 유지)
+INDEXES = [
+    ('user', 'ix_user_confirmed_created', ['is_confirmed', 'created_at', 'user_id']),
+    ('user', 'ix_user_created', ['created_at', 'user_id']),
+    ('user', 'ix_user_grade_class_student', ['grade', 'class_num', 'student_num', 'user_id']),
+    ('user', 'ix_user_admission_year', ['admission_year', 'grade', 'class_num']),
+    ('lost_item_post', 'ix_lost_item_post_created', ['created_at', 'lost_item_post_id']),
+    ('lost_item_post', 'ix_lost_item_post_author', ['author_id', 'created_at']),
+    ('found_item_post', 'ix_found_item_post_status_created', ['status', 'created_at', 'found_item_post_id']),
+    ('found_item_post', 'ix_found_item_post_author', ['author_id', 'created_at']),
+    ('share_item_post', 'ix_share_item_post_created', ['created_at', 'share_item_post_id']),
+    ('share_item_post', 'ix_share_item_post_author', ['author_id', 'created_at']),
+    ('comment', 'ix_comment_post_parent_created', ['category', 'post_id', 'parent_comment_id', 'created_at', 'comment_id']),
+    ('comment', 'ix_comment_parent', ['parent_comment_id']),
+    ('comment', 'ix_comment_author', ['author_id', 'created_at']),
+    ('notice_post', 'ix_notice_post_created', ['created_at', 'notice_post_id']),
+    ('notice_post', 'ix_notice_post_author', ['author_id', 'created_at']),
+    ('search_token', 'ix_search_token_board_token', ['board', 'token', 'post_id']),
+    ('post_images', 'ix_post_images_board_post', ['board', 'post_id', 'variant']),
+]
+
+# 새 인덱스(ix_comment_post_parent_created)가 앞부분을 모두 포함하므로 지운다
+REPLACED_INDEXES = [
+    ('comment', 'ix_comment_category_post_created'),
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    existing_tables = set(inspector.get_table_names())
+    for table, columns in TABLES.items():  # FK 순서대로 정의되어 있음
+        if table not in existing_tables:
+            op.create_table(table, *columns())
+
+    inspector = sa.inspect(op.get_bind())
+    for table, name in REPLACED_INDEXES:
+        if name in {index['name'] for index in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
+    for table, name, columns in INDEXES:
+        if name not in {index['name'] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    # 기존 DB에서 올라온 경우를 생각해 테이블은 남기고 이 마이그레이션의 인덱스만 되돌린다
+    inspector = sa.inspect(op.get_bind())
+    for table, name, _ in reversed(INDEXES):
+        if name in {index['name'] for index in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
+    op.create_index('ix_comment_category_post_created', 'comment', ['category', 'post_id', 'created_at'])
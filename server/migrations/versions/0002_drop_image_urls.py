@@ -0,0 +1,56 @@
+"""drop legacy image_urls columns
+
+게시글 이미지는 post_images 테이블로 옮겨졌다 (app/post_images.py).
+아직 옮기지 않은 게시글이 있으면 데이터가 사라지지 않도록 멈춘다
+-> 먼저 `flask --app server images backfill` 실행.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:01
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+BOARD_TABLES = {
+    'lost_item': ('lost_item_post', 'lost_item_post_id'),
+    'found_item': ('found_item_post', 'found_item_post_id'),
+    'share_item': ('share_item_post', 'share_item_post_id'),
+    'notice': ('notice_post', 'notice_post_id'),
+}
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    for board, (table, pk) in BOARD_TABLES.items():
+        if 'image_urls' not in {column['name'] for column in inspector.get_columns(table)}:
+            continue
+        pending = bind.execute(sa.text(
+            f"SELECT COUNT(*) FROM {table} t "
+            f"WHERE t.image_urls IS NOT NULL AND t.image_urls != '' AND NOT EXISTS ("
+            f"  SELECT 1 FROM post_images i "
+            f"  WHERE i.board = :board AND i.post_id = t.{pk} AND i.variant = 'original')"
+        ), {'board': board}).scalar()
+        if pending:
+            raise RuntimeError(
+                f"{table}: post_images로 옮기지 않은 게시글이 {pending}개 있습니다. "
+                f"`flask images backfill {board}`를 먼저 실행하세요."
+            )
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('image_urls')
+
+
+def downgrade():
+    # 컬럼만 되살린다 (값은 post_images에 남아 있음)
+    for table, _ in BOARD_TABLES.values():
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('image_urls', sa.Text(), nullable=True))
@@ -0,0 +1,46 @@
+"""post matches and image perceptual hash
+
+분실물 <-> 습득물 매칭 결과 테이블(post_matches)과 원본 이미지의 지각 해시 컬럼(post_images.phash).
+기존 이미지의 해시는 비어 있으므로, 필요하면 이미지 파이프라인을 다시 돌리거나 그대로 두면
+사진 점수 없이 글 내용만으로 매칭한다 (app/matching.py).
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:02
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'post_matches' not in inspector.get_table_names():
+        op.create_table(
+            'post_matches',
+            sa.Column('lost_item_post_id', sa.Integer(), primary_key=True),
+            sa.Column('found_item_post_id', sa.Integer(), primary_key=True),
+            sa.Column('score', sa.Float(), nullable=False),
+            sa.Column('updated_at', sa.DateTime()),
+        )
+        op.create_index('ix_post_matches_lost_score', 'post_matches', ['lost_item_post_id', 'score'])
+        op.create_index('ix_post_matches_found_score', 'post_matches', ['found_item_post_id', 'score'])
+
+    if 'phash' not in {column['name'] for column in inspector.get_columns('post_images')}:
+        with op.batch_alter_table('post_images') as batch_op:
+            batch_op.add_column(sa.Column('phash', sa.String(16), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('post_images') as batch_op:
+        batch_op.drop_column('phash')
+    op.drop_index('ix_post_matches_found_score', table_name='post_matches')
+    op.drop_index('ix_post_matches_lost_score', table_name='post_matches')
+    op.drop_table('post_matches')
@@ -0,0 +1,37 @@
+"""user list indexes for name sort and is_admin filter
+
+관리자 사용자 목록(/api/users)의 sort=user_name 정렬과 is_admin 필터(기본 created_at 정렬)가
+인덱스 없이 전체 스캔 + 정렬을 하던 것을 막는다 (`flask query-plans`로 확인).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:03
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_user_name', ['user_name', 'user_id']),
+    ('ix_user_admin_created', ['is_admin', 'created_at', 'user_id']),
+]
+
+
+def upgrade():
+    # create_all로 만든 DB에는 이미 있을 수 있으므로 없는 것만 만든다
+    existing = {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('user')}
+    for name, columns in INDEXES:
+        if name not in existing:
+            op.create_index(name, 'user', columns)
+
+
+def downgrade():
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name='user')
@@ -2,5 +2,6 @@ from app import create_app
 
 app = create_app()
 
+# 개발용 실행 (단일 프로세스 + 디버거). 운영 서버는 gunicorn (wsgi.py, gunicorn.conf.py)
 if __name__ == "__main__":
     app.run(debug=True)
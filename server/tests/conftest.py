@@ -0,0 +1,35 @@
+import pytest
+from flask_migrate import upgrade
+
+from app import create_app
+
+# 테스트용 앱: 임시 SQLite DB에 마이그레이션(server/migrations/)을 적용해 운영과 같은 스키마/인덱스로 띄운다
+# 실행: server 디렉터리에서 python -m pytest
+
+
+class TestConfig:
+    TESTING = True
+    SECRET_KEY = "test"
+    SEARCH_BACKEND = "index"
+    RESPONSE_CACHE_TYPE = "null"  # 쿼리 수를 세는 테스트가 캐시에 가려지지 않도록
+    QUERY_BUDGET_MODE = "raise"
+    LOGIN_IP_LIMIT = 10 ** 9
+    LOGIN_ACCOUNT_LIMIT = 10 ** 9
+
+
+@pytest.fixture
+def app(tmp_path):
+    config = type("Config", (TestConfig,), {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+        "UPLOAD_FOLDER": str(tmp_path / "uploads"),
+        "UPLOAD_SPOOL_DIR": str(tmp_path / "spool"),
+    })
+    app = create_app(config)
+    with app.app_context():
+        upgrade()
+    yield app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import post_images
+from app.database import db
+from app.instrumentation import (assert_max_queries, QueryBudgetExceeded, LIST_QUERY_BUDGET,
+                                 DETAIL_QUERY_BUDGET)
+from app.models import User, LostItemPost, Comment, CommentCategoryEnum
+from app.routes.comment_routes import COMMENT_QUERY_BUDGET
+
+# 라우트별 쿼리 수 상한 (app/instrumentation.py)
+# - conftest의 QUERY_BUDGET_MODE="raise"라서 상한을 넘는 요청은 after_request에서 QueryBudgetExceeded를 낸다
+# - 글 / 이미지 / 댓글 수가 늘어도 쿼리 수가 그대로인지(N+1이 없는지) 보려고 여러 개를 넣고 검사한다
+
+POSTS = 30
+ROOT_COMMENTS = 5
+REPLY_DEPTH = 4
+
+
+@pytest.fixture
+def seeded(app):
+    base = datetime(2025, 3, 1)
+    with app.app_context():
+        db.session.add(User(user_id="writer", user_password="x", user_name="작성자", admission_year=2025,
+                            grade=1, class_num=1, student_num=1, phone_number="010-0000-0000", is_confirmed=True))
+        for i in range(1, POSTS + 1):
+            db.session.add(LostItemPost(lost_item_post_id=i, lost_item_post_name=f"검정 지갑 {i}",
+                                        author_id="writer", content="도서관에서 잃어버렸습니다", lost_item_name="지갑",
+                                        lost_location="도서관", lost_time="오후", created_at=base + timedelta(minutes=i)))
+            post_images.add_originals("lost_item", i, [f"/static/uploads/legacy/{i}-{n}.jpg" for n in range(3)])
+
+        created = base
+        for root in range(ROOT_COMMENTS):
+            parent = None
+            for depth in range(REPLY_DEPTH + 1):
+                created += timedelta(seconds=1)
+                comment = Comment(category=CommentCategoryEnum.LOST_ITEM, author_id="writer", post_id=1,
+                                  content=f"댓글 {root}-{depth}", parent_comment_id=parent, created_at=created)
+                db.session.add(comment)
+                db.session.flush()
+                parent = comment.comment_id
+        db.session.commit()
+    return app
+
+
+def _depth(node):
+    return 1 + max((_depth(reply) for reply in node["replies"]), default=0)
+
+
+def test_board_list_within_budget(seeded, client):
+    for query in ({}, {"cursor": ""}, {"page": 2, "limit": 5}):
+        with assert_max_queries(LIST_QUERY_BUDGET):
+            response = client.get("/api/lost-items/", query_string=query)
+        assert response.status_code == 200
+        items = response.get_json()["lost_items"]
+        assert items and all(len(item["image_urls"]) == 3 for item in items)
+
+
+def test_board_detail_within_budget(seeded, client):
+    with assert_max_queries(DETAIL_QUERY_BUDGET):
+        response = client.get("/api/lost-items/1")
+    assert response.status_code == 200
+
+
+def test_comment_tree_within_budget(seeded, client):
+    with assert_max_queries(COMMENT_QUERY_BUDGET):
+        response = client.get("/api/comments/", query_string={"category": "lost_item", "post_id": 1})
+    assert response.status_code == 200
+    comments = response.get_json()["comments"]
+    assert len(comments) == ROOT_COMMENTS
+    assert all(_depth(node) == REPLY_DEPTH + 1 for node in comments)
+
+
+def test_budget_exceeded_raises(seeded, client):
+    # raise 모드에서는 라우트 상한을 넘으면 요청이 실패해야 한다
+    view = seeded.view_functions["comments.get_comments"]
+    original, view.query_budget = view.query_budget, 1
+    try:
+        with pytest.raises(QueryBudgetExceeded):
+            client.get("/api/comments/", query_string={"category": "lost_item", "post_id": 1})
+    finally:
+        view.query_budget = original
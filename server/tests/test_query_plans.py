@@ -0,0 +1,7 @@
+from app.query_plans import query_plans_command
+
+
+def test_query_plans_pass_on_migrated_db(app):
+    # 마이그레이션만 적용한 DB에서 모든 라우트 쿼리가 인덱스를 타야 한다 (flask query-plans 종료 코드 0)
+    result = app.test_cli_runner().invoke(query_plans_command)
+    assert result.exit_code == 0, result.output
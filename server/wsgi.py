@@ -0,0 +1,11 @@
+# 운영 서버 진입점 (gunicorn wsgi:app, 설정은 gunicorn.conf.py)
+# 개발 중에는 기존처럼 python server.py 로 실행
+from app import create_app
+from app.self_check import run_self_check
+
+app = create_app()
+
+# 시작 전 점검에 실패하면 워커를 띄우지 않는다
+problems = run_self_check(app)
+if problems:
+    raise RuntimeError("서버 시작 전 점검 실패:\n- " + "\n- ".join(problems))